@@ -0,0 +1,65 @@
+"""
+Comandos de manutenção.
+
+Uso:
+    python -m app.cli rebuild-catalog   # recria o catálogo SQLite a partir dos *.meta.json
+    python -m app.cli snapshot          # aquece o store em memória e grava o snapshot
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Sequence
+
+from app.core.config import settings
+from infrastructure.storage.local_document_repository import LocalDocumentRepository
+
+
+def _rebuild_catalog(_: argparse.Namespace) -> int:
+    t0 = time.perf_counter()
+    count = LocalDocumentRepository().rebuild_catalog()
+    print(
+        f"Catálogo reconstruído: {count} documentos em {time.perf_counter() - t0:.2f}s "
+        f"({settings.CATALOG_PATH})"
+    )
+    return 0
+
+
+def _snapshot(_: argparse.Namespace) -> int:
+    from app.container import build_container
+
+    warmer = build_container().index_warmer
+    if warmer is None:
+        print(
+            f"Snapshot indisponível para VECTOR_STORE_PROVIDER={settings.VECTOR_STORE_PROVIDER} "
+            "(apenas inmemory/dense/quantized, com SNAPSHOT_ENABLED=1)"
+        )
+        return 1
+    warmed = warmer.warm_start()
+    info = warmer.snapshot()
+    if info is None:
+        print(f"Snapshot não gravado: aquecimento em estado '{warmer.progress().state}'")
+        return 1
+    print(
+        f"Snapshot gravado: {info.chunks} chunks de {len(info.document_ids)} documentos em "
+        f"{warmed.seconds:.2f}s de aquecimento ({warmer.snapshot_path})"
+    )
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser(
+        "rebuild-catalog", help="Recria o catálogo de documentos a partir dos *.meta.json"
+    ).set_defaults(func=_rebuild_catalog)
+    sub.add_parser(
+        "snapshot", help="Carrega/atualiza o store em memória e grava o snapshot binário"
+    ).set_defaults(func=_snapshot)
+    args = parser.parse_args(argv)
+    return int(args.func(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
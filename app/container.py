@@ -1,22 +1,50 @@
 from __future__ import annotations
 
+import logging
+from collections.abc import Callable
 from dataclasses import dataclass
+from pathlib import Path
 
 from app.core.config import settings
 from domain.repositories.document_repository import DocumentRepository
 from domain.services.chunker import Chunker
 from domain.services.text_extractor import TextExtractor
 from domain.services.vector_store import VectorStore
+from infrastructure.chunk_sources.filesystem_jsonl import FilesystemJsonlChunkSource
 from infrastructure.chunking.simple_chunker import SimpleChunker
+from infrastructure.concurrency.bounded_executor import BoundedExecutor
+from infrastructure.concurrency.file_lock import exclusive_file_lock
+from infrastructure.embeddings.base import Embedder
+from infrastructure.embeddings.cache import CachedEmbedder, SqliteEmbeddingCache
+from infrastructure.embeddings.hashing import HashingEmbedder
+from infrastructure.jobs.ingestion_queue import IngestionJobQueue
+from infrastructure.jobs.warm_start import IndexWarmer
+from infrastructure.observability.app_metrics import AppMetrics
 from infrastructure.pdf.pypdf_text_extractor import PyPDFTextExtractor
 from infrastructure.storage.local_document_repository import LocalDocumentRepository
+from infrastructure.vectorstores.dense import DenseVectorStore
 from infrastructure.vectorstores.in_memory import InMemoryVectorStore
+from infrastructure.vectorstores.metered import MeteredVectorStore
+from infrastructure.vectorstores.quantized import QuantizedVectorStore
+from infrastructure.vectorstores.sharded import (
+    ShardedVectorStore,
+    read_shard_layout,
+    rebalance_shards,
+    write_shard_layout,
+)
+from infrastructure.vectorstores.shared_mmap import SharedMmapVectorStore
+from use_cases.index_document_chunks import IndexDocumentChunks
+from use_cases.ingest_document import IngestDocument
+from use_cases.query_cache import QueryResultCache
+from use_cases.query_rag import QueryRAGOutput
 
 try:
     from infrastructure.vectorstores.chroma import ChromaVectorStore
 except Exception:
     ChromaVectorStore = None  # type: ignore
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Container:
@@ -24,31 +52,212 @@ class Container:
     text_extractor: TextExtractor
     chunker: Chunker
     vector_store: VectorStore
+    query_cache: QueryResultCache[QueryRAGOutput] | None = None
+    embedding_cache: SqliteEmbeddingCache | None = None
+    ingestion_jobs: IngestionJobQueue | None = None
+    metrics: AppMetrics | None = None
+    index_warmer: IndexWarmer | None = None
+
 
+def _build_embedder() -> Embedder:
+    embedder = HashingEmbedder(dim=settings.EMBEDDING_DIM)
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return embedder
+    cache = SqliteEmbeddingCache(
+        path=settings.EMBEDDING_CACHE_PATH,
+        max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+    )
+    return CachedEmbedder(embedder, cache)
 
-def _build_vector_store() -> VectorStore:
+
+def _vector_store_provider() -> str:
     provider = (settings.VECTOR_STORE_PROVIDER or "inmemory").lower()
-    if provider == "chroma":
-        if ChromaVectorStore is None:
-            # Fallback seguro caso a lib não esteja instalada
-            return InMemoryVectorStore()
-        return ChromaVectorStore(
-            persist_directory=settings.CHROMA_DIR,
-            collection_name=settings.CHROMA_COLLECTION,
-        )
-    # default
-    return InMemoryVectorStore()
+    if provider == "chroma" and ChromaVectorStore is None:
+        # Fallback seguro caso a lib não esteja instalada
+        return "inmemory"
+    return provider if provider in ("chroma", "dense", "quantized", "shared") else "inmemory"
+
+
+# provedores persistentes: onde cada shard vive e onde fica o layout de shards
+_PERSISTENT_PROVIDERS = ("chroma", "shared")
+
+
+def _chroma_collection(shard: int) -> str:
+    # o shard 0 reaproveita a coleção original (instalações sem sharding)
+    return settings.CHROMA_COLLECTION if shard == 0 else f"{settings.CHROMA_COLLECTION}_{shard}"
+
+
+def _shared_index_dir(shard: int) -> Path:
+    base = Path(settings.SHARED_INDEX_DIR)
+    return base if shard == 0 else base / f"shard-{shard}"
+
+
+def _shard_layout_path(provider: str) -> Path:
+    base = settings.CHROMA_DIR if provider == "chroma" else settings.SHARED_INDEX_DIR
+    return Path(base) / "shards.json"
+
+
+def _rebalance_persistent_shards(
+    provider: str, shard: Callable[[int], VectorStore], shards: int
+) -> None:
+    """Se `VECTOR_STORE_SHARDS` mudou desde a última execução, move os documentos afetados."""
+    layout_path = _shard_layout_path(provider)
+    # vários workers podem iniciar juntos: só um rebalanceia, os outros veem o layout novo
+    with exclusive_file_lock(layout_path.with_suffix(".lock")):
+        previous = read_shard_layout(layout_path)
+        if previous == shards:
+            return
+        if previous is not None or shards > 1:
+            old = previous or 1  # sem layout gravado: tudo está no shard original
+            moved = rebalance_shards(
+                shard,
+                old_count=old,
+                new_count=shards,
+                document_ids=(d.id for d in LocalDocumentRepository().list_documents()),
+                source=FilesystemJsonlChunkSource(settings.PROCESSED_DIR),
+            )
+            logger.info(
+                "Shards (%s): %d -> %d, %d documentos movidos", provider, old, shards, moved
+            )
+        write_shard_layout(layout_path, shards)
+
+
+def _build_vector_store(embedder: Embedder | None = None) -> VectorStore:
+    provider = _vector_store_provider()
+    if embedder is None and provider != "inmemory":
+        embedder = _build_embedder()
+    opened: dict[int, VectorStore] = {}
+
+    def shard(i: int) -> VectorStore:
+        if i not in opened:
+            if provider == "chroma":
+                assert ChromaVectorStore is not None
+                opened[i] = ChromaVectorStore(
+                    persist_directory=settings.CHROMA_DIR,
+                    collection_name=_chroma_collection(i),
+                    embedder=embedder,
+                    batch_size=settings.CHROMA_BATCH_SIZE,
+                )
+            elif provider == "shared":
+                opened[i] = SharedMmapVectorStore(
+                    _shared_index_dir(i),
+                    embedder=embedder,
+                    max_segments=settings.SHARED_INDEX_MAX_SEGMENTS,
+                )
+            elif provider == "dense":
+                opened[i] = DenseVectorStore(embedder=embedder)
+            elif provider == "quantized":
+                opened[i] = QuantizedVectorStore(
+                    embedder=embedder,
+                    codec=settings.QUANTIZED_CODEC,
+                    oversample=settings.QUANTIZED_OVERSAMPLE,
+                    rescore_dir=(
+                        Path(settings.QUANTIZED_RESCORE_DIR)
+                        if settings.QUANTIZED_RESCORE == "mmap"
+                        else None
+                    ),
+                )
+            else:
+                opened[i] = InMemoryVectorStore()
+        return opened[i]
+
+    shards = max(1, settings.VECTOR_STORE_SHARDS)
+    if provider in _PERSISTENT_PROVIDERS:
+        _rebalance_persistent_shards(provider, shard, shards)
+    if shards == 1:
+        return shard(0)
+    return ShardedVectorStore(
+        [shard(i) for i in range(shards)],
+        max_workers=settings.VECTOR_STORE_SHARD_WORKERS or None,
+    )
+
+
+def _build_text_extractor() -> TextExtractor:
+    return PyPDFTextExtractor(
+        parallel_min_pages=settings.PDF_PARALLEL_MIN_PAGES,
+        max_workers=settings.PDF_PARALLEL_WORKERS or None,
+        slow_page_seconds=settings.PDF_SLOW_PAGE_SECONDS,
+    )
+
+
+def _build_chunker() -> Chunker:
+    return SimpleChunker(max_tokens=800, overlap_tokens=120, mode=settings.CHUNKER_MODE)
+
+
+def build_ingest_use_case() -> IngestDocument:
+    """Fábrica de nível de módulo (serializável) usada também nos workers de ingestão."""
+    return IngestDocument(
+        repo=LocalDocumentRepository(),
+        extractor=_build_text_extractor(),
+        chunker=_build_chunker(),
+        dedupe=settings.DEDUPE_UPLOADS,
+    )
+
+
+def build_ingestion_jobs(
+    store: VectorStore, metrics: AppMetrics | None = None
+) -> IngestionJobQueue:
+    return IngestionJobQueue(
+        ingest_factory=build_ingest_use_case,
+        index_uc=IndexDocumentChunks(FilesystemJsonlChunkSource(settings.PROCESSED_DIR), store),
+        max_workers=settings.INGEST_WORKERS,
+        max_depth=settings.INGEST_QUEUE_MAX_DEPTH,
+        history=settings.INGEST_JOBS_HISTORY,
+        metrics=metrics,
+    )
+
+
+def _build_index_warmer(store: VectorStore, repo: DocumentRepository) -> IndexWarmer | None:
+    """Stores em memória começam vazios: recarregados do snapshot + arquivos de chunks."""
+    provider = _vector_store_provider()
+    if not settings.SNAPSHOT_ENABLED or provider not in ("inmemory", "dense", "quantized"):
+        return None
+    return IndexWarmer(
+        store,
+        snapshot_path=Path(settings.SNAPSHOT_DIR) / f"{provider}.snap",
+        document_ids=lambda: (doc.id for doc in repo.list_documents()),
+        source=FilesystemJsonlChunkSource(settings.PROCESSED_DIR),
+        workers=settings.WARM_LOAD_WORKERS,
+        batch_documents=settings.WARM_LOAD_BATCH_DOCUMENTS,
+    )
 
 
 def build_container() -> Container:
     repo = LocalDocumentRepository()
-    extractor = PyPDFTextExtractor()
-    chunker = SimpleChunker(max_tokens=800, overlap_tokens=120)
-    store = _build_vector_store()
+    extractor = _build_text_extractor()
+    chunker = _build_chunker()
+    # o container guarda o embedder para expor as estatísticas do cache em /metrics
+    embedder = _build_embedder() if _vector_store_provider() != "inmemory" else None
+    store = _build_vector_store(embedder)
+    index_warmer = _build_index_warmer(store, repo)
+    metrics: AppMetrics | None = None
+    if settings.METRICS_ENABLED:
+        metrics = AppMetrics()
+        store = MeteredVectorStore(store, provider=_vector_store_provider(), metrics=metrics)
+    store.use_runner(
+        BoundedExecutor(
+            max_workers=settings.VECTOR_STORE_WORKERS,
+            max_in_flight=settings.VECTOR_STORE_MAX_IN_FLIGHT,
+            queue_timeout=settings.VECTOR_STORE_QUEUE_TIMEOUT_SECONDS,
+        )
+    )
+    query_cache: QueryResultCache[QueryRAGOutput] | None = None
+    if settings.QUERY_CACHE_ENABLED:
+        query_cache = QueryResultCache(
+            max_entries=settings.QUERY_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.QUERY_CACHE_TTL_SECONDS,
+        )
 
     return Container(
         document_repository=repo,
         text_extractor=extractor,
         chunker=chunker,
         vector_store=store,
+        query_cache=query_cache,
+        embedding_cache=embedder.cache if isinstance(embedder, CachedEmbedder) else None,
+        ingestion_jobs=(
+            build_ingestion_jobs(store, metrics) if settings.INGEST_JOBS_ENABLED else None
+        ),
+        metrics=metrics,
+        index_warmer=index_warmer,
     )
@@ -51,14 +51,67 @@ class Settings(BaseSettings):
     RAW_DIR: Path = DATA_DIR / "raw"
     PROCESSED_DIR: Path = DATA_DIR / "processed"
     INDEX_DIR: Path = DATA_DIR / "index"
+    CATALOG_PATH: Path = INDEX_DIR / "catalog.sqlite3"  # catálogo de documentos (derivado)
 
     # Manter arquivos de teste após pytest se =1
     KEEP_TEST_DATA: bool = False
 
+    # ---- Upload ----
+    UPLOAD_MAX_BYTES: int = 200 * 1024 * 1024  # acima disso o upload é abortado com 413
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024  # tamanho dos blocos gravados em disco
+    DEDUPE_UPLOADS: bool = False  # se =1, PDFs com o mesmo SHA-256 reutilizam o documento existente
+
+    # ---- Extração de PDF ----
+    PDF_PARALLEL_MIN_PAGES: int = 200  # a partir daqui, extração paralela por faixas de páginas
+    PDF_PARALLEL_WORKERS: int = 0  # 0 = os.cpu_count()
+    PDF_SLOW_PAGE_SECONDS: float = 2.0  # páginas mais lentas que isso são logadas
+
+    # ---- Chunking ----
+    CHUNKER_MODE: str = (
+        "words"  # 'words' | 'offsets' (fatias do texto original, sem cópia por palavra)
+    )
+
+    # ---- Ingestão assíncrona (jobs) ----
+    INGEST_JOBS_ENABLED: bool = False  # se =1, POST /v1/documents responde 202 com um job
+    INGEST_WORKERS: int = 2  # processos que executam extração/chunking
+    INGEST_QUEUE_MAX_DEPTH: int = 32  # jobs não finalizados; acima disso, 429
+    INGEST_JOBS_HISTORY: int = 1000  # jobs finalizados mantidos para consulta
+
     # ---- Vector Store Provider ----
-    VECTOR_STORE_PROVIDER: str = "inmemory"  # 'inmemory' | 'chroma'
+    VECTOR_STORE_PROVIDER: str = "inmemory"  # 'inmemory'|'dense'|'quantized'|'chroma'|'shared'
+    VECTOR_STORE_WORKERS: int = 4  # threads do executor dedicado do store (buscas/escritas)
+    VECTOR_STORE_MAX_IN_FLIGHT: int = 64  # buscas + escritas aceitas; acima disso, 429
+    VECTOR_STORE_QUEUE_TIMEOUT_SECONDS: float = 2.0  # espera máxima na fila; depois, 503
+    VECTOR_STORE_SHARDS: int = 1  # >1 particiona os chunks por hash do document_id
+    VECTOR_STORE_SHARD_WORKERS: int = 0  # threads da busca em paralelo nos shards (0 = 1/shard)
+    EMBEDDING_DIM: int = 256  # dimensão das embeddings por hashing (dense/quantized/chroma)
+    EMBEDDING_CACHE_ENABLED: bool = True  # cache persistente (sqlite) de embeddings por conteúdo
+    EMBEDDING_CACHE_PATH: Path = INDEX_DIR / "embedding_cache.sqlite3"
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 500_000
     CHROMA_DIR: Path = Path(".chroma")  # diretório de persistência do Chroma
     CHROMA_COLLECTION: str = "rag_chunks"
+    CHROMA_BATCH_SIZE: int = 1000  # chunks por upsert (limitado ao máximo do cliente Chroma)
+    SHARED_INDEX_DIR: Path = INDEX_DIR / "shared"  # índice mmap compartilhado entre workers
+    SHARED_INDEX_MAX_SEGMENTS: int = 16  # acima disso, os segmentos são fundidos
+    QUANTIZED_CODEC: str = "int8"  # 'int8' (1 byte/dimensão) | 'binary' (1 bit, Hamming)
+    QUANTIZED_OVERSAMPLE: int = 4  # candidatos = top_k * isso, reordenados pelo cosseno exato
+    QUANTIZED_RESCORE: str = "mmap"  # 'mmap' (float32 em arquivo mapeado) | 'embed' (recalcula)
+    QUANTIZED_RESCORE_DIR: Path = INDEX_DIR / "quantized"  # arquivos temporários (um/processo)
+    SNAPSHOT_ENABLED: bool = True  # em memória: carrega snapshot ao iniciar, grava ao sair
+    SNAPSHOT_DIR: Path = INDEX_DIR / "snapshots"
+    WARM_LOAD_WORKERS: int = 0  # processos que leem os .chunks.jsonl na carga inicial (0 = CPUs)
+    WARM_LOAD_BATCH_DOCUMENTS: int = 64  # documentos por lote lido/indexado na carga inicial
+
+    # ---- Observabilidade ----
+    METRICS_ENABLED: bool = True  # GET /metrics (formato Prometheus) e middleware por rota
+    PROFILING_ENABLED: bool = False  # se =1, requisições com X-Profile: 1 são perfiladas
+    PROFILING_ALLOWLIST: list[str] = ["127.0.0.1", "::1"]  # IPs/redes que podem pedir profiling
+    PROFILES_DIR: Path = DATA_DIR / "profiles"  # saída pstats (<id>.pstats)
+
+    # ---- Cache de resultados de consulta (QueryRAG) ----
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_MAX_ENTRIES: int = 2048
+    QUERY_CACHE_TTL_SECONDS: float = 300.0
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -66,7 +119,7 @@ class Settings(BaseSettings):
         extra="ignore",  # chaves extras no .env não quebram o app
     )
 
-    @field_validator("CORS_ORIGINS", mode="before")
+    @field_validator("CORS_ORIGINS", "PROFILING_ALLOWLIST", mode="before")
     @classmethod
     def _val_cors_origins(cls, v: str | list[str]) -> list[str] | str:
         return _parse_origins(v)
@@ -1,26 +1,53 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 from app.container import Container, build_container
 from app.core.config import settings
 from app.core.logging import configure_logging
 from app.version import APP_NAME, APP_VERSION
 from interface_adapters.web.api.v1.documents import get_router as documents_router_factory
-from interface_adapters.web.api.v1.health import router as health_router
+from interface_adapters.web.api.v1.health import get_router as health_router_factory
+from interface_adapters.web.api.v1.jobs import get_router as jobs_router_factory
 from interface_adapters.web.api.v1.rag import get_router as rag_router_factory
+from interface_adapters.web.metrics import MetricsMiddleware
+from interface_adapters.web.metrics import get_router as metrics_router_factory
+from interface_adapters.web.profiling import ProfilingMiddleware
 
 
 def create_app(container: Container | None = None) -> FastAPI:
     configure_logging()
 
+    # DI: permite injetar container customizado em testes
+    container = container or build_container()
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        warmer = container.index_warmer
+        if warmer is not None:
+            # em segundo plano: /v1/health/ready responde 503 até o índice ficar completo
+            warmer.start()
+        yield
+        if warmer is not None:
+            await run_in_threadpool(warmer.stop)
+        if container.ingestion_jobs is not None:
+            container.ingestion_jobs.shutdown()
+        if warmer is not None:
+            # depois da fila: escritas pendentes entram no snapshot (só se a carga terminou)
+            await run_in_threadpool(warmer.snapshot)
+
     app = FastAPI(
         title=APP_NAME,
         version=APP_VERSION,
         openapi_url="/openapi.json",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     if settings.CORS_ENABLED:
@@ -32,13 +59,32 @@ def create_app(container: Container | None = None) -> FastAPI:
             allow_headers=["*"],
         )
 
-    # DI: permite injetar container customizado em testes
-    container = container or build_container()
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(
+            ProfilingMiddleware,
+            profiles_dir=settings.PROFILES_DIR,
+            allowlist=settings.PROFILING_ALLOWLIST,
+        )
+
+    metrics = container.metrics
+    if metrics is not None:
+        # totais calculados só na coleta (sem custo no caminho das requisições)
+        metrics.track_counts(
+            documents=container.document_repository.count_documents,
+            chunks=container.vector_store.count,
+        )
+        if container.embedding_cache is not None:
+            metrics.track_embedding_cache(container.embedding_cache.stats)
+        if container.query_cache is not None:
+            metrics.track_query_cache(container.query_cache.stats)
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+        app.include_router(metrics_router_factory(metrics))
 
     api_v1_prefix = "/v1"
-    app.include_router(health_router, prefix=api_v1_prefix)
+    app.include_router(health_router_factory(container), prefix=api_v1_prefix)
     app.include_router(documents_router_factory(container), prefix=api_v1_prefix)
     app.include_router(rag_router_factory(container), prefix=api_v1_prefix)
+    app.include_router(jobs_router_factory(container), prefix=api_v1_prefix)
 
     @app.get("/", tags=["root"])
     def root() -> dict[str, str]:
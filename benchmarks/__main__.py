@@ -0,0 +1,96 @@
+"""
+Suíte de benchmarks de ingestão e consulta.
+
+Uso:
+    python -m benchmarks run --preset small --out bench.json
+    python -m benchmarks run --providers inmemory,dense --out bench.json
+    python -m benchmarks compare baseline.json bench.json --threshold 0.15
+
+`run` grava um relatório JSON ({"meta", "metrics"}); `compare` lista a variação de
+cada métrica e termina com código 1 se alguma piorar mais que o limite.
+Os dados gravados pelo benchmark ficam num diretório temporário (não em `data/`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from collections.abc import Sequence
+from dataclasses import replace
+from pathlib import Path
+
+
+def _isolate_data_dirs(root: Path) -> None:
+    # precisa acontecer antes da primeira importação de app.core.config
+    os.environ.setdefault("DATA_DIR", str(root))
+    os.environ.setdefault("RAW_DIR", str(root / "raw"))
+    os.environ.setdefault("PROCESSED_DIR", str(root / "processed"))
+    os.environ.setdefault("INDEX_DIR", str(root / "index"))
+    os.environ.setdefault("CATALOG_PATH", str(root / "index" / "catalog.sqlite3"))
+    os.environ.setdefault("EMBEDDING_CACHE_PATH", str(root / "index" / "embeddings.sqlite3"))
+    os.environ.setdefault("CHROMA_DIR", str(root / "chroma"))
+    os.environ.setdefault("SHARED_INDEX_DIR", str(root / "index" / "shared"))
+    os.environ.setdefault("QUANTIZED_RESCORE_DIR", str(root / "index" / "quantized"))
+
+
+def _run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory(prefix="rag-bench-data-") as tmp:
+        _isolate_data_dirs(Path(tmp))
+        from benchmarks.suite import PRESETS, STORE_FACTORIES, run_suite
+
+        config = PRESETS[args.preset]
+        if args.providers:
+            names = tuple(p.strip() for p in args.providers.split(",") if p.strip())
+            unknown = [n for n in names if n not in STORE_FACTORIES]
+            if unknown:
+                print(f"provedores desconhecidos: {', '.join(unknown)}", file=sys.stderr)
+                return 2
+            config = replace(config, providers=names)
+        report = run_suite(config)
+
+    payload = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        Path(args.out).write_text(payload + "\n", encoding="utf-8")
+        print(f"relatório gravado em {args.out} ({len(report['metrics'])} métricas)")
+    else:
+        print(payload)
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    from benchmarks.compare import compare_reports, format_comparison
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    result = compare_reports(baseline, current, threshold=args.threshold)
+    print(format_comparison(result))
+    return 1 if result.regressions else 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="executa a suíte e gera um relatório JSON")
+    run.add_argument("--preset", choices=("small", "medium", "large"), default="medium")
+    run.add_argument("--providers", help="lista separada por vírgulas (padrão: todos)")
+    run.add_argument("--out", help="arquivo de saída (padrão: stdout)")
+    run.set_defaults(func=_run)
+
+    cmp = sub.add_parser("compare", help="compara um relatório com um baseline salvo")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument(
+        "--threshold", type=float, default=0.15, help="piora relativa tolerada (0.15 = 15%%)"
+    )
+    cmp.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    return int(args.func(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+"""
+Benchmark do SimpleChunker: modo "words" x modo "offsets".
+
+Uso:
+    python -m benchmarks.chunker              # texto sintético de 50 MB
+    python -m benchmarks.chunker --mb 5 --json
+
+Para cada modo mede o tempo de `chunk(text)` (sem tracemalloc, que distorce o
+custo de alocações pequenas) e, numa segunda execução, o pico de memória alocada
+durante o chunking (tracemalloc; o texto de entrada é criado antes e não conta).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Sequence
+from typing import Any
+
+from benchmarks.corpus import synthetic_text
+from infrastructure.chunking.simple_chunker import CHUNKER_MODES, SimpleChunker
+
+
+def measure(mode: str, text: str, max_tokens: int = 800, overlap: int = 120) -> dict[str, Any]:
+    chunker = SimpleChunker(max_tokens=max_tokens, overlap_tokens=overlap, mode=mode)
+
+    t0 = time.perf_counter()
+    chunks = sum(1 for _ in chunker.chunk(text))
+    seconds = time.perf_counter() - t0
+
+    tracemalloc.start()
+    try:
+        for _ in chunker.chunk(text):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    mb = len(text.encode("utf-8")) / (1024 * 1024)
+    return {
+        "mode": mode,
+        "chunks": chunks,
+        "seconds": round(seconds, 4),
+        "mb_per_s": round(mb / seconds, 2) if seconds else None,
+        "peak_alloc_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+def run(size_mb: float = 50.0) -> dict[str, Any]:
+    text = synthetic_text(size_mb)
+    return {
+        "text_mb": round(len(text.encode("utf-8")) / (1024 * 1024), 2),
+        "results": [measure(mode, text) for mode in CHUNKER_MODES],
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.chunker")
+    parser.add_argument("--mb", type=float, default=50.0, help="tamanho do texto sintético")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.mb)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"texto: {report['text_mb']} MB")
+    print(f"{'modo':<10}{'chunks':>10}{'segundos':>12}{'MB/s':>10}{'pico (MB)':>12}")
+    for r in report["results"]:
+        print(
+            f"{r['mode']:<10}{r['chunks']:>10}{r['seconds']:>12}"
+            f"{r['mb_per_s']:>10}{r['peak_alloc_mb']:>12}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
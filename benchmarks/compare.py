@@ -0,0 +1,74 @@
+"""
+Comparação de dois relatórios da suíte (`baseline` x `current`).
+
+Uma métrica regride quando piora mais que `threshold` (fração relativa) no sentido
+indicado por `better`: "lower" (latências, memória) ou "higher" (vazão).
+Métricas presentes em apenas um dos relatórios são listadas, mas não contam como regressão.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class MetricDelta:
+    name: str
+    unit: str
+    baseline: float
+    current: float
+    change: float  # variação relativa (current / baseline - 1)
+    regression: bool
+
+
+@dataclass(frozen=True)
+class Comparison:
+    deltas: list[MetricDelta]
+    missing: list[str]  # no baseline, mas não no atual
+    added: list[str]  # no atual, mas não no baseline
+
+    @property
+    def regressions(self) -> list[MetricDelta]:
+        return [d for d in self.deltas if d.regression]
+
+
+def compare_reports(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.15
+) -> Comparison:
+    base_metrics: dict[str, dict[str, Any]] = baseline.get("metrics", {})
+    cur_metrics: dict[str, dict[str, Any]] = current.get("metrics", {})
+    deltas: list[MetricDelta] = []
+    for name in sorted(base_metrics.keys() & cur_metrics.keys()):
+        base, cur = base_metrics[name], cur_metrics[name]
+        b, c = float(base["value"]), float(cur["value"])
+        change = (c / b - 1.0) if b else 0.0
+        worse = change if cur.get("better", base.get("better")) == "lower" else -change
+        deltas.append(
+            MetricDelta(
+                name=name,
+                unit=str(cur.get("unit", "")),
+                baseline=b,
+                current=c,
+                change=change,
+                regression=worse > threshold,
+            )
+        )
+    return Comparison(
+        deltas=deltas,
+        missing=sorted(base_metrics.keys() - cur_metrics.keys()),
+        added=sorted(cur_metrics.keys() - base_metrics.keys()),
+    )
+
+
+def format_comparison(result: Comparison) -> str:
+    lines = [f"{'métrica':<40}{'baseline':>12}{'atual':>12}{'variação':>10}"]
+    for d in result.deltas:
+        flag = "  REGRESSÃO" if d.regression else ""
+        lines.append(f"{d.name:<40}{d.baseline:>12.4g}{d.current:>12.4g}{d.change:>+10.1%}{flag}")
+    for name in result.missing:
+        lines.append(f"{name:<40}  ausente no relatório atual")
+    for name in result.added:
+        lines.append(f"{name:<40}  nova (sem baseline)")
+    lines.append(f"{len(result.regressions)} regressão(ões) em {len(result.deltas)} métricas")
+    return "\n".join(lines)
@@ -0,0 +1,65 @@
+"""Corpora sintéticos determinísticos (mesma semente -> mesmos dados) para os benchmarks."""
+
+from __future__ import annotations
+
+import random
+from itertools import accumulate
+
+from domain.services.vector_store import Chunk
+
+_LETTERS = "abcdefghijklmnopqrstuvwxyzçãéí"
+
+
+def vocabulary(size: int = 5000, seed: int = 13) -> list[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choices(_LETTERS, k=rng.randrange(2, 11))) for _ in range(size)]
+
+
+def _zipf_weights(n: int) -> list[float]:
+    # distribuição de frequência próxima à de texto real (poucas palavras muito comuns)
+    return list(accumulate(1.0 / (rank + 1) for rank in range(n)))
+
+
+def synthetic_text(size_mb: float, seed: int = 13) -> str:
+    """Texto com parágrafos de tamanho variável (~size_mb MB em UTF-8)."""
+    rng = random.Random(seed)
+    vocab = vocabulary(seed=seed)
+    target = int(size_mb * 1024 * 1024)
+    paragraphs: list[str] = []
+    size = 0
+    while size < target:
+        para = " ".join(rng.choices(vocab, k=rng.randrange(20, 160)))
+        paragraphs.append(para)
+        size += len(para.encode("utf-8")) + 2
+    return "\n\n".join(paragraphs)
+
+
+def synthetic_chunks(
+    documents: int, chunks_per_document: int, words_per_chunk: int = 120, seed: int = 13
+) -> list[Chunk]:
+    rng = random.Random(seed)
+    vocab = vocabulary(seed=seed)
+    weights = _zipf_weights(len(vocab))
+    chunks: list[Chunk] = []
+    for d in range(documents):
+        doc_id = f"bench-doc-{d:06d}"
+        for i in range(chunks_per_document):
+            words = rng.choices(vocab, cum_weights=weights, k=words_per_chunk)
+            chunks.append(
+                Chunk(
+                    document_id=doc_id,
+                    content=" ".join(words),
+                    chunk_id=f"{doc_id}:{i}",
+                    metadata={"page_start": i + 1, "page_end": i + 1},
+                )
+            )
+    return chunks
+
+
+def synthetic_queries(count: int, words_per_query: int = 6, seed: int = 29) -> list[str]:
+    rng = random.Random(seed)
+    vocab = vocabulary(seed=13)  # mesmo vocabulário dos chunks
+    weights = _zipf_weights(len(vocab))
+    return [
+        " ".join(rng.choices(vocab, cum_weights=weights, k=words_per_query)) for _ in range(count)
+    ]
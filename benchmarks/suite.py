@@ -0,0 +1,308 @@
+"""
+Suíte de benchmarks: chunker, repositório local, VectorStores e consulta ponta a ponta.
+
+Cada métrica é registrada como {"value", "unit", "better"} sob uma chave estável
+("store.dense.search_p95_ms", ...), o que permite comparar execuções com `compare`.
+Os diretórios de dados devem apontar para um local temporário antes da importação
+de `app.core.config` (ver `benchmarks.__main__`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import platform
+import statistics
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from benchmarks import chunker as chunker_bench
+from benchmarks.corpus import synthetic_chunks, synthetic_queries
+from domain.entities.document import Document
+from domain.services.vector_store import Chunk, VectorStore
+from infrastructure.embeddings.hashing import HashingEmbedder
+from infrastructure.vectorstores.dense import DenseVectorStore
+from infrastructure.vectorstores.in_memory import InMemoryVectorStore
+from infrastructure.vectorstores.quantized import QuantizedVectorStore
+from infrastructure.vectorstores.sharded import ShardedVectorStore
+from infrastructure.vectorstores.shared_mmap import SharedMmapVectorStore
+
+Metrics = dict[str, dict[str, Any]]
+StoreFactory = Callable[[Path], VectorStore]
+
+
+def _chroma_factory(workdir: Path) -> VectorStore:
+    from infrastructure.vectorstores.chroma import ChromaVectorStore
+
+    return ChromaVectorStore(persist_directory=workdir / "chroma", collection_name="bench")
+
+
+def _shared_factory(workdir: Path) -> VectorStore:
+    return SharedMmapVectorStore(workdir / "shared", embedder=HashingEmbedder())
+
+
+def _quantized_factory(codec: str) -> StoreFactory:
+    return lambda workdir: QuantizedVectorStore(
+        embedder=HashingEmbedder(), codec=codec, rescore_dir=workdir / "vectors"
+    )
+
+
+# provedores medidos; novos VectorStores devem ser registrados aqui
+STORE_FACTORIES: dict[str, StoreFactory] = {
+    "inmemory": lambda _: InMemoryVectorStore(),
+    "dense": lambda _: DenseVectorStore(embedder=HashingEmbedder()),
+    "chroma": _chroma_factory,
+    "shared": _shared_factory,
+    "dense_sharded": lambda _: ShardedVectorStore(
+        [DenseVectorStore(embedder=HashingEmbedder()) for _ in range(4)]
+    ),
+    "quantized_int8": _quantized_factory("int8"),
+    "quantized_binary": _quantized_factory("binary"),
+}
+
+
+@dataclass(frozen=True)
+class SuiteConfig:
+    documents: int = 200
+    chunks_per_document: int = 50
+    queries: int = 200
+    top_k: int = 5
+    text_mb: float = 5.0  # texto do benchmark de chunker
+    repo_documents: int = 500
+    providers: tuple[str, ...] = tuple(STORE_FACTORIES)
+    e2e_queries: int = 200
+
+
+PRESETS: dict[str, SuiteConfig] = {
+    "small": SuiteConfig(
+        documents=40, chunks_per_document=25, queries=100, text_mb=1.0, repo_documents=100
+    ),
+    "medium": SuiteConfig(),
+    "large": SuiteConfig(
+        documents=1000,
+        chunks_per_document=100,
+        queries=500,
+        text_mb=50.0,
+        repo_documents=5000,
+        e2e_queries=500,
+    ),
+}
+
+
+def run_suite(config: SuiteConfig, workdir: Path | None = None) -> dict[str, Any]:
+    metrics: Metrics = {}
+    with tempfile.TemporaryDirectory(prefix="rag-bench-") as tmp:
+        base = workdir or Path(tmp)
+        bench_chunker(config, metrics)
+        bench_repository(config, metrics)
+        chunks = synthetic_chunks(config.documents, config.chunks_per_document)
+        queries = synthetic_queries(config.queries)
+        exact: list[list[tuple[float, Chunk]]] | None = None
+        for name in config.providers:
+            store = bench_store(
+                name, STORE_FACTORIES[name], base / name, chunks, queries, config, metrics
+            )
+            if isinstance(store, QuantizedVectorStore):
+                if exact is None:
+                    exact = _exact_results(chunks, queries, config.top_k)
+                bench_quantization(name, store, queries, exact, config, metrics)
+        bench_e2e_query(config, chunks, metrics)
+    return {"meta": _meta(config), "metrics": metrics}
+
+
+def bench_chunker(config: SuiteConfig, metrics: Metrics) -> None:
+    report = chunker_bench.run(config.text_mb)
+    for r in report["results"]:
+        prefix = f"chunker.{r['mode']}"
+        _put(metrics, f"{prefix}.mb_per_s", r["mb_per_s"], "MB/s", "higher")
+        _put(metrics, f"{prefix}.peak_alloc_mb", r["peak_alloc_mb"], "MB", "lower")
+
+
+def bench_repository(config: SuiteConfig, metrics: Metrics) -> None:
+    from infrastructure.storage.local_document_repository import LocalDocumentRepository
+
+    repo = LocalDocumentRepository()
+    chunk_rows = [{"content": c.content, **c.metadata} for c in synthetic_chunks(1, 50, seed=7)]
+    save_chunks: list[float] = []
+    save_meta: list[float] = []
+    ids: list[str] = []
+    for i in range(config.repo_documents):
+        paths = repo.allocate_paths(f"bench-{i}.pdf")
+        t0 = time.perf_counter()
+        repo.save_chunks(iter(chunk_rows), paths["chunks_path"])
+        save_chunks.append(time.perf_counter() - t0)
+        doc = Document(
+            id=paths["id"],
+            original_filename=f"bench-{i}.pdf",
+            stored_filename=paths["raw_path"].name,
+            size_bytes=1024,
+            pages=len(chunk_rows),
+            created_at=datetime.now(timezone.utc),
+        )
+        t0 = time.perf_counter()
+        repo.save_meta(doc, paths["meta_path"])
+        save_meta.append(time.perf_counter() - t0)
+        ids.append(paths["id"])
+
+    list_page = _timed_calls(lambda: repo.list_page(limit=100), 50)
+    count = [_timed(partial(repo.count_chunks, doc_id)) for doc_id in ids[:200]]
+    get_chunk = [_timed(partial(repo.get_chunk, doc_id, 25)) for doc_id in ids[:200]]
+
+    _put(metrics, "repo.save_chunks_ms", _ms(statistics.mean(save_chunks)), "ms", "lower")
+    _put(metrics, "repo.save_meta_ms", _ms(statistics.mean(save_meta)), "ms", "lower")
+    _put(metrics, "repo.list_page_p50_ms", _ms(_percentile(list_page, 50)), "ms", "lower")
+    _put(metrics, "repo.count_chunks_p50_ms", _ms(_percentile(count, 50)), "ms", "lower")
+    _put(metrics, "repo.get_chunk_p50_ms", _ms(_percentile(get_chunk, 50)), "ms", "lower")
+
+
+def bench_store(
+    name: str,
+    factory: StoreFactory,
+    workdir: Path,
+    chunks: Sequence[Chunk],
+    queries: Sequence[str],
+    config: SuiteConfig,
+    metrics: Metrics,
+) -> VectorStore | None:
+    try:
+        store = factory(workdir)
+    except ImportError:
+        return None  # provedor opcional ausente (ex.: chromadb)
+    t0 = time.perf_counter()
+    store.add(chunks)
+    add_seconds = time.perf_counter() - t0
+
+    store.similarity_search(queries[0], top_k=config.top_k)  # aquecimento
+    latencies = [_timed(partial(store.similarity_search, q, top_k=config.top_k)) for q in queries]
+    t0 = time.perf_counter()
+    store.similarity_search_batch(queries, top_k=config.top_k)
+    batch_seconds = time.perf_counter() - t0
+
+    prefix = f"store.{name}"
+    _put(metrics, f"{prefix}.add_chunks_per_s", len(chunks) / add_seconds, "chunks/s", "higher")
+    for p in (50, 95, 99):
+        _put(metrics, f"{prefix}.search_p{p}_ms", _ms(_percentile(latencies, p)), "ms", "lower")
+    _put(metrics, f"{prefix}.batch_queries_per_s", len(queries) / batch_seconds, "q/s", "higher")
+    return store
+
+
+def bench_quantization(
+    name: str,
+    store: QuantizedVectorStore,
+    queries: Sequence[str],
+    exact: Sequence[Sequence[tuple[float, Chunk]]],
+    config: SuiteConfig,
+    metrics: Metrics,
+) -> None:
+    """Memória dos códigos frente à matriz float32 e recall@k frente à busca exata."""
+    float_bytes = store.count() * store.dim * 4  # o que o `dense` guardaria
+    resident = store.resident_bytes()
+    got = store.similarity_search_batch(queries, top_k=config.top_k)
+    recalls: list[float] = []
+    for approx, expected in zip(got, exact, strict=True):
+        if not expected:
+            continue
+        # empates no k-ésimo score contam como acerto: qualquer um deles é um top-k exato
+        floor = expected[-1][0] - 1e-5
+        hits = sum(1 for score, _ in approx if score >= floor)
+        recalls.append(min(hits, len(expected)) / len(expected))
+
+    prefix = f"store.{name}"
+    _put(metrics, f"{prefix}.vector_memory_mb", resident / 2**20, "MB", "lower")
+    _put(metrics, f"{prefix}.memory_saved_pct", 100.0 * (1 - resident / float_bytes), "%", "higher")
+    recall = statistics.mean(recalls) if recalls else 1.0
+    _put(metrics, f"{prefix}.recall_at_k", recall, "ratio", "higher")
+
+
+def _exact_results(
+    chunks: Sequence[Chunk], queries: Sequence[str], top_k: int
+) -> list[list[tuple[float, Chunk]]]:
+    reference = DenseVectorStore(embedder=HashingEmbedder())
+    reference.add(chunks)
+    return reference.similarity_search_batch(queries, top_k=top_k)
+
+
+def bench_e2e_query(config: SuiteConfig, chunks: Sequence[Chunk], metrics: Metrics) -> None:
+    """POST /v1/rag/query pelo app ASGI (sem cache de resultados, store em memória)."""
+    from httpx import ASGITransport, AsyncClient
+
+    from app.container import Container
+    from app.main import create_app
+    from infrastructure.chunking.simple_chunker import SimpleChunker
+    from infrastructure.pdf.pypdf_text_extractor import PyPDFTextExtractor
+    from infrastructure.storage.local_document_repository import LocalDocumentRepository
+
+    store = InMemoryVectorStore()
+    store.add(chunks)
+    container = Container(
+        document_repository=LocalDocumentRepository(),
+        text_extractor=PyPDFTextExtractor(),
+        chunker=SimpleChunker(),
+        vector_store=store,
+    )
+    app = create_app(container)
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # um log INFO por requisição
+    queries = synthetic_queries(config.e2e_queries, seed=31)
+
+    async def _run() -> list[float]:
+        out: list[float] = []
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.post("/v1/rag/query", json={"question": queries[0]})
+            for q in queries:
+                t0 = time.perf_counter()
+                resp = await client.post(
+                    "/v1/rag/query", json={"question": q, "top_k": config.top_k}
+                )
+                out.append(time.perf_counter() - t0)
+                resp.raise_for_status()
+        return out
+
+    latencies = asyncio.run(_run())
+    for p in (50, 95, 99):
+        _put(metrics, f"e2e.rag_query_p{p}_ms", _ms(_percentile(latencies, p)), "ms", "lower")
+
+
+def _meta(config: SuiteConfig) -> dict[str, Any]:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "config": {**asdict(config), "providers": list(config.providers)},
+    }
+
+
+def _put(metrics: Metrics, key: str, value: float, unit: str, better: str) -> None:
+    metrics[key] = {"value": round(float(value), 4), "unit": unit, "better": better}
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def _timed_calls(fn: Callable[[], object], repeat: int) -> list[float]:
+    return [_timed(fn) for _ in range(repeat)]
+
+
+def _percentile(samples: Sequence[float], p: float) -> float:
+    """Percentil por rank mais próximo (sem interpolação)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def _ms(seconds: float) -> float:
+    return seconds * 1000.0
@@ -13,6 +13,7 @@ class Document:
     pages: int
     created_at: datetime
     content_type: str = "application/pdf"
+    sha256: str | None = None  # hash dos bytes brutos, quando conhecido
 
     @property
     def is_pdf(self) -> bool:
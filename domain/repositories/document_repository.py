@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Mapping
+from collections.abc import Iterable, Iterator, Mapping
 from pathlib import Path
 from typing import Protocol
 
 from domain.entities.document import Document
 
 
+class InvalidCursorError(ValueError):
+    """Cursor de paginação malformado ou de outra origem."""
+
+
 class DocumentRepository(Protocol):
     paths: Mapping[str, Path]
 
@@ -16,9 +20,33 @@ class DocumentRepository(Protocol):
 
     def save_raw(self, tmp_file: Path, raw_path: Path) -> None: ...
     def save_text(self, text: str, text_path: Path) -> None: ...
+    def save_text_pages(self, pages: Iterable[str], text_path: Path) -> Iterator[str]:
+        """Grava as páginas em `text_path` conforme são consumidas e as repassa adiante."""
+        ...
+
     def save_chunks(self, chunks: Iterable[dict], chunks_path: Path) -> int: ...
     def save_meta(self, doc: Document, meta_path: Path) -> None: ...
 
     def list_documents(self) -> Iterable[Document]: ...
+    def list_page(
+        self, limit: int, cursor: str | None = None, original_filename: str | None = None
+    ) -> tuple[list[Document], str | None]:
+        """Página (created_at DESC, id DESC) e o cursor da próxima, ou None no fim."""
+        ...
+
+    def count_documents(self) -> int: ...
+
     def get_document(self, doc_id: str) -> Document | None: ...
     def count_chunks(self, doc_id: str) -> int: ...
+    def get_chunk(self, doc_id: str, idx: int) -> dict | None: ...
+    def get_chunks(self, doc_id: str, offset: int = 0, limit: int = 50) -> list[dict]:
+        """Chunks [offset, offset + limit) na ordem do documento (lista vazia fora do intervalo)."""
+        ...
+
+    def find_by_sha256(self, sha256: str) -> Document | None:
+        """Documento já ingerido com este SHA-256 (bytes brutos), se houver."""
+        ...
+
+    def register_sha256(self, sha256: str, doc_id: str) -> str:
+        """Associa o hash ao documento; retorna o id efetivamente registrado para o hash."""
+        ...
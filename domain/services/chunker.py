@@ -8,3 +8,10 @@ class Chunker(Protocol):
     def chunk(self, text: str) -> Iterable[dict]:
         """Gera chunks no formato {'content': str, ...}."""
         ...
+
+    def chunk_pages(self, pages: Iterable[str]) -> Iterable[dict]:
+        """
+        Igual a `chunk`, mas consome um iterador de páginas (1-based na ordem recebida)
+        e inclui `page_start`/`page_end` em cada chunk.
+        """
+        ...
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Protocol
 
@@ -8,3 +9,10 @@ class TextExtractor(Protocol):
     def extract(self, pdf_path: Path) -> tuple[str, int]:
         """Retorna (texto, numero_de_paginas)."""
         ...
+
+    def iter_pages(self, pdf_path: Path) -> Iterator[str]:
+        """
+        Itera, de forma preguiçosa, o texto bruto de cada página (em ordem).
+        Páginas sem texto geram "", de modo que o total iterado é o número de páginas.
+        """
+        ...
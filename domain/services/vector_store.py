@@ -1,9 +1,33 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass, field
-from typing import Any
+from functools import partial
+from typing import Any, Protocol, TypeVar
+
+T = TypeVar("T")
+
+
+class StoreSaturatedError(RuntimeError):
+    """O store atingiu o limite de operações em andamento (a API responde 429)."""
+
+
+class StoreQueueTimeoutError(TimeoutError):
+    """A operação esperou na fila do store além do limite (a API responde 503)."""
+
+
+class BlockingRunner(Protocol):
+    """
+    Executa chamadas bloqueantes do store fora do event loop.
+    Com `bounded=True`, pode recusar (`StoreSaturatedError`) ou expirar na fila
+    (`StoreQueueTimeoutError`); com `bounded=False`, apenas espera a vez.
+    """
+
+    async def run(self, fn: Callable[[], T], bounded: bool = True) -> T: ...
 
 
 @dataclass(frozen=True)
@@ -18,13 +42,65 @@ class Chunk:
     chunk_id: str | None = None
     metadata: dict[str, Any] = field(default_factory=dict)
 
+    def content_hash(self) -> str:
+        """SHA-256 de conteúdo + metadata; identifica chunks alterados no reindex incremental."""
+        digest = hashlib.sha256(self.content.encode("utf-8"))
+        if self.metadata:
+            digest.update(b"\0")
+            digest.update(
+                json.dumps(self.metadata, sort_keys=True, ensure_ascii=False, default=str).encode(
+                    "utf-8"
+                )
+            )
+        return digest.hexdigest()
+
 
 class VectorStore(ABC):
     """
     Porta (interface) para um repositório vetorial.
     Implementações residem em infrastructure/vectorstores/*.
+
+    `generation` é um contador monotônico que as implementações incrementam
+    (via `_bump_generation`) sempre que `add`/`delete_by_document` alteram o
+    conteúdo; caches de resultados o usam para invalidação.
+
+    As variantes assíncronas (`asimilarity_search`, `asimilarity_search_batch`, `aadd`)
+    executam as síncronas no `BlockingRunner` associado ao store (`use_runner`), um
+    executor dedicado e limitado; sem runner, usam `asyncio.to_thread`. Buscas são
+    limitadas (podem ser recusadas sob saturação); `aadd` espera a vez, pois uma
+    escrita aceita não deve ser descartada.
     """
 
+    _generation: int = 0
+    _runner: BlockingRunner | None = None
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def _bump_generation(self) -> None:
+        self._generation += 1
+
+    def use_runner(self, runner: BlockingRunner | None) -> None:
+        self._runner = runner
+
+    async def _run_blocking(self, fn: Callable[[], T], bounded: bool = True) -> T:
+        if self._runner is None:
+            return await asyncio.to_thread(fn)
+        return await self._runner.run(fn, bounded=bounded)
+
+    async def aadd(self, chunks: Iterable[Chunk]) -> int:
+        """`add` no executor do store (um iterável preguiçoso é consumido lá)."""
+        return await self._run_blocking(partial(self.add, chunks), bounded=False)
+
+    async def asimilarity_search(self, query: str, top_k: int = 5) -> list[tuple[float, Chunk]]:
+        return await self._run_blocking(partial(self.similarity_search, query, top_k=top_k))
+
+    async def asimilarity_search_batch(
+        self, queries: Sequence[str], top_k: int = 5
+    ) -> list[list[tuple[float, Chunk]]]:
+        return await self._run_blocking(partial(self.similarity_search_batch, queries, top_k=top_k))
+
     @abstractmethod
     def add(self, chunks: Iterable[Chunk]) -> int:
         """
@@ -41,6 +117,16 @@ class VectorStore(ABC):
         """
         raise NotImplementedError
 
+    def similarity_search_batch(
+        self, queries: Sequence[str], top_k: int = 5
+    ) -> list[list[tuple[float, Chunk]]]:
+        """
+        Busca várias consultas de uma vez; um resultado por consulta, na ordem de entrada.
+        Implementação padrão sequencial; provedores sobrescrevem para pontuar o lote
+        numa única passada.
+        """
+        return [self.similarity_search(q, top_k=top_k) for q in queries]
+
     @abstractmethod
     def delete_by_document(self, document_id: str) -> int:
         """
@@ -48,3 +134,18 @@ class VectorStore(ABC):
         Retorna a quantidade removida.
         """
         raise NotImplementedError
+
+    def content_hashes(self, document_id: str) -> dict[str, str]:
+        """
+        {chunk_id: content_hash} dos chunks indexados do documento (usado no reindex
+        incremental). Provedores que não suportam levantam NotImplementedError.
+        """
+        raise NotImplementedError
+
+    def delete_chunks(self, document_id: str, chunk_ids: Iterable[str]) -> int:
+        """Remove os chunks indicados do documento. Retorna a quantidade removida."""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Quantidade de chunks indexados (provedores sem suporte levantam NotImplementedError)."""
+        raise NotImplementedError
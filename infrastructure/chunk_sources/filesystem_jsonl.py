@@ -18,8 +18,22 @@ class FilesystemJsonlChunkSource(ChunkSource):
     def __init__(self, processed_dir: str | Path = "data/processed") -> None:
         self._processed_dir = Path(processed_dir)
 
+    @property
+    def processed_dir(self) -> Path:
+        return self._processed_dir
+
+    def path_for(self, document_id: str) -> Path:
+        return self._processed_dir / f"{document_id}.chunks.jsonl"
+
+    def modified_at(self, document_id: str) -> float | None:
+        """mtime do arquivo de chunks (None se não existe)."""
+        try:
+            return self.path_for(document_id).stat().st_mtime
+        except FileNotFoundError:
+            return None
+
     def iter_chunks(self, document_id: str) -> Iterable[Chunk]:
-        path = self._processed_dir / f"{document_id}.chunks.jsonl"
+        path = self.path_for(document_id)
         if not path.exists():
             # Sem exceção aqui: deixar o caso de uso decidir como lidar com 0 itens
             return iter(())
@@ -0,0 +1,134 @@
+"""
+Tokenização por offsets para o modo "offsets" do SimpleChunker.
+
+As fronteiras de palavras (mesma definição de `str.split()`) são calculadas de forma
+vetorizada com NumPy sobre os code points de cada segmento (página ou bloco de texto),
+sem criar uma string por palavra. Uma quebra de parágrafo ("\\n\\n" no espaço entre
+duas palavras) é sinalizada em `breaks`, equivalendo ao token sentinela do modo "words".
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+
+import numpy as np
+
+# code points considerados espaço por str.isspace()/str.split() (todos < U+3001)
+_UNICODE_SPACES = np.array(
+    [c for c in range(128, 0x3001) if chr(c).isspace()],
+    dtype=np.uint32,
+)
+_WORD_START = re.compile(r"(?<=\s)\S")
+_NEWLINE = 10
+
+# tamanho nominal (em caracteres) dos blocos em que um texto único é varrido
+TEXT_BLOCK_CHARS = 1 << 18
+
+
+@dataclass(frozen=True)
+class Segment:
+    text: str  # conteúdo do segmento
+    base: int  # offset do início de `text` no texto completo
+    page: int  # página 1-based (1 para texto único)
+    starts: np.ndarray  # int64, início absoluto (base + local) de cada palavra
+    ends: np.ndarray  # int64, fim absoluto (exclusivo) de cada palavra
+    breaks: np.ndarray  # bool, quebra de parágrafo imediatamente antes da palavra i
+
+
+@dataclass(frozen=True)
+class _Scan:
+    starts: np.ndarray
+    ends: np.ndarray
+    inner_breaks: np.ndarray  # len(starts) - 1: "\n\n" entre as palavras i e i+1
+    leading_break: bool  # "\n\n" antes da primeira palavra (ou no segmento todo, se vazio)
+    trailing_break: bool  # "\n\n" depois da última palavra
+
+
+def text_segments(text: str, block_chars: int = TEXT_BLOCK_CHARS) -> Iterator[Segment]:
+    """Varre `text` em blocos cortados sempre no início de uma palavra (offsets absolutos)."""
+    pos = 0
+    n = len(text)
+    pending_break = False  # "\n\n" num espaço que ainda não foi seguido de palavra
+    seen_word = False
+    while pos < n:
+        stop = n
+        if pos + block_chars < n:
+            m = _WORD_START.search(text, pos + block_chars)
+            stop = m.start() if m else n
+        piece = text[pos:stop]
+        scan = _scan(piece)
+        if scan.starts.size == 0:
+            pending_break = pending_break or scan.leading_break
+            pos = stop
+            continue
+        breaks = np.empty(scan.starts.size, dtype=bool)
+        breaks[0] = seen_word and (pending_break or scan.leading_break)
+        breaks[1:] = scan.inner_breaks
+        yield Segment(piece, pos, 1, scan.starts + pos, scan.ends + pos, breaks)
+        seen_word = True
+        pending_break = scan.trailing_break
+        pos = stop
+
+
+def page_segments(pages: Iterable[str]) -> Iterator[Segment]:
+    """
+    Um segmento por página com palavras. Offsets absolutos no texto gravado por
+    `save_text_pages` (páginas não vazias, com strip, unidas por "\\n\\n").
+    """
+    written = 0  # tamanho do texto completo até aqui
+    first = True
+    seen_word = False
+    for page_no, page in enumerate(pages, start=1):
+        if not page:
+            continue
+        if not first:
+            written += 2
+        first = False
+        lead = len(page) - len(page.lstrip())
+        base = written - lead
+        written += len(page.strip())
+
+        scan = _scan(page)
+        if scan.starts.size == 0:
+            continue
+        breaks = np.empty(scan.starts.size, dtype=bool)
+        breaks[0] = seen_word  # mudança de página é sempre quebra de parágrafo
+        breaks[1:] = scan.inner_breaks
+        yield Segment(page, base, page_no, scan.starts + base, scan.ends + base, breaks)
+        seen_word = True
+
+
+def _scan(piece: str) -> _Scan:
+    codes = np.frombuffer(piece.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    space = (codes == 32) | ((codes >= 9) & (codes <= 13)) | ((codes >= 28) & (codes <= 31))
+    wide = np.flatnonzero(codes > 127)
+    if wide.size:
+        # só os poucos code points não-ASCII passam pelo teste mais caro
+        space[wide] = np.isin(codes[wide], _UNICODE_SPACES)
+    word = ~space
+
+    edges = np.diff(word.astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+    starts = np.flatnonzero(edges == 1).astype(np.int64)
+    ends = np.flatnonzero(edges == -1).astype(np.int64)
+    nn = np.flatnonzero((codes[:-1] == _NEWLINE) & (codes[1:] == _NEWLINE)).astype(np.int64)
+
+    size = codes.size
+    if starts.size == 0:
+        has = bool(nn.size)
+        return _Scan(starts, ends, np.zeros(0, dtype=bool), has, has)
+    gap_lo = np.concatenate(([0], ends))
+    gap_hi = np.concatenate((starts, [size]))
+    # espaço [lo, hi) contém "\n\n" se o primeiro par >= lo termina antes de hi
+    k = np.searchsorted(nn, gap_lo, side="left")
+    found = k < nn.size
+    has_break = np.zeros(gap_lo.size, dtype=bool)
+    has_break[found] = nn[k[found]] + 2 <= gap_hi[found]
+    return _Scan(
+        starts=starts,
+        ends=ends,
+        inner_breaks=has_break[1:-1],
+        leading_break=bool(has_break[0]),
+        trailing_break=bool(has_break[-1]),
+    )
@@ -1,41 +1,207 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import islice
 from typing import Any
 
+import numpy as np
+
 from domain.services.chunker import Chunker
+from infrastructure.chunking.offsets import Segment, page_segments, text_segments
+
+_PARAGRAPH = "\n\n"
+CHUNKER_MODES = ("words", "offsets")
 
 
 class SimpleChunker(Chunker):
-    def __init__(self, max_tokens: int = 800, overlap_tokens: int = 120) -> None:
+    """
+    Janelas de `max_tokens` palavras com sobreposição de `overlap_tokens`.
+    Quebras de parágrafo entram como token "\\n\\n" (contam para a janela).
+
+    Os tokens são consumidos de forma incremental: apenas a janela corrente fica em
+    memória, então `chunk_pages` processa documentos grandes página a página.
+
+    Modos (mesmas janelas e `offset_start`/`offset_end` em ambos):
+    - "words": o conteúdo é remontado com as palavras unidas por espaço;
+    - "offsets": as palavras são localizadas por offsets de caractere (sem uma string
+      por palavra) e o conteúdo é uma fatia do texto original, com o espaçamento
+      original preservado; inclui `char_start`/`char_end` no texto completo.
+    """
+
+    def __init__(
+        self, max_tokens: int = 800, overlap_tokens: int = 120, mode: str = "words"
+    ) -> None:
+        if mode not in CHUNKER_MODES:
+            raise ValueError(f"Modo de chunker inválido: {mode!r} (use {CHUNKER_MODES}).")
         self.max_tokens = max_tokens
         self.overlap_tokens = overlap_tokens
-
-    def _split_paragraphs(self, text: str) -> list[str]:
-        blocks = [b.strip() for b in text.split("\n\n") if b.strip()]
-        return blocks if blocks else [text]
+        self.mode = mode
 
     def chunk(self, text: str) -> Iterator[dict[str, Any]]:
         if not text.strip():
             return
+        if self.mode == "offsets":
+            yield from self._offset_windows(text_segments(text), whole=text)
+            return
+        for ch in self._windows(_iter_tokens([text])):
+            del ch["page_start"], ch["page_end"]
+            yield ch
+
+    def chunk_pages(self, pages: Iterable[str]) -> Iterator[dict[str, Any]]:
+        """
+        Mesmos chunks de `chunk("\\n\\n".join(paginas))`, acrescidos de
+        `page_start`/`page_end` (1-based) das palavras contidas no chunk.
+        """
+        if self.mode == "offsets":
+            yield from self._offset_windows(page_segments(pages), whole=None)
+            return
+        yield from self._windows(_iter_tokens(pages))
+
+    def _windows(self, tokens: Iterator[tuple[str, int]]) -> Iterator[dict[str, Any]]:
+        window: deque[tuple[str, int]] = deque()
+        start = 0  # offset (em tokens) do primeiro item de `window`
+        exhausted = False
+        while True:
+            # um token além da janela indica se ainda há continuação
+            while not exhausted and len(window) <= self.max_tokens:
+                tok = next(tokens, None)
+                if tok is None:
+                    exhausted = True
+                else:
+                    window.append(tok)
+            if not window:
+                return
 
-        paras = self._split_paragraphs(text)
-        words: list[str] = []
-        for p in paras:
-            words.extend(p.split())
-            words.append("\n\n")
-
-        if words and words[-1] == "\n\n":
-            words = words[:-1]
-
-        start = 0
-        n = len(words)
-        while start < n:
-            end = min(start + self.max_tokens, n)
-            piece = words[start:end]
-            content = " ".join(piece).replace(" \n\n ", "\n\n").strip()
+            piece = list(islice(window, self.max_tokens))
+            end = start + len(piece)
+            content = " ".join(w for w, _ in piece).replace(f" {_PARAGRAPH} ", _PARAGRAPH).strip()
             if content:
-                yield {"content": content, "offset_start": start, "offset_end": end}
-            if end >= n:
-                break
-            start = max(0, end - self.overlap_tokens)
+                pages = [p for w, p in piece if w != _PARAGRAPH]
+                yield {
+                    "content": content,
+                    "offset_start": start,
+                    "offset_end": end,
+                    "page_start": pages[0],
+                    "page_end": pages[-1],
+                }
+            if exhausted and len(window) <= self.max_tokens:
+                return
+
+            next_start = max(start + 1, end - self.overlap_tokens)
+            for _ in range(next_start - start):
+                window.popleft()
+            start = next_start
+
+    def _offset_windows(
+        self, segments: Iterator[Segment], whole: str | None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Mesmo janelamento de `_windows`, sobre arrays de tokens: início/fim absolutos
+        de cada palavra (-1 para a quebra de parágrafo) e o segmento de origem.
+        O custo em Python é por janela, não por palavra.
+        """
+        starts = np.empty(0, dtype=np.int64)
+        ends = np.empty(0, dtype=np.int64)
+        seg_ids = np.empty(0, dtype=np.int64)
+        live: dict[int, Segment] = {}  # segmentos ainda referenciados pela janela
+        next_seg = 0
+        start = 0  # offset (em tokens) de starts[0]
+        exhausted = False
+        while True:
+            while not exhausted and starts.size <= self.max_tokens:
+                seg = next(segments, None)
+                if seg is None:
+                    exhausted = True
+                    break
+                s_tok, e_tok = _segment_tokens(seg)
+                starts = np.concatenate((starts, s_tok))
+                ends = np.concatenate((ends, e_tok))
+                seg_ids = np.concatenate((seg_ids, np.full(s_tok.size, next_seg, dtype=np.int64)))
+                live[next_seg] = seg
+                next_seg += 1
+            if starts.size == 0:
+                return
+
+            n = min(self.max_tokens, starts.size)
+            end = start + n
+            words = np.flatnonzero(starts[:n] >= 0)
+            if words.size:
+                yield self._offset_chunk(
+                    starts[words], ends[words], seg_ids[words], live, whole, start, end
+                )
+            if exhausted and starts.size <= self.max_tokens:
+                return
+
+            drop = max(start + 1, end - self.overlap_tokens) - start
+            starts, ends, seg_ids = starts[drop:], ends[drop:], seg_ids[drop:]
+            start += drop
+            first_seg = int(seg_ids[0]) if seg_ids.size else next_seg
+            for sid in [sid for sid in live if sid < first_seg]:
+                del live[sid]
+
+    @staticmethod
+    def _offset_chunk(
+        starts: np.ndarray,
+        ends: np.ndarray,
+        seg_ids: np.ndarray,
+        live: dict[int, Segment],
+        whole: str | None,
+        offset_start: int,
+        offset_end: int,
+    ) -> dict[str, Any]:
+        char_start, char_end = int(starts[0]), int(ends[-1])
+        if whole is not None:
+            content = whole[char_start:char_end]
+        else:
+            # uma fatia por segmento (página); entre páginas o texto completo só tem "\n"
+            cuts = np.flatnonzero(np.diff(seg_ids)) + 1
+            first = np.concatenate(([0], cuts))
+            last = np.concatenate((cuts, [seg_ids.size])) - 1
+            parts: list[str] = []
+            prev_end = None
+            for i, j in zip(first.tolist(), last.tolist(), strict=True):
+                seg = live[int(seg_ids[i])]
+                a, b = int(starts[i]), int(ends[j])
+                if prev_end is not None:
+                    parts.append("\n" * (a - prev_end))
+                parts.append(seg.text[a - seg.base : b - seg.base])
+                prev_end = b
+            content = "".join(parts)
+        chunk: dict[str, Any] = {
+            "content": content,
+            "offset_start": offset_start,
+            "offset_end": offset_end,
+        }
+        if whole is None:
+            chunk["page_start"] = live[int(seg_ids[0])].page
+            chunk["page_end"] = live[int(seg_ids[-1])].page
+        chunk["char_start"] = char_start
+        chunk["char_end"] = char_end
+        return chunk
+
+
+def _segment_tokens(seg: Segment) -> tuple[np.ndarray, np.ndarray]:
+    """Arrays (início, fim) por token do segmento; quebras de parágrafo viram -1."""
+    positions = np.arange(seg.starts.size, dtype=np.int64) + np.cumsum(seg.breaks)
+    total = seg.starts.size + int(seg.breaks.sum())
+    starts = np.full(total, -1, dtype=np.int64)
+    ends = np.full(total, -1, dtype=np.int64)
+    starts[positions] = seg.starts
+    ends[positions] = seg.ends
+    return starts, ends
+
+
+def _iter_tokens(pages: Iterable[str]) -> Iterator[tuple[str, int]]:
+    """(palavra, página 1-based); parágrafos separados por um token "\\n\\n"."""
+    first = True
+    for page_no, page in enumerate(pages, start=1):
+        for block in page.split(_PARAGRAPH):
+            words = block.split()
+            if not words:
+                continue
+            if not first:
+                yield (_PARAGRAPH, page_no)
+            first = False
+            for w in words:
+                yield (w, page_no)
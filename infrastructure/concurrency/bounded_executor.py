@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+from domain.services.vector_store import StoreQueueTimeoutError, StoreSaturatedError
+from infrastructure.observability.profiling import profiled_call
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """
+    Pool de threads dedicado com controle de admissão (implementa `BlockingRunner`).
+
+    - `max_in_flight`: operações aceitas e ainda não concluídas (executando + na fila).
+      Acima disso, chamadas limitadas falham na hora com `StoreSaturatedError`.
+    - `queue_timeout`: tempo máximo que uma chamada limitada espera por uma thread;
+      se não começou até lá, é cancelada e falha com `StoreQueueTimeoutError`.
+      Depois de iniciada, a chamada roda até o fim.
+    - `bounded=False` (escritas): conta como em andamento, mas nunca é recusada.
+
+    As contextvars da requisição são propagadas à thread (ex.: sessão de profiling).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_in_flight: int = 64,
+        queue_timeout: float | None = 2.0,
+        name: str = "vector-store",
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_in_flight = max(self.max_workers, int(max_in_flight))
+        self.queue_timeout = queue_timeout if queue_timeout and queue_timeout > 0 else None
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def run(self, fn: Callable[[], T], bounded: bool = True) -> T:
+        with self._lock:
+            if bounded and self._in_flight >= self.max_in_flight:
+                raise StoreSaturatedError(
+                    f"Store saturado ({self._in_flight} operações em andamento)."
+                )
+            self._in_flight += 1
+
+        ctx = contextvars.copy_context()
+        try:
+            cfut: Future[T] = self._pool.submit(ctx.run, profiled_call, fn)
+        except BaseException:
+            self._release()
+            raise
+        cfut.add_done_callback(self._release)  # também ao ser cancelada
+        afut = asyncio.wrap_future(cfut)
+
+        if bounded and self.queue_timeout is not None:
+            done, _ = await asyncio.wait({afut}, timeout=self.queue_timeout)
+            # cancel() só tem efeito se a chamada ainda está na fila
+            if not done and cfut.cancel():
+                raise StoreQueueTimeoutError(
+                    f"Operação não iniciou em {self.queue_timeout:.2f}s (fila do store cheia)."
+                )
+        return await afut
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    def _release(self, _: object = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock(f: BinaryIO) -> None:
+        f.seek(0)
+        while True:
+            try:
+                # LK_LOCK tenta por ~10s e desiste com OSError: insiste até conseguir
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _unlock(f: BinaryIO) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(f: BinaryIO) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock(f: BinaryIO) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def exclusive_file_lock(path: str | Path) -> Iterator[None]:
+    """
+    Lock exclusivo e bloqueante em `path` (criado se não existir): `flock` no POSIX,
+    `msvcrt.locking` no primeiro byte do arquivo no Windows.
+
+    Serializa escritores entre processos (ex.: workers do uvicorn) e também entre
+    threads do mesmo processo, pois cada chamada abre o arquivo de novo. O lock é
+    liberado pelo sistema se o processo morrer.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+b") as f:
+        _lock(f)
+        try:
+            yield
+        finally:
+            _unlock(f)
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Protocol
+
+import numpy as np
+
+
+class EmbedderVersionMismatchError(RuntimeError):
+    """O índice persistido foi gerado com outra versão de embedder."""
+
+
+class Embedder(Protocol):
+    """Contrato interno da infraestrutura: textos -> matriz float32 (n, dim)."""
+
+    dim: int
+
+    @property
+    def version(self) -> str:
+        """Identifica o algoritmo/parâmetros; vetores de versões diferentes não se comparam."""
+        ...
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Retorna uma linha L2-normalizada por texto, na mesma ordem da entrada."""
+        ...
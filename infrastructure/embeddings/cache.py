@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from infrastructure.embeddings.base import Embedder
+
+
+class SqliteEmbeddingCache:
+    """
+    Cache persistente de embeddings em SQLite, chaveado por (versão do embedder, sha256 do texto).
+
+    O tamanho é limitado a `max_entries`; ao exceder, as entradas usadas há mais
+    tempo são removidas (LRU, via um contador monotônico de uso por entrada).
+    A conexão é aberta de forma preguiçosa no primeiro uso.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = 500_000) -> None:
+        self._path = Path(path)
+        self._max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._clock = 0
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, version: str, keys: Sequence[bytes], dim: int) -> dict[bytes, np.ndarray]:
+        if not keys:
+            return {}
+        found: dict[bytes, np.ndarray] = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(keys), 500):
+                part = keys[start : start + 500]
+                marks = ",".join("?" * len(part))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE version = ? AND key IN ({marks})",
+                    (version, *part),
+                ).fetchall()
+                for key, blob in rows:
+                    vec = np.frombuffer(blob, dtype=np.float32)
+                    if vec.shape[0] == dim:
+                        found[key] = vec
+            if found:
+                self._clock += 1
+                conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE version = ? AND key = ?",
+                    [(self._clock, version, k) for k in found],
+                )
+                conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, version: str, items: Sequence[tuple[bytes, np.ndarray]]) -> None:
+        if not items:
+            return
+        with self._lock:
+            conn = self._connection()
+            self._clock += 1
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (version, key, vector, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (version, key, np.asarray(vec, dtype=np.float32).tobytes(), self._clock)
+                    for key, vec in items
+                ],
+            )
+            self._size += conn.total_changes - before
+            overflow = self._size - self._max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM embeddings WHERE (version, key) IN ("
+                    "SELECT version, key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (overflow,),
+                )
+                self._size -= overflow
+                self.evictions += overflow
+            conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": self._size,
+            "max_entries": self._max_entries,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "version TEXT NOT NULL, key BLOB NOT NULL, vector BLOB NOT NULL, "
+                "last_used INTEGER NOT NULL, PRIMARY KEY (version, key)) WITHOUT ROWID"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)"
+            )
+            self._clock = conn.execute(
+                "SELECT COALESCE(MAX(last_used), 0) FROM embeddings"
+            ).fetchone()[0]
+            self._size = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+
+class CachedEmbedder(Embedder):
+    """
+    Decorador de `Embedder` que consulta o `SqliteEmbeddingCache` antes de calcular.
+    Textos repetidos dentro do mesmo lote são calculados uma única vez.
+    """
+
+    def __init__(self, embedder: Embedder, cache: SqliteEmbeddingCache) -> None:
+        self._embedder = embedder
+        self._cache = cache
+        self.dim = embedder.dim
+
+    @property
+    def version(self) -> str:
+        return self._embedder.version
+
+    @property
+    def cache(self) -> SqliteEmbeddingCache:
+        return self._cache
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        keys = [hashlib.sha256(t.encode("utf-8")).digest() for t in texts]
+        distinct = list(dict.fromkeys(keys))
+        vectors = self._cache.get_many(self.version, distinct, self.dim)
+
+        missing = [k for k in distinct if k not in vectors]
+        if missing:
+            first_text = dict(zip(keys, texts, strict=True))
+            computed = self._embedder.embed([first_text[k] for k in missing])
+            fresh = list(zip(missing, computed, strict=True))
+            self._cache.put_many(self.version, fresh)
+            vectors.update(fresh)
+
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for row, key in enumerate(keys):
+            out[row] = vectors[key]
+        return out
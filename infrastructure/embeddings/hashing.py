@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Sequence
+from itertools import chain
+
+import numpy as np
+
+from infrastructure.embeddings.base import Embedder
+
+# Incrementar sempre que tokenização, hash ou normalização mudarem:
+# vetores persistidos com outra versão deixam de ser comparáveis.
+HASHING_EMBEDDER_REVISION = 1
+
+
+class HashingEmbedder(Embedder):
+    """
+    Embedding bag-of-words por hashing de tokens casefolded, normalizada em L2.
+
+    O bucket de cada token vem de BLAKE2b (estável entre processos, ao contrário
+    do `hash()` builtin, que é salgado por processo). Um lote inteiro de textos é
+    tokenizado e contado numa única passada vetorizada (`np.bincount`).
+    """
+
+    def __init__(self, dim: int = 256, token_cache_size: int = 200_000) -> None:
+        self.dim = int(dim)
+        self._token_cache_size = int(token_cache_size)
+        self._bucket_cache: dict[str, int] = {}
+
+    @property
+    def version(self) -> str:
+        """Identificador gravado junto dos vetores persistidos (ex.: metadata da coleção)."""
+        return f"hashing-blake2b-v{HASHING_EMBEDDER_REVISION}-d{self.dim}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        n = len(texts)
+        token_lists = [t.casefold().split() for t in texts]
+        lengths = np.fromiter((len(toks) for toks in token_lists), dtype=np.int64, count=n)
+        flat = list(chain.from_iterable(token_lists))
+        if not flat:
+            return np.zeros((n, self.dim), dtype=np.float32)
+
+        # hash apenas uma vez por token distinto do lote
+        distinct: dict[str, int] = {}
+        codes = np.fromiter(
+            (distinct.setdefault(tok, len(distinct)) for tok in flat),
+            dtype=np.int64,
+            count=len(flat),
+        )
+        buckets = np.fromiter(
+            (self._bucket(tok) for tok in distinct), dtype=np.int64, count=len(distinct)
+        )
+
+        rows = np.repeat(np.arange(n, dtype=np.int64), lengths)
+        counts = np.bincount(rows * self.dim + buckets[codes], minlength=n * self.dim)
+        out = counts.reshape(n, self.dim).astype(np.float32)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0.0] = 1.0
+        out /= norms
+        return out
+
+    def _bucket(self, token: str) -> int:
+        bucket = self._bucket_cache.get(token)
+        if bucket is None:
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest, "little") % self.dim
+            if len(self._bucket_cache) >= self._token_cache_size:
+                self._bucket_cache.clear()
+            self._bucket_cache[token] = bucket
+        return bucket
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+
+from infrastructure.observability.app_metrics import AppMetrics
+from use_cases.index_document_chunks import IndexDocumentChunks
+from use_cases.ingest_document import IngestDocument, IngestDocumentInput, IngestDocumentOutput
+
+logger = logging.getLogger(__name__)
+
+IngestFactory = Callable[[], IngestDocument]
+
+_FINISHED = ("succeeded", "failed")
+
+
+class QueueFullError(RuntimeError):
+    """A fila de ingestão atingiu a profundidade máxima configurada."""
+
+
+@dataclass
+class IngestionJob:
+    id: str
+    original_filename: str
+    submitted_at: datetime
+    state: str = "queued"  # queued | running | indexing | succeeded | failed
+    document_id: str | None = None
+    chunk_count: int | None = None
+    indexed: int | None = None
+    deduplicated: bool = False
+    error: str | None = None
+    timings: dict[str, float] = field(default_factory=dict)
+    finished_at: datetime | None = None
+
+
+# Caso de uso construído uma vez por processo/fábrica (a fábrica é serializada por referência)
+_WORKER_USE_CASES: dict[IngestFactory, IngestDocument] = {}
+
+
+def _run_ingest(
+    factory: IngestFactory, inp: IngestDocumentInput
+) -> tuple[IngestDocumentOutput, float]:
+    """Executado no worker: retorna o resultado e o instante (epoch) em que começou."""
+    started = time.time()
+    uc = _WORKER_USE_CASES.get(factory)
+    if uc is None:
+        uc = _WORKER_USE_CASES[factory] = factory()
+    return uc.execute(inp), started
+
+
+class IngestionJobQueue:
+    """
+    Fila de ingestão assíncrona.
+
+    `IngestDocument.execute` (extração, chunking, gravação) roda num pool limitado de
+    processos, fora do event loop. A indexação roda no processo da API, numa thread
+    dedicada, porque o VectorStore (ex.: em memória) vive neste processo.
+    `submit` rejeita com `QueueFullError` quando há `max_depth` jobs não finalizados.
+    """
+
+    def __init__(
+        self,
+        ingest_factory: IngestFactory,
+        index_uc: IndexDocumentChunks,
+        max_workers: int = 2,
+        max_depth: int = 32,
+        history: int = 1000,
+        use_processes: bool = True,
+        metrics: AppMetrics | None = None,
+    ) -> None:
+        self._ingest_factory = ingest_factory
+        self._index_uc = index_uc
+        self._max_workers = max(1, int(max_workers))
+        self._max_depth = max(1, int(max_depth))
+        self._history = max(1, int(history))
+        self._use_processes = use_processes
+        self._metrics = metrics
+        self._pool: Executor | None = None
+        self._index_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-index")
+        self._jobs: OrderedDict[str, IngestionJob] = OrderedDict()
+        self._futures: dict[str, Future[tuple[IngestDocumentOutput, float]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_depth(self) -> int:
+        return self._max_depth
+
+    def submit(self, inp: IngestDocumentInput) -> IngestionJob:
+        with self._lock:
+            if self._pending_locked() >= self._max_depth:
+                raise QueueFullError(f"Fila de ingestão cheia ({self._max_depth} jobs pendentes).")
+            job = IngestionJob(
+                id=uuid.uuid4().hex,
+                original_filename=inp.original_filename,
+                submitted_at=datetime.now(timezone.utc),
+            )
+            self._jobs[job.id] = job
+            future = self._executor().submit(_run_ingest, self._ingest_factory, inp)
+            self._futures[job.id] = future
+        future.add_done_callback(lambda f: self._index_pool.submit(self._finish, job.id, inp, f))
+        return replace(job, timings=dict(job.timings))
+
+    def get(self, job_id: str) -> IngestionJob | None:
+        """Retorna uma cópia do estado atual do job (ou None se desconhecido/expirado)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = replace(job, timings=dict(job.timings))
+            future = self._futures.get(job_id)
+        if snapshot.state == "queued" and future is not None and future.running():
+            snapshot.state = "running"
+        return snapshot
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending_locked()
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=not wait)
+        self._index_pool.shutdown(wait=wait)
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            if self._use_processes:
+                # spawn: seguro mesmo com threads ativas no processo da API
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="ingest"
+                )
+        return self._pool
+
+    def _pending_locked(self) -> int:
+        return sum(1 for j in self._jobs.values() if j.state not in _FINISHED)
+
+    def _finish(
+        self,
+        job_id: str,
+        inp: IngestDocumentInput,
+        future: Future[tuple[IngestDocumentOutput, float]],
+    ) -> None:
+        job = self._jobs[job_id]
+        try:
+            output, started = future.result()
+            with self._lock:
+                job.state = "indexing"
+                job.document_id = output.document.id
+                job.chunk_count = output.chunk_count
+                job.deduplicated = output.deduplicated
+                job.timings["queue_wait"] = max(0.0, started - job.submitted_at.timestamp())
+                job.timings.update(output.timings)
+
+            if self._metrics is not None:
+                self._metrics.observe_ingest(
+                    {"queue_wait": job.timings["queue_wait"], **output.timings},
+                    deduplicated=output.deduplicated,
+                )
+
+            t0 = time.perf_counter()
+            # documento deduplicado já está no índice
+            indexed = 0
+            if not output.deduplicated:
+                indexed = self._index_uc.execute(output.document.id).added
+                if self._metrics is not None:
+                    self._metrics.observe_index(time.perf_counter() - t0, added=indexed)
+            with self._lock:
+                job.timings["index"] = time.perf_counter() - t0
+                job.indexed = indexed
+                job.state = "succeeded"
+        except Exception as e:
+            logger.exception("Falha no job de ingestão %s", job_id)
+            inp.tmp_file.unlink(missing_ok=True)
+            with self._lock:
+                job.state = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+        finally:
+            with self._lock:
+                job.finished_at = datetime.now(timezone.utc)
+                self._futures.pop(job_id, None)
+                self._prune_locked()
+
+    def _prune_locked(self) -> None:
+        finished = [jid for jid, j in self._jobs.items() if j.state in _FINISHED]
+        for jid in finished[: max(0, len(finished) - self._history)]:
+            del self._jobs[jid]
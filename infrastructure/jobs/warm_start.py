@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from domain.services.chunk_source import ChunkSource
+from domain.services.vector_store import Chunk, VectorStore
+from infrastructure.chunk_sources.filesystem_jsonl import FilesystemJsonlChunkSource
+from infrastructure.vectorstores.snapshot import SnapshotError, SnapshotInfo, Snapshottable
+from use_cases.index_document_chunks import IndexDocumentChunks
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WarmStartResult:
+    loaded: int  # chunks vindos do snapshot
+    replayed: int  # documentos (re)indexados a partir dos arquivos de chunks
+    removed: int  # documentos do snapshot que não estão mais no catálogo
+    seconds: float
+
+
+@dataclass(frozen=True)
+class WarmLoadProgress:
+    state: str = "pending"  # pending | loading | ready | failed | cancelled
+    phase: str | None = None  # snapshot | corpus | incremental
+    documents_total: int = 0  # documentos a (re)indexar a partir dos arquivos de chunks
+    documents_done: int = 0
+    chunks_indexed: int = 0
+    snapshot_chunks: int = 0
+    elapsed_seconds: float = 0.0
+    error: str | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+
+class _ParsedChunks(ChunkSource):
+    """Chunks já lidos (pelo pool de processos) de um lote de documentos."""
+
+    def __init__(self, parsed: dict[str, list[Chunk]]) -> None:
+        self._parsed = parsed
+
+    def iter_chunks(self, document_id: str) -> Iterable[Chunk]:
+        return iter(self._parsed.get(document_id, ()))
+
+
+def _parse_documents(processed_dir: str, document_ids: list[str]) -> dict[str, list[Chunk]]:
+    """Executado no worker: lê os `.chunks.jsonl` de um lote de documentos."""
+    source = FilesystemJsonlChunkSource(processed_dir)
+    return {d: list(source.iter_chunks(d)) for d in document_ids}
+
+
+class IndexWarmer:
+    """
+    Aquecimento de um store em memória na inicialização e snapshot no desligamento.
+
+    `warm_start` carrega o snapshot (se existir e for válido) e depois percorre o
+    catálogo: documentos ausentes do snapshot são indexados em lote, os com arquivo de
+    chunks mais novo que o snapshot são reindexados de forma incremental e os que
+    saíram do catálogo são removidos. Sem snapshot, equivale a indexar tudo.
+
+    Na carga em lote, os arquivos são lidos num pool de processos (`workers`), em
+    grupos de `batch_documents` documentos, e cada grupo entra no store numa única
+    chamada a `add`. `start` roda o aquecimento numa thread, com o progresso
+    disponível em `progress()` (usado pelo readiness do health check).
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        snapshot_path: Path,
+        document_ids: Callable[[], Iterable[str]],
+        source: FilesystemJsonlChunkSource,
+        workers: int = 0,
+        batch_documents: int = 64,
+    ) -> None:
+        if not isinstance(store, Snapshottable):
+            raise TypeError(f"{type(store).__name__} não suporta snapshot")
+        self._store = store
+        self._snapshottable: Snapshottable = store
+        self.snapshot_path = Path(snapshot_path)
+        self._document_ids = document_ids
+        self._source = source
+        self._index = IndexDocumentChunks(source, store)
+        self._workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self._batch_documents = max(1, int(batch_documents))
+        self._progress = WarmLoadProgress()
+        self._started_at: float | None = None
+        self._cancel = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------ ciclo de vida
+
+    def start(self) -> None:
+        """Aquece em segundo plano; a API fica no ar (sem readiness) enquanto isso."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="index-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Interrompe a carga entre lotes (cada documento entra inteiro ou não entra)."""
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def progress(self) -> WarmLoadProgress:
+        p = self._progress
+        if self._started_at is not None and p.state == "loading":
+            return replace(p, elapsed_seconds=time.perf_counter() - self._started_at)
+        return p
+
+    def _run(self) -> None:
+        try:
+            self.warm_start()
+        except Exception as e:
+            logger.exception("Falha ao aquecer o store")
+            self._update(state="failed", error=f"{type(e).__name__}: {e}")
+
+    # ------------------------------------------------------------------ aquecimento
+
+    def warm_start(self) -> WarmStartResult:
+        self._started_at = t0 = time.perf_counter()
+        self._update(state="loading", phase="snapshot")
+        info = self._load()
+        if info is not None:
+            self._update(snapshot_chunks=info.chunks)
+
+        new: list[str] = []
+        changed: list[str] = []
+        seen: set[str] = set()
+        for doc_id in self._document_ids():
+            seen.add(doc_id)
+            if info is None or doc_id not in info.document_ids:
+                new.append(doc_id)
+                continue
+            mtime = self._source.modified_at(doc_id)
+            if mtime is not None and mtime > info.created_at:
+                changed.append(doc_id)
+        self._update(documents_total=len(new) + len(changed))
+
+        self._update(phase="corpus")
+        self._bulk_index(new)
+        self._update(phase="incremental")
+        for doc_id in changed:
+            if self._cancel.is_set():
+                break
+            result = self._index.execute(doc_id, incremental=True)
+            self._advance(1, result.added + result.updated)
+
+        stale = info.document_ids - seen if info is not None else frozenset()
+        for doc_id in stale:
+            self._store.delete_by_document(doc_id)
+
+        seconds = time.perf_counter() - t0
+        self._update(
+            state="cancelled" if self._cancel.is_set() else "ready",
+            phase=None,
+            elapsed_seconds=seconds,
+        )
+        p = self._progress
+        logger.info(
+            "Store aquecido em %.2fs: %d chunks do snapshot, %d documentos (%d chunks) "
+            "indexados, %d removidos",
+            seconds,
+            p.snapshot_chunks,
+            p.documents_done,
+            p.chunks_indexed,
+            len(stale),
+        )
+        return WarmStartResult(
+            loaded=p.snapshot_chunks, replayed=p.documents_done, removed=len(stale), seconds=seconds
+        )
+
+    def snapshot(self) -> SnapshotInfo | None:
+        """
+        Grava o snapshot só com o aquecimento concluído (None caso contrário).
+
+        Carga cancelada ou com falha deixa o snapshot anterior intacto: um snapshot
+        novo teria `created_at` mais recente que os arquivos de chunks ainda não
+        reprocessados, e eles nunca mais seriam reindexados no `warm_start`.
+        """
+        p = self._progress
+        if not p.ready:
+            logger.warning(
+                "Snapshot não gravado: aquecimento em estado '%s' (%d de %d documentos)",
+                p.state,
+                p.documents_done,
+                p.documents_total,
+            )
+            return None
+        t0 = time.perf_counter()
+        info = self._snapshottable.snapshot(self.snapshot_path)
+        logger.info(
+            "Snapshot com %d chunks gravado em %s (%.2fs)",
+            info.chunks,
+            self.snapshot_path,
+            time.perf_counter() - t0,
+        )
+        return info
+
+    def _bulk_index(self, document_ids: Sequence[str]) -> None:
+        for parsed in self._parsed_batches(document_ids):
+            if self._cancel.is_set():
+                return
+            # uploads aceitos durante a carga já indexam o próprio documento: `add` não
+            # deduplica, então o que o store já tem fica de fora (verificado o mais tarde
+            # possível, logo antes de gravar o lote)
+            ids = [d for d in parsed if not self._store.content_hashes(d)]
+            added = IndexDocumentChunks(_ParsedChunks(parsed), self._store).execute_many(ids)
+            self._advance(len(parsed), added)
+
+    def _parsed_batches(self, document_ids: Sequence[str]) -> Iterator[dict[str, list[Chunk]]]:
+        """Lotes de documentos já lidos, na ordem do catálogo."""
+        processed_dir = str(self._source.processed_dir)
+        size = self._batch_documents
+        batches = [list(document_ids[i : i + size]) for i in range(0, len(document_ids), size)]
+        if self._workers <= 1 or len(batches) <= 1:
+            # pouco trabalho: subir processos custaria mais que ler aqui mesmo
+            for batch in batches:
+                yield _parse_documents(processed_dir, batch)
+            return
+        pool = ProcessPoolExecutor(
+            max_workers=min(self._workers, len(batches)),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        try:
+            yield from pool.map(_parse_documents, [processed_dir] * len(batches), batches)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _load(self) -> SnapshotInfo | None:
+        try:
+            return self._snapshottable.load(self.snapshot_path)
+        except FileNotFoundError:
+            return None
+        except SnapshotError as e:
+            logger.warning("Snapshot ignorado, reindexando tudo: %s", e)
+            return None
+
+    def _advance(self, documents: int, chunks: int) -> None:
+        p = self._progress
+        self._update(
+            documents_done=p.documents_done + documents, chunks_indexed=p.chunks_indexed + chunks
+        )
+
+    def _update(self, **changes: Any) -> None:
+        # progresso imutável: leitores (health check) sempre veem um estado consistente
+        self._progress = replace(self._progress, **changes)
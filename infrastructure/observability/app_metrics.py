@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+
+from infrastructure.observability.metrics import MetricsRegistry
+
+
+class AppMetrics:
+    """
+    Instrumentos da aplicação, expostos em `GET /metrics`.
+
+    - `rag_ingest_stage_seconds{stage}`: etapas de `IngestDocument.execute` (a partir de
+      `IngestDocumentOutput.timings`; nos jobs inclui `queue_wait`);
+    - `rag_index_seconds` / `rag_index_chunks_total{op}`: indexação de um documento;
+    - `rag_vector_search_seconds{provider}`: latência do VectorStore (ver MeteredVectorStore);
+    - `rag_http_*`: contagem, latência e requisições em andamento por rota;
+    - `rag_documents` / `rag_indexed_chunks`: totais calculados na coleta;
+    - `rag_embedding_cache_*`: acertos, faltas e entradas do cache de embeddings, lidos
+      de `SqliteEmbeddingCache.stats()` na coleta;
+    - `rag_query_cache_*`: acertos, faltas, entradas e taxa de acerto do cache de consultas
+      (`QueryResultCache.stats()`), para dimensionar `QUERY_CACHE_MAX_ENTRIES`/`_TTL_SECONDS`.
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None) -> None:
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.ingest_stage_seconds = r.histogram(
+            "rag_ingest_stage_seconds", "Duração de cada etapa da ingestão.", ["stage"]
+        )
+        self.ingest_total = r.counter(
+            "rag_ingest_documents", "Documentos ingeridos por resultado.", ["outcome"]
+        )
+        self.index_seconds = r.histogram(
+            "rag_index_seconds", "Duração da indexação de um documento no VectorStore."
+        )
+        self.index_chunks = r.counter(
+            "rag_index_chunks", "Chunks gravados/removidos na indexação.", ["op"]
+        )
+        self.search_seconds = r.histogram(
+            "rag_vector_search_seconds",
+            "Latência de VectorStore.similarity_search por provedor.",
+            ["provider", "kind"],
+        )
+        self.http_requests = r.counter(
+            "rag_http_requests",
+            "Requisições HTTP por rota e status.",
+            ["method", "route", "status"],
+        )
+        self.http_seconds = r.histogram(
+            "rag_http_request_duration_seconds",
+            "Latência das requisições HTTP por rota.",
+            ["method", "route"],
+        )
+        self.http_in_flight = r.gauge(
+            "rag_http_requests_in_flight", "Requisições HTTP em andamento."
+        )
+        self.documents = r.gauge("rag_documents", "Documentos no catálogo.")
+        self.indexed_chunks = r.gauge("rag_indexed_chunks", "Chunks indexados no VectorStore.")
+        self.embedding_cache_hits = r.gauge(
+            "rag_embedding_cache_hits_total", "Embeddings servidos pelo cache (desde o início)."
+        )
+        self.embedding_cache_misses = r.gauge(
+            "rag_embedding_cache_misses_total", "Embeddings calculados por falta no cache."
+        )
+        self.embedding_cache_entries = r.gauge(
+            "rag_embedding_cache_entries", "Entradas no cache de embeddings."
+        )
+        self.query_cache_hits = r.gauge(
+            "rag_query_cache_hits_total", "Consultas respondidas pelo cache (desde o início)."
+        )
+        self.query_cache_misses = r.gauge(
+            "rag_query_cache_misses_total", "Consultas sem entrada válida no cache."
+        )
+        self.query_cache_entries = r.gauge(
+            "rag_query_cache_entries", "Entradas no cache de resultados de consulta."
+        )
+        self.query_cache_hit_ratio = r.gauge(
+            "rag_query_cache_hit_ratio", "Fração das consultas respondidas pelo cache."
+        )
+
+    def observe_ingest(self, timings: Mapping[str, float], deduplicated: bool = False) -> None:
+        for stage, seconds in timings.items():
+            self.ingest_stage_seconds.labels(stage=stage).observe(seconds)
+        self.ingest_total.labels(outcome="deduplicated" if deduplicated else "ingested").inc()
+
+    def observe_index(self, seconds: float, added: int, updated: int = 0, removed: int = 0) -> None:
+        self.index_seconds.observe(seconds)
+        for op, n in (("added", added), ("updated", updated), ("removed", removed)):
+            if n:
+                self.index_chunks.labels(op=op).inc(n)
+
+    def track_counts(
+        self, documents: Callable[[], float] | None, chunks: Callable[[], float] | None
+    ) -> None:
+        """Funções chamadas a cada coleta para os totais de documentos e chunks."""
+        if documents is not None:
+            self.documents.set_function(documents)
+        if chunks is not None:
+            self.indexed_chunks.set_function(chunks)
+
+    def track_embedding_cache(self, stats: Callable[[], Mapping[str, float]]) -> None:
+        """`stats` (ex.: `SqliteEmbeddingCache.stats`) é lido a cada coleta."""
+        self.embedding_cache_hits.set_function(lambda: stats()["hits"])
+        self.embedding_cache_misses.set_function(lambda: stats()["misses"])
+        self.embedding_cache_entries.set_function(lambda: stats()["entries"])
+
+    def track_query_cache(self, stats: Callable[[], Mapping[str, float]]) -> None:
+        """`stats` (ex.: `QueryResultCache.stats`) é lido a cada coleta."""
+        self.query_cache_hits.set_function(lambda: stats()["hits"])
+        self.query_cache_misses.set_function(lambda: stats()["misses"])
+        self.query_cache_entries.set_function(lambda: stats()["entries"])
+        self.query_cache_hit_ratio.set_function(lambda: stats()["hit_rate"])
+
+    def render(self) -> str:
+        return self.registry.render()
@@ -0,0 +1,293 @@
+"""
+Métricas em memória no formato de exposição texto do Prometheus (versão 0.0.4).
+
+Sem dependências externas: contadores, gauges e histogramas com rótulos, seguros
+entre threads. Cada combinação de rótulos é resolvida uma vez (`labels(...)`) e
+reaproveitada, de modo que registrar uma observação custa um `bisect` e duas somas
+sob um lock — desprezível perto de uma busca vetorial.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Mapping, Sequence
+
+# segundos; cobre de consultas sub-milissegundo a ingestões de minutos
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, values: Mapping[str, str]) -> LabelValues:
+        if set(values) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name}: rótulos esperados {self.labelnames}, recebidos {values}"
+            )
+        return tuple(str(values[n]) for n in self.labelnames)
+
+    def samples(self) -> Iterator[tuple[str, LabelValues, Sequence[str], float]]:
+        """(sufixo, valores dos rótulos, nomes dos rótulos, valor)."""
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, values, names, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(names, values)} {_format(value)}")
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        self._lock = lock
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._children: dict[LabelValues, _CounterChild] = {}
+
+    def labels(self, **values: str) -> _CounterChild:
+        key = self._key(values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, _CounterChild(self._lock))
+        return child
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterator[tuple[str, LabelValues, Sequence[str], float]]:
+        with self._lock:
+            items = [(k, c.value) for k, c in self._children.items()]
+        for key, value in items:
+            yield "_total", key, self.labelnames, value
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        self._lock = lock
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = float(value)
+
+
+class Gauge(_Metric):
+    """
+    Gauge com rótulos. Com `set_function`, o valor é calculado na coleta (ex.: total
+    de documentos); se a função levantar NotImplementedError, a amostra é omitida.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._children: dict[LabelValues, _GaugeChild] = {}
+        self._function: Callable[[], float] | None = None
+
+    def labels(self, **values: str) -> _GaugeChild:
+        key = self._key(values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, _GaugeChild(self._lock))
+        return child
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        if self.labelnames:
+            raise ValueError(f"{self.name}: set_function só vale para gauges sem rótulos")
+        self._function = fn
+
+    def samples(self) -> Iterator[tuple[str, LabelValues, Sequence[str], float]]:
+        if self._function is not None:
+            try:
+                value = float(self._function())
+            except NotImplementedError:
+                return
+            yield "", (), (), value
+            return
+        with self._lock:
+            items = [(k, c.value) for k, c in self._children.items()]
+        for key, value in items:
+            yield "", key, self.labelnames, value
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_upper", "counts", "sum")
+
+    def __init__(self, lock: threading.Lock, upper: tuple[float, ...]) -> None:
+        self._lock = lock
+        self._upper = upper
+        self.counts = [0] * (len(upper) + 1)  # último = +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        i = bisect_left(self._upper, value)  # primeiro limite >= value (le)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._upper = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        self._children: dict[LabelValues, _HistogramChild] = {}
+
+    def labels(self, **values: str) -> _HistogramChild:
+        key = self._key(values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, _HistogramChild(self._lock, self._upper))
+        return child
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def samples(self) -> Iterator[tuple[str, LabelValues, Sequence[str], float]]:
+        with self._lock:
+            items = [(k, list(c.counts), c.sum) for k, c in self._children.items()]
+        bucket_names = (*self.labelnames, "le")
+        bounds = [_format(b) for b in self._upper] + ["+Inf"]
+        for key, counts, total in items:
+            cumulative = 0
+            for le, n in zip(bounds, counts, strict=True):
+                cumulative += n
+                yield "_bucket", (*key, le), bucket_names, cumulative
+            yield "_sum", key, self.labelnames, total
+            yield "_count", key, self.labelnames, cumulative
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Métrica já registrada: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _format(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: LabelValues) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape_label(v)}"' for n, v in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
@@ -0,0 +1,104 @@
+"""
+Sessão de profiling ligada à requisição corrente (ver `interface_adapters.web.profiling`).
+
+A sessão vive numa contextvar, que é copiada para as threads que executam trabalho da
+requisição; `profiled_call` roda a função sob um `cProfile.Profile` quando há sessão
+ativa e, caso contrário, apenas a chama.
+
+Só um profiler fica ativo por vez no processo: a partir do Python 3.12 um segundo
+`cProfile` habilitado ao mesmo tempo levanta `ValueError` (uma ferramenta de
+`sys.monitoring` por vez). Chamadas que se sobrepõem a outra já perfilada (fan-out entre
+shards, workers do executor do store, requisições concorrentes) rodam sem profiler e são
+contadas em `ProfileSession.skipped`. Esperar pelo profiler em vez de pular travaria o
+fan-out, em que a chamada perfilada aguarda as das outras threads.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import pstats
+import threading
+from collections.abc import Callable
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# um único profiler ativo no processo (ver docstring do módulo)
+_profiler_slot = threading.Lock()
+
+
+class ProfileSession:
+    """Perfis (um por chamada perfilada em thread) coletados durante uma requisição."""
+
+    def __init__(self, profile_id: str) -> None:
+        self.id = profile_id
+        self.skipped = 0  # chamadas executadas sem profiler (outro já estava ativo)
+        self._profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if not _profiler_slot.acquire(blocking=False):
+            return self._unprofiled(fn, *args, **kwargs)
+        try:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # profiler de fora desta sessão (ex.: `python -m cProfile`)
+                return self._unprofiled(fn, *args, **kwargs)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profile.disable()
+                with self._lock:
+                    self._profiles.append(profile)
+        finally:
+            _profiler_slot.release()
+
+    def _unprofiled(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self.skipped += 1
+        logger.debug("Profile %s: profiler já ativo, %r roda sem profiling", self.id, fn)
+        return fn(*args, **kwargs)
+
+    def dump(self, path: Path) -> bool:
+        """Grava os perfis somados em `path` (formato pstats). False se não houve coleta."""
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(profiles[0])
+        for extra in profiles[1:]:
+            stats.add(extra)
+        tmp = path.with_suffix(".tmp")
+        stats.dump_stats(str(tmp))
+        tmp.replace(path)
+        return True
+
+
+_current: ContextVar[ProfileSession | None] = ContextVar("profile_session", default=None)
+
+
+def current_session() -> ProfileSession | None:
+    return _current.get()
+
+
+def activate(session: ProfileSession | None) -> Any:
+    """Define a sessão do contexto atual; retorna o token para `deactivate`."""
+    return _current.set(session)
+
+
+def deactivate(token: Any) -> None:
+    _current.reset(token)
+
+
+def profiled_call(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    session = _current.get()
+    if session is None:
+        return fn(*args, **kwargs)
+    return session.call(fn, *args, **kwargs)
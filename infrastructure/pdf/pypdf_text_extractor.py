@@ -1,19 +1,110 @@
 from __future__ import annotations
 
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 from pypdf import PdfReader
 
 from domain.services.text_extractor import TextExtractor
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PageText:
+    index: int  # 0-based, ordem do PDF
+    text: str  # texto bruto retornado pelo pypdf ("" se vazio)
+    seconds: float  # tempo gasto em extract_text()
+
 
 class PyPDFTextExtractor(TextExtractor):
+    """
+    Extração de texto com pypdf.
+
+    `iter_pages` entrega as páginas de forma preguiçosa (usado pela ingestão em
+    streaming); `extract` mantém o contrato de texto completo.
+    PDFs com `parallel_min_pages` páginas ou mais são divididos em faixas contíguas
+    de páginas, processadas num pool de processos (cada worker abre o PDF por conta
+    própria) e remontadas na ordem original. Abaixo do limite, a extração é serial.
+    O tempo de cada página é medido; páginas acima de `slow_page_seconds` são logadas.
+    """
+
+    def __init__(
+        self,
+        parallel_min_pages: int = 200,
+        max_workers: int | None = None,
+        slow_page_seconds: float = 2.0,
+    ) -> None:
+        self.parallel_min_pages = max(1, int(parallel_min_pages))
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.slow_page_seconds = float(slow_page_seconds)
+
     def extract(self, pdf_path: Path) -> tuple[str, int]:
+        pages = self.extract_pages(pdf_path)
+        parts = [p.text.strip() for p in pages if p.text]
+        return ("\n\n".join(parts), len(pages))
+
+    def extract_pages(self, pdf_path: Path) -> list[PageText]:
+        """Extrai todas as páginas (em ordem), com o tempo de extração de cada uma."""
+        return list(self._iter_page_texts(pdf_path))
+
+    def iter_pages(self, pdf_path: Path) -> Iterator[str]:
+        for page in self._iter_page_texts(pdf_path):
+            yield page.text
+
+    def _iter_page_texts(self, pdf_path: Path) -> Iterator[PageText]:
         reader = PdfReader(str(pdf_path))
-        pages = len(reader.pages)
-        parts = []
-        for i in range(pages):
-            t = reader.pages[i].extract_text() or ""
-            if t:
-                parts.append(t.strip())
-        return ("\n\n".join(parts), pages)
+        total = len(reader.pages)
+        if total < self.parallel_min_pages or self.max_workers <= 1:
+            pages = _iter_range(reader, 0, total)
+        else:
+            pages = self._iter_parallel(pdf_path, total)
+        for page in pages:
+            self._log_if_slow(pdf_path, page)
+            yield page
+
+    def _iter_parallel(self, pdf_path: Path, total: int) -> Iterator[PageText]:
+        # algumas faixas por worker equilibram páginas de custo desigual
+        slices = min(total, self.max_workers * 4)
+        bounds = [round(i * total / slices) for i in range(slices + 1)]
+        ranges = [(bounds[i], bounds[i + 1]) for i in range(slices) if bounds[i] < bounds[i + 1]]
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(ranges)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            # map entrega as faixas na ordem de submissão, conforme ficam prontas
+            results = pool.map(
+                _extract_path_range,
+                [str(pdf_path)] * len(ranges),
+                [start for start, _ in ranges],
+                [stop for _, stop in ranges],
+            )
+            for chunk in results:
+                yield from chunk
+
+    def _log_if_slow(self, pdf_path: Path, page: PageText) -> None:
+        if page.seconds >= self.slow_page_seconds:
+            logger.warning(
+                "Página lenta na extração: %s página %d levou %.2fs",
+                pdf_path.name,
+                page.index + 1,
+                page.seconds,
+            )
+
+
+def _iter_range(reader: PdfReader, start: int, stop: int) -> Iterator[PageText]:
+    for i in range(start, stop):
+        t0 = time.perf_counter()
+        text = reader.pages[i].extract_text() or ""
+        yield PageText(index=i, text=text, seconds=time.perf_counter() - t0)
+
+
+def _extract_path_range(pdf_path: str, start: int, stop: int) -> list[PageText]:
+    """Executado no worker: abre o PDF de forma independente e extrai [start, stop)."""
+    return list(_iter_range(PdfReader(pdf_path), start, stop))
@@ -1,24 +1,44 @@
 from __future__ import annotations
 
 import json
+import os
 import shutil
+import sys
 import uuid
-from collections.abc import Iterable
+from array import array
+from collections.abc import Iterable, Iterator
 from dataclasses import asdict
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
 from app.core.config import settings
 from domain.entities.document import Document
 from domain.repositories.document_repository import DocumentRepository
+from infrastructure.storage.sqlite_catalog import SqliteDocumentCatalog
+
+_OFFSET_SIZE = 8  # bytes por offset (uint64) no sidecar .chunks.idx
+
+
+def _offsets_path(chunks_path: Path) -> Path:
+    return chunks_path.with_name(chunks_path.name.removesuffix(".jsonl") + ".idx")
 
 
 class LocalDocumentRepository(DocumentRepository):
-    def __init__(self) -> None:
+    """
+    Arquivos em RAW_DIR/PROCESSED_DIR; os `<id>.meta.json` são a fonte de verdade.
+    Listagens usam o catálogo SQLite (índice derivado, mantido por `save_meta` e
+    reconstruível com `rebuild_catalog`), evitando varrer o diretório a cada chamada.
+    """
+
+    def __init__(self, catalog: SqliteDocumentCatalog | None = None) -> None:
         self.paths = {
             "RAW_DIR": settings.RAW_DIR,
             "PROCESSED_DIR": settings.PROCESSED_DIR,
         }
+        self.catalog = catalog or SqliteDocumentCatalog(
+            settings.CATALOG_PATH, bootstrap=self.scan_meta_files
+        )
 
     def allocate_paths(self, original_filename: str) -> dict:
         doc_id = str(uuid.uuid4())
@@ -45,20 +65,45 @@ class LocalDocumentRepository(DocumentRepository):
         text_path.parent.mkdir(parents=True, exist_ok=True)
         text_path.write_text(text, encoding="utf-8")
 
+    def save_text_pages(self, pages: Iterable[str], text_path: Path) -> Iterator[str]:
+        # mesmo conteúdo de save_text(extract()[0]): páginas não vazias, strip, "\n\n"
+        text_path.parent.mkdir(parents=True, exist_ok=True)
+        with text_path.open("w", encoding="utf-8") as f:
+            first = True
+            for page in pages:
+                if page:
+                    if not first:
+                        f.write("\n\n")
+                    f.write(page.strip())
+                    first = False
+                yield page
+
     def save_chunks(self, chunks: Iterable[dict], chunks_path: Path) -> int:
+        # além do JSONL, grava o sidecar `<id>.chunks.idx`: offset (uint64 LE) do
+        # início de cada linha, permitindo contagem e acesso direto sem varrer o JSONL
         chunks_path.parent.mkdir(parents=True, exist_ok=True)
-        count = 0
-        with chunks_path.open("w", encoding="utf-8") as f:
+        offsets = array("Q")
+        with chunks_path.open("wb") as f:
+            pos = 0
             for ch in chunks:
-                f.write(json.dumps(ch, ensure_ascii=False) + "\n")
-                count += 1
-        return count
+                line = (json.dumps(ch, ensure_ascii=False) + "\n").encode("utf-8")
+                offsets.append(pos)
+                f.write(line)
+                pos += len(line)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        idx_path = _offsets_path(chunks_path)
+        tmp = idx_path.with_name(f"{idx_path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(offsets.tobytes())
+        os.replace(tmp, idx_path)
+        return len(offsets)
 
     def save_meta(self, doc: Document, meta_path: Path) -> None:
         meta_path.parent.mkdir(parents=True, exist_ok=True)
         meta = asdict(doc)
         meta["created_at"] = doc.created_at.isoformat()
         meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        self.catalog.upsert(doc)
 
     def _load_meta_file(self, meta_path: Path) -> Document | None:
         if not meta_path.exists():
@@ -73,16 +118,37 @@ class LocalDocumentRepository(DocumentRepository):
                 pages=int(data["pages"]),
                 created_at=self._parse_dt(data["created_at"]),
                 content_type=data.get("content_type", "application/pdf"),
+                sha256=data.get("sha256"),
             )
         except Exception:
             return None
 
     def list_documents(self) -> Iterable[Document]:
+        cursor: str | None = None
+        while True:
+            docs, cursor = self.catalog.list_page(limit=1000, cursor=cursor)
+            yield from docs
+            if cursor is None:
+                return
+
+    def list_page(
+        self, limit: int, cursor: str | None = None, original_filename: str | None = None
+    ) -> tuple[list[Document], str | None]:
+        return self.catalog.list_page(limit, cursor, original_filename)
+
+    def count_documents(self) -> int:
+        return self.catalog.count()
+
+    def scan_meta_files(self) -> Iterator[Document]:
+        """Varre os `*.meta.json` do disco (usado para popular/reconstruir o catálogo)."""
         for meta_file in settings.PROCESSED_DIR.glob("*.meta.json"):
             doc = self._load_meta_file(meta_file)
             if doc:
                 yield doc
 
+    def rebuild_catalog(self) -> int:
+        return self.catalog.rebuild(self.scan_meta_files())
+
     def get_document(self, doc_id: str) -> Document | None:
         meta_path = settings.PROCESSED_DIR / f"{doc_id}.meta.json"
         return self._load_meta_file(meta_path)
@@ -91,12 +157,114 @@ class LocalDocumentRepository(DocumentRepository):
         chunks_path = settings.PROCESSED_DIR / f"{doc_id}.chunks.jsonl"
         if not chunks_path.exists():
             return 0
+        idx_path = self._valid_offsets(chunks_path)
+        if idx_path is not None:
+            return idx_path.stat().st_size // _OFFSET_SIZE
         c = 0
         with chunks_path.open("r", encoding="utf-8") as f:
             for _ in f:
                 c += 1
         return c
 
+    def get_chunk(self, doc_id: str, idx: int) -> dict | None:
+        chunks = self.get_chunks(doc_id, offset=idx, limit=1)
+        return chunks[0] if chunks else None
+
+    def get_chunks(self, doc_id: str, offset: int = 0, limit: int = 50) -> list[dict]:
+        chunks_path = settings.PROCESSED_DIR / f"{doc_id}.chunks.jsonl"
+        if offset < 0 or limit <= 0 or not chunks_path.exists():
+            return []
+        idx_path = self._valid_offsets(chunks_path)
+        if idx_path is None:
+            # sem sidecar (documentos antigos): varredura sequencial
+            with chunks_path.open("r", encoding="utf-8") as f:
+                return [json.loads(line) for line in islice(f, offset, offset + limit)]
+
+        # lê só os offsets [offset, offset + limit] e o trecho contíguo do JSONL
+        with idx_path.open("rb") as f:
+            f.seek(offset * _OFFSET_SIZE)
+            bounds = array("Q")
+            bounds.frombytes(f.read((limit + 1) * _OFFSET_SIZE))
+        if sys.byteorder != "little":
+            bounds.byteswap()
+        if not bounds:
+            return []
+        with chunks_path.open("rb") as f:
+            f.seek(bounds[0])
+            if len(bounds) > limit:
+                data = f.read(bounds[limit] - bounds[0])
+            else:
+                data = f.read()
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+    @staticmethod
+    def _valid_offsets(chunks_path: Path) -> Path | None:
+        """
+        Sidecar de offsets, se for consistente com o JSONL; senão, None (varredura).
+
+        O mtime sozinho não basta (sidecar truncado, JSONL reescrito com mtime igual ou
+        de granularidade grossa): o tamanho tem de ser múltiplo de 8 e o último offset
+        tem de cair dentro do JSONL, logo após um fim de linha.
+        """
+        idx_path = _offsets_path(chunks_path)
+        try:
+            idx_stat = idx_path.stat()
+            jsonl_size = chunks_path.stat().st_size
+            if idx_stat.st_mtime_ns < chunks_path.stat().st_mtime_ns:
+                return None
+            if idx_stat.st_size % _OFFSET_SIZE:
+                return None
+            if idx_stat.st_size == 0:
+                return idx_path if jsonl_size == 0 else None
+            with idx_path.open("rb") as f:
+                f.seek(-_OFFSET_SIZE, os.SEEK_END)
+                last = int.from_bytes(f.read(_OFFSET_SIZE), "little")
+            if last >= jsonl_size:
+                return None
+            if last > 0:
+                with chunks_path.open("rb") as f:
+                    f.seek(last - 1)
+                    if f.read(1) != b"\n":
+                        return None
+        except FileNotFoundError:
+            return None
+        return idx_path
+
+    # ---- índice hash -> documento (um arquivo por hash em processed/by-sha256/) ----
+
+    def find_by_sha256(self, sha256: str) -> Document | None:
+        marker = self._sha256_marker(sha256)
+        try:
+            doc_id = marker.read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None
+        # marcador órfão (documento removido) equivale a ausência
+        return self.get_document(doc_id) if doc_id else None
+
+    def register_sha256(self, sha256: str, doc_id: str) -> str:
+        marker = self._sha256_marker(sha256)
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            # O_EXCL: em uploads simultâneos do mesmo arquivo, só o primeiro registra
+            fd = os.open(marker, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            existing = self.find_by_sha256(sha256)
+            if existing is not None:
+                return existing.id
+            tmp = marker.with_name(f"{marker.name}.{uuid.uuid4().hex}.tmp")
+            tmp.write_text(doc_id, encoding="utf-8")
+            os.replace(tmp, marker)
+            return doc_id
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(doc_id)
+        return doc_id
+
+    @staticmethod
+    def _sha256_marker(sha256: str) -> Path:
+        if len(sha256) != 64 or any(c not in "0123456789abcdef" for c in sha256):
+            raise ValueError(f"SHA-256 inválido: {sha256!r}")
+        return settings.PROCESSED_DIR / "by-sha256" / sha256
+
     @staticmethod
     def _parse_dt(s: str) -> datetime:
         # datetime.fromisoformat cobre o mais comum
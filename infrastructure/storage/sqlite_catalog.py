@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import base64
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from pathlib import Path
+
+from domain.entities.document import Document
+from domain.repositories.document_repository import InvalidCursorError
+
+_COLUMNS = (
+    "id, original_filename, stored_filename, size_bytes, pages, "
+    "created_at, content_type, sha256, created_us"
+)
+
+
+class SqliteDocumentCatalog:
+    """
+    Catálogo de metadados de documentos em SQLite (fonte de verdade continua sendo
+    o `<id>.meta.json`; o catálogo é um índice derivado, reconstruível).
+
+    Índices em (created_us, id) — paginação por cursor do mais recente para o mais
+    antigo — e em `original_filename`. A conexão é aberta de forma preguiçosa; se o
+    banco acabou de ser criado, é populado com `bootstrap()` (ex.: varredura dos meta).
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        bootstrap: Callable[[], Iterable[Document]] | None = None,
+    ) -> None:
+        self._path = Path(path)
+        self._bootstrap = bootstrap
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+
+    def upsert(self, doc: Document) -> None:
+        self.upsert_many([doc])
+
+    def upsert_many(self, docs: Iterable[Document]) -> int:
+        with self._lock:
+            conn = self._connection()
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR REPLACE INTO documents ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (_to_row(d) for d in docs),
+            )
+            conn.commit()
+            return conn.total_changes - before
+
+    def list_page(
+        self, limit: int, cursor: str | None = None, original_filename: str | None = None
+    ) -> tuple[list[Document], str | None]:
+        """
+        Até `limit` documentos ordenados por (created_at DESC, id DESC), a partir do
+        `cursor` opaco retornado pela página anterior, opcionalmente filtrados pelo
+        nome original exato. Retorna (docs, próximo cursor ou None).
+        """
+        limit = max(1, int(limit))
+        where: list[str] = []
+        params: list[object] = []
+        if original_filename is not None:
+            where.append("original_filename = ?")
+            params.append(original_filename)
+        if cursor:
+            where.append("(created_us, id) < (?, ?)")
+            params.extend(_decode_cursor(cursor))
+        sql = f"SELECT {_COLUMNS} FROM documents"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_us DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+
+        docs = [_from_row(r) for r in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = _encode_cursor(last[8], last[0])
+        return docs, next_cursor
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._connection().execute("SELECT COUNT(*) FROM documents").fetchone()[0])
+
+    def rebuild(self, docs: Iterable[Document]) -> int:
+        """Recria o catálogo do zero a partir de `docs` (numa única transação)."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM documents")
+            conn.executemany(
+                f"INSERT OR REPLACE INTO documents ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (_to_row(d) for d in docs),
+            )
+            conn.commit()
+            return int(conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            fresh = (
+                conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'documents'"
+                ).fetchone()
+                is None
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "id TEXT PRIMARY KEY, original_filename TEXT NOT NULL, "
+                "stored_filename TEXT NOT NULL, size_bytes INTEGER NOT NULL, "
+                "pages INTEGER NOT NULL, created_at TEXT NOT NULL, content_type TEXT NOT NULL, "
+                "sha256 TEXT, created_us INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_documents_created ON documents (created_us, id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_documents_filename ON documents (original_filename)"
+            )
+            conn.commit()
+            self._conn = conn
+            if fresh and self._bootstrap is not None:
+                self.upsert_many(self._bootstrap())
+        return self._conn
+
+
+def _created_us(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _to_row(doc: Document) -> tuple:
+    return (
+        doc.id,
+        doc.original_filename,
+        doc.stored_filename,
+        doc.size_bytes,
+        doc.pages,
+        doc.created_at.isoformat(),
+        doc.content_type,
+        doc.sha256,
+        _created_us(doc.created_at),
+    )
+
+
+def _from_row(row: tuple) -> Document:
+    return Document(
+        id=row[0],
+        original_filename=row[1],
+        stored_filename=row[2],
+        size_bytes=int(row[3]),
+        pages=int(row[4]),
+        created_at=datetime.fromisoformat(row[5]),
+        content_type=row[6],
+        sha256=row[7],
+    )
+
+
+def _encode_cursor(created_us: int, doc_id: str) -> str:
+    raw = f"{created_us}|{doc_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_us, doc_id = raw.split("|", 1)
+        return int(created_us), doc_id
+    except ValueError as e:  # inclui binascii.Error e UnicodeDecodeError
+        raise InvalidCursorError(f"Cursor inválido: {cursor!r}") from e
@@ -1,32 +1,36 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import logging
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 import chromadb
+import numpy as np
 from chromadb.api.models.Collection import Collection
 from chromadb.utils import embedding_functions
 
 from domain.services.vector_store import Chunk, VectorStore
+from infrastructure.embeddings.base import Embedder, EmbedderVersionMismatchError
+from infrastructure.embeddings.hashing import HashingEmbedder
 
+logger = logging.getLogger(__name__)
+
+_EMBEDDER_METADATA_KEY = "embedder_version"
+_CONTENT_HASH_KEY = "content_sha256"  # metadata por chunk, para o reindex incremental
+_RESERVED_KEYS = ("document_id", "chunk_id", _CONTENT_HASH_KEY)
 
-class _HashingEmbeddingFunction(embedding_functions.EmbeddingFunction):
-    """Embedding determinística, local e rápida para testes offline."""
 
-    def __init__(self, dim: int = 256) -> None:
-        self.dim = int(dim)
+class _HashingEmbeddingFunction(embedding_functions.EmbeddingFunction):
+    """Adapta um `Embedder` da infraestrutura ao contrato de embedding do Chroma."""
 
-    def __call__(self, input: list[str]) -> list[list[float]]:
-        return [self._embed(x) for x in input]
+    def __init__(self, embedder: Embedder) -> None:
+        self._embedder = embedder
 
-    def _embed(self, text: str) -> list[float]:
-        vec = [0.0] * self.dim
-        for token in text.casefold().split():
-            h = hash(token) % self.dim
-            vec[h] += 1.0
-        norm = sum(v * v for v in vec) ** 0.5 or 1.0
-        return [v / norm for v in vec]
+    def __call__(self, input: list[str]) -> list[np.ndarray]:
+        return list(self._embedder.embed(input))
 
 
 class ChromaVectorStore(VectorStore):
@@ -37,85 +41,117 @@ class ChromaVectorStore(VectorStore):
         persist_directory: str | Path = ".chroma",
         collection_name: str = "rag_chunks",
         embedding_dim: int = 256,
+        embedder: Embedder | None = None,
+        batch_size: int = 1000,
     ) -> None:
         self._persist_directory = str(persist_directory)
+        self._batch_size = max(1, int(batch_size))
+        self._embedder: Embedder = embedder or HashingEmbedder(dim=embedding_dim)
         self._client = chromadb.PersistentClient(path=self._persist_directory)
-        self._collection: Collection = self._client.get_or_create_collection(
+        self._collection: Collection = self._open_collection(collection_name)
+
+    def _open_collection(self, collection_name: str) -> Collection:
+        """
+        Abre (ou cria) a coleção e confere a versão do embedder gravada na metadata.
+        Vetores de outra versão não são comparáveis com as consultas atuais, então
+        a divergência é reportada já na inicialização.
+        """
+        embedding_function = _HashingEmbeddingFunction(self._embedder)
+        metadata = {"hnsw:space": "l2", _EMBEDDER_METADATA_KEY: self._embedder.version}
+        collection = self._client.get_or_create_collection(
             name=collection_name,
-            embedding_function=_HashingEmbeddingFunction(dim=embedding_dim),
-            metadata={"hnsw:space": "l2"},
+            embedding_function=embedding_function,
+            metadata=metadata,
+        )
+        stored = (collection.metadata or {}).get(_EMBEDDER_METADATA_KEY)
+        if stored == self._embedder.version:
+            return collection
+        if collection.count() == 0:
+            # coleção vazia de uma versão anterior: recria com a metadata atual
+            self._client.delete_collection(collection_name)
+            return self._client.create_collection(
+                name=collection_name,
+                embedding_function=embedding_function,
+                metadata=metadata,
+            )
+        raise EmbedderVersionMismatchError(
+            f"Coleção '{collection_name}' em {self._persist_directory} foi indexada com o "
+            f"embedder '{stored or 'desconhecido'}', mas o atual é "
+            f"'{self._embedder.version}'. Remova a coleção e reindexe os documentos."
         )
 
     def add(self, chunks: Iterable[Chunk]) -> int:
-        ids: list[str] = []
-        documents: list[str] = []
-        metadatas: list[dict[str, Any]] = []
-
-        for idx, ch in enumerate(chunks):
-            cid = ch.chunk_id or f"{ch.document_id}:{idx}"
-            ids.append(cid)
-            documents.append(ch.content)
-            meta: dict[str, Any] = {"document_id": ch.document_id, "chunk_id": cid}
-            for k, v in (ch.metadata or {}).items():
-                if k not in meta:
-                    meta[k] = v
-            metadatas.append(meta)
-
-        if not ids:
-            return 0
-
-        # Ajuste de tipagem: converte para lista de Mapping[str, Any]
-        from collections.abc import Mapping
+        return self.add_bulk(chunks)
 
-        metadatas_list: list[Mapping[str, Any]] = [m for m in metadatas]
-        self._collection.upsert(
-            ids=ids,
-            documents=documents,
-            metadatas=metadatas_list,
-        )
+    def add_bulk(
+        self,
+        chunks: Iterable[Chunk],
+        batch_size: int | None = None,
+        progress: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        Consome `chunks` em lotes limitados: enquanto o lote N é gravado (upsert com
+        embeddings explícitas), as embeddings do lote N+1 são calculadas numa thread.
+        O tamanho do lote respeita o máximo aceito pelo cliente Chroma. `progress`
+        recebe o total acumulado de chunks gravados após cada lote.
+        """
+        size = self._effective_batch_size(batch_size)
+        batches = _iter_batches(chunks, size)
+        written = 0
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="chroma-embed") as pool:
+            pending = _submit_batch(pool, self._embedder, next(batches, None))
+            while pending is not None:
+                batch, embeddings = pending.result()
+                # dispara o próximo lote antes de gravar o atual
+                pending = _submit_batch(pool, self._embedder, next(batches, None))
+                self._collection.upsert(
+                    ids=batch.ids,
+                    embeddings=list(embeddings),
+                    documents=batch.documents,
+                    metadatas=batch.metadatas,
+                )
+                self._bump_generation()
+                written += len(batch.ids)
+                logger.debug("Chroma: %d chunks gravados", written)
+                if progress is not None:
+                    progress(written)
+        return written
 
-        return len(ids)
+    def _effective_batch_size(self, batch_size: int | None) -> int:
+        size = max(1, int(batch_size or self._batch_size))
+        get_max = getattr(self._client, "get_max_batch_size", None)
+        if get_max is not None:
+            size = min(size, int(get_max()))
+        return size
 
     def similarity_search(self, query: str, top_k: int = 5) -> list[tuple[float, Chunk]]:
+        return self.similarity_search_batch([query], top_k=top_k)[0]
+
+    def similarity_search_batch(
+        self, queries: Sequence[str], top_k: int = 5
+    ) -> list[list[tuple[float, Chunk]]]:
         top_k = max(1, min(50, int(top_k)))
-        if not query.strip():
-            return []
+        results: list[list[tuple[float, Chunk]]] = [[] for _ in queries]
+        live = [i for i, q in enumerate(queries) if q.strip()]
+        if not live:
+            return results
 
-        # Conversão explícita para tipos aceitos pelo SDK
+        # Uma única chamada ao Chroma para todo o lote
         include_fields: list[Any] = ["documents", "metadatas", "distances"]
         res = self._collection.query(
-            query_texts=[query],
+            query_texts=[queries[i] for i in live],
             n_results=top_k,
             include=include_fields,
         )
-        docs = (res.get("documents") or [[]])[0]
-        metas = (res.get("metadatas") or [[]])[0]
-        dists = (res.get("distances") or [[]])[0]
-
-        results: list[tuple[float, Chunk]] = []
-        for doc, meta, dist in zip(docs, metas, dists, strict=False):
-            try:
-                d = float(dist)
-            except Exception:
-                d = 0.0
-            score = 1.0 / (1.0 + max(0.0, d))
-            results.append(
-                (
-                    score,
-                    Chunk(
-                        document_id=str(meta.get("document_id", "")),
-                        content=str(doc),
-                        chunk_id=(
-                            str(meta.get("chunk_id")) if meta.get("chunk_id") is not None else None
-                        ),
-                        metadata={
-                            k: v for k, v in meta.items() if k not in ("document_id", "chunk_id")
-                        },
-                    ),
-                )
+        all_docs = res.get("documents") or []
+        all_metas = res.get("metadatas") or []
+        all_dists = res.get("distances") or []
+        for row, qi in enumerate(live):
+            results[qi] = _to_results(
+                all_docs[row] if row < len(all_docs) else [],
+                all_metas[row] if row < len(all_metas) else [],
+                all_dists[row] if row < len(all_dists) else [],
             )
-
-        results.sort(key=lambda t: t[0], reverse=True)
         return results
 
     def delete_by_document(self, document_id: str) -> int:
@@ -125,4 +161,107 @@ class ChromaVectorStore(VectorStore):
         removed = len(ids)
         if removed:
             self._collection.delete(where={"document_id": document_id})
+            self._bump_generation()
         return removed
+
+    def content_hashes(self, document_id: str) -> dict[str, str]:
+        include_fields: list[Any] = ["metadatas"]
+        res = self._collection.get(where={"document_id": document_id}, include=include_fields)
+        ids = res.get("ids") or []
+        metas = res.get("metadatas") or []
+        # chunks gravados antes do hash existir recebem "" e serão regravados
+        return {
+            cid: str((meta or {}).get(_CONTENT_HASH_KEY, ""))
+            for cid, meta in zip(ids, metas, strict=False)
+        }
+
+    def delete_chunks(self, document_id: str, chunk_ids: Iterable[str]) -> int:
+        ids = list(dict.fromkeys(chunk_ids))
+        if not ids:
+            return 0
+        size = self._effective_batch_size(None)
+        removed = 0
+        for start in range(0, len(ids), size):
+            part = ids[start : start + size]
+            found = (
+                self._collection.get(ids=part, where={"document_id": document_id}, include=[]).get(
+                    "ids"
+                )
+                or []
+            )
+            if found:
+                self._collection.delete(ids=list(found))
+                removed += len(found)
+        if removed:
+            self._bump_generation()
+        return removed
+
+    def count(self) -> int:
+        return int(self._collection.count())
+
+
+@dataclass(frozen=True)
+class _Batch:
+    ids: list[str]
+    documents: list[str]
+    metadatas: list[Mapping[str, Any]]
+
+
+def _iter_batches(chunks: Iterable[Chunk], size: int) -> Iterator[_Batch]:
+    ids: list[str] = []
+    documents: list[str] = []
+    metadatas: list[Mapping[str, Any]] = []
+    for idx, ch in enumerate(chunks):
+        cid = ch.chunk_id or f"{ch.document_id}:{idx}"
+        meta: dict[str, Any] = {
+            "document_id": ch.document_id,
+            "chunk_id": cid,
+            _CONTENT_HASH_KEY: ch.content_hash(),
+        }
+        for k, v in (ch.metadata or {}).items():
+            if k not in meta:
+                meta[k] = v
+        ids.append(cid)
+        documents.append(ch.content)
+        metadatas.append(meta)
+        if len(ids) >= size:
+            yield _Batch(ids, documents, metadatas)
+            ids, documents, metadatas = [], [], []
+    if ids:
+        yield _Batch(ids, documents, metadatas)
+
+
+def _submit_batch(
+    pool: ThreadPoolExecutor, embedder: Embedder, batch: _Batch | None
+) -> Future[tuple[_Batch, np.ndarray]] | None:
+    if batch is None:
+        return None
+    return pool.submit(lambda: (batch, embedder.embed(batch.documents)))
+
+
+def _to_results(
+    docs: Sequence[Any], metas: Sequence[Mapping[str, Any]], dists: Sequence[Any]
+) -> list[tuple[float, Chunk]]:
+    results: list[tuple[float, Chunk]] = []
+    for doc, meta, dist in zip(docs, metas, dists, strict=False):
+        try:
+            d = float(dist)
+        except Exception:
+            d = 0.0
+        score = 1.0 / (1.0 + max(0.0, d))
+        results.append(
+            (
+                score,
+                Chunk(
+                    document_id=str(meta.get("document_id", "")),
+                    content=str(doc),
+                    chunk_id=(
+                        str(meta.get("chunk_id")) if meta.get("chunk_id") is not None else None
+                    ),
+                    metadata={k: v for k, v in meta.items() if k not in _RESERVED_KEYS},
+                ),
+            )
+        )
+
+    results.sort(key=lambda t: t[0], reverse=True)
+    return results
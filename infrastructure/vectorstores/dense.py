@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+
+from domain.services.vector_store import Chunk, VectorStore
+from infrastructure.embeddings.base import Embedder
+from infrastructure.embeddings.hashing import HashingEmbedder
+from infrastructure.vectorstores.snapshot import (
+    SnapshotError,
+    SnapshotInfo,
+    decode_chunks,
+    encode_chunks,
+    info_from,
+    read_snapshot,
+    snapshot_meta,
+    write_snapshot,
+)
+
+_SNAPSHOT_KIND = "dense"
+
+
+class DenseVectorStore(VectorStore):
+    """
+    VectorStore em memória sobre uma matriz float32 contígua (uma linha por chunk).
+
+    - `similarity_search`/`similarity_search_batch`: produto matricial do lote de
+      consultas contra a matriz (em blocos de linhas) + `argpartition` para o top-k.
+    - `add`: cresce a matriz por duplicação (custo amortizado O(1) por linha).
+    - `delete_by_document`: swap-remove (a última linha ocupa o lugar da removida).
+
+    Como as embeddings são L2-normalizadas e não-negativas, o produto interno é o
+    cosseno, já no intervalo [0, 1].
+
+    `snapshot`/`load` gravam e recarregam matriz e chunks num arquivo binário; a matriz
+    volta numa única cópia, sem recalcular embeddings.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder | None = None,
+        initial_capacity: int = 1024,
+        embed_batch_size: int = 1024,
+        search_block_rows: int = 65_536,
+    ) -> None:
+        self._embedder: Embedder = embedder or HashingEmbedder()
+        self._dim = int(self._embedder.dim)
+        self._embed_batch_size = max(1, int(embed_batch_size))
+        self._search_block_rows = max(1, int(search_block_rows))
+        self._matrix = np.zeros((max(1, int(initial_capacity)), self._dim), dtype=np.float32)
+        self._chunks: list[Chunk] = []  # linha -> chunk
+        self._doc_rows: dict[str, set[int]] = {}
+        self._lock = threading.RLock()
+
+    def add(self, chunks: Iterable[Chunk]) -> int:
+        count = 0
+        for batch in _batched(chunks, self._embed_batch_size):
+            vectors = self._embedder.embed([ch.content for ch in batch])
+            with self._lock:
+                start = len(self._chunks)
+                self._ensure_capacity(start + len(batch))
+                self._matrix[start : start + len(batch)] = vectors
+                for row, ch in enumerate(batch, start=start):
+                    self._chunks.append(ch)
+                    self._doc_rows.setdefault(ch.document_id, set()).add(row)
+                self._bump_generation()
+            count += len(batch)
+        return count
+
+    def similarity_search(self, query: str, top_k: int = 5) -> list[tuple[float, Chunk]]:
+        return self.similarity_search_batch([query], top_k=top_k)[0]
+
+    def similarity_search_batch(
+        self, queries: Sequence[str], top_k: int = 5
+    ) -> list[list[tuple[float, Chunk]]]:
+        results: list[list[tuple[float, Chunk]]] = [[] for _ in queries]
+        live = [i for i, q in enumerate(queries) if q.strip()]
+        if not live or top_k <= 0:
+            return results
+        q = self._embedder.embed([queries[i] for i in live])
+        with self._lock:
+            n = len(self._chunks)
+            if n == 0:
+                return results
+            scores, idx = _batched_top_k(q, self._matrix, n, top_k, self._search_block_rows)
+            for row, qi in enumerate(live):
+                results[qi] = [
+                    (float(s), self._chunks[i])
+                    for s, i in zip(scores[row], idx[row], strict=True)
+                    if s > 0.0
+                ]
+        return results
+
+    def delete_by_document(self, document_id: str) -> int:
+        with self._lock:
+            rows = self._doc_rows.pop(document_id, set())
+            self._remove_rows(rows)
+            return len(rows)
+
+    def content_hashes(self, document_id: str) -> dict[str, str]:
+        with self._lock:
+            chunks = [self._chunks[row] for row in self._doc_rows.get(document_id, ())]
+        return {ch.chunk_id: ch.content_hash() for ch in chunks if ch.chunk_id is not None}
+
+    def delete_chunks(self, document_id: str, chunk_ids: Iterable[str]) -> int:
+        targets = set(chunk_ids)
+        with self._lock:
+            doc_rows = self._doc_rows.get(document_id)
+            if not targets or not doc_rows:
+                return 0
+            rows = {row for row in doc_rows if self._chunks[row].chunk_id in targets}
+            doc_rows -= rows
+            if not doc_rows:
+                del self._doc_rows[document_id]
+            self._remove_rows(rows)
+            return len(rows)
+
+    def count(self) -> int:
+        return len(self._chunks)
+
+    def snapshot(self, path: Path) -> SnapshotInfo:
+        with self._lock:
+            n = len(self._chunks)
+            meta = snapshot_meta(n)
+            matrix = self._matrix[:n].tobytes()
+            chunks = list(self._chunks)
+            doc_ids = list(self._doc_rows)
+        meta.update(dim=self._dim, embedder=self._embedder.version)
+        write_snapshot(path, _SNAPSHOT_KIND, meta, [matrix, *encode_chunks(chunks)])
+        return info_from(meta, doc_ids)
+
+    def load(self, path: Path) -> SnapshotInfo:
+        """Substitui o conteúdo do store pelo do snapshot (mesmo embedder e dimensão)."""
+        meta, sections = read_snapshot(path, _SNAPSHOT_KIND)
+        if meta.get("embedder") != self._embedder.version or meta.get("dim") != self._dim:
+            raise SnapshotError(
+                f"{path}: gerado com o embedder '{meta.get('embedder')}' (dim {meta.get('dim')}), "
+                f"mas o atual é '{self._embedder.version}' (dim {self._dim})"
+            )
+        chunks, doc_ids = decode_chunks(sections[1:])
+        vectors = np.frombuffer(sections[0], dtype=np.float32).reshape(len(chunks), self._dim)
+        with self._lock:
+            capacity = max(len(chunks), self._matrix.shape[0])
+            self._matrix = np.zeros((capacity, self._dim), dtype=np.float32)
+            self._matrix[: len(chunks)] = vectors
+            self._chunks = chunks
+            self._doc_rows = {}
+            for row, ch in enumerate(chunks):
+                self._doc_rows.setdefault(ch.document_id, set()).add(row)
+            self._bump_generation()
+        return info_from(meta, doc_ids)
+
+    def _remove_rows(self, rows: set[int]) -> None:
+        """Swap-remove de `rows` (já retiradas de `_doc_rows`)."""
+        # ordem decrescente: a última linha nunca é uma linha ainda pendente de remoção
+        for row in sorted(rows, reverse=True):
+            last = len(self._chunks) - 1
+            if row != last:
+                moved = self._chunks[last]
+                self._matrix[row] = self._matrix[last]
+                self._chunks[row] = moved
+                moved_rows = self._doc_rows[moved.document_id]
+                moved_rows.discard(last)
+                moved_rows.add(row)
+            self._chunks.pop()
+        if rows:
+            self._bump_generation()
+
+    def _ensure_capacity(self, needed: int) -> None:
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        grown = np.zeros((capacity, self._dim), dtype=np.float32)
+        grown[: len(self._chunks)] = self._matrix[: len(self._chunks)]
+        self._matrix = grown
+
+
+def _batched_top_k(
+    queries: np.ndarray, matrix: np.ndarray, n: int, k: int, block_rows: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k por linha de `queries @ matrix[:n].T`, em ordem decrescente.
+
+    A matriz é percorrida em blocos de `block_rows` linhas para limitar a memória
+    temporária a (lote x bloco) scores (e, com códigos quantizados, à cópia float do
+    bloco); os candidatos de cada bloco são fundidos ao final com um segundo
+    `argpartition`.
+    """
+    k = min(k, n)
+    cand_scores: list[np.ndarray] = []
+    cand_idx: list[np.ndarray] = []
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        rows = matrix[start:stop]
+        if rows.dtype != queries.dtype:
+            rows = rows.astype(queries.dtype)  # códigos int8: o produto misto não usaria BLAS
+        block = queries @ rows.T
+        kb = min(k, stop - start)
+        part = np.argpartition(-block, kb - 1, axis=1)[:, :kb]
+        cand_scores.append(np.take_along_axis(block, part, axis=1))
+        cand_idx.append(part + start)
+    scores = np.concatenate(cand_scores, axis=1)
+    idx = np.concatenate(cand_idx, axis=1)
+    if scores.shape[1] > k:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, part, axis=1)
+        idx = np.take_along_axis(idx, part, axis=1)
+    order = np.argsort(-scores, axis=1, kind="stable")
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(idx, order, axis=1)
+
+
+def _batched(items: Iterable[Chunk], size: int) -> Iterator[list[Chunk]]:
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
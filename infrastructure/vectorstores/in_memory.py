@@ -1,44 +1,206 @@
 from __future__ import annotations
 
+import heapq
+import threading
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
 
 from domain.services.vector_store import Chunk, VectorStore
+from infrastructure.vectorstores.snapshot import (
+    SnapshotInfo,
+    decode_chunks,
+    encode_chunks,
+    info_from,
+    read_snapshot,
+    snapshot_meta,
+    write_snapshot,
+)
+
+_SNAPSHOT_KIND = "inmemory"
+
+
+@dataclass(frozen=True)
+class _Entry:
+    chunk: Chunk
+    tokens: frozenset[str]
+    order: tuple[int, int]  # (ordem de chegada do documento, sequência do chunk)
 
 
 class InMemoryVectorStore(VectorStore):
     """
     Implementação simples em memória para testes.
     Métrica de similaridade: Jaccard de tokens casefolded.
+
+    Os chunks são tokenizados uma única vez em `add()` e mantidos em um índice
+    invertido (token -> ids de chunks). A busca pontua apenas os candidatos que
+    compartilham ao menos um token com a consulta; scores e ordenação são os
+    mesmos de uma varredura completa.
+
+    `snapshot`/`load` gravam e recarregam os chunks num arquivo binário (ver
+    `infrastructure.vectorstores.snapshot`); o índice invertido é reconstruído na carga.
+
+    Escritas e buscas podem chegar de várias threads (executor do store): o índice
+    é protegido por um `RLock`, e a tokenização fica fora dele.
     """
 
     def __init__(self) -> None:
-        self._by_doc: dict[str, list[Chunk]] = defaultdict(list)
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._by_doc: dict[str, list[int]] = {}
+        self._entries: dict[int, _Entry] = {}
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._doc_order: dict[str, int] = {}
+        self._next_id = 0
+        self._next_doc_order = 0
 
     def add(self, chunks: Iterable[Chunk]) -> int:
-        count = 0
-        for ch in chunks:
-            self._by_doc[ch.document_id].append(ch)
-            count += 1
-        return count
+        tokenized = [(ch, frozenset(_tokenize(ch.content))) for ch in chunks]
+        with self._lock:
+            for ch, tokens in tokenized:
+                doc_order = self._doc_order.get(ch.document_id)
+                if doc_order is None:
+                    doc_order = self._next_doc_order
+                    self._doc_order[ch.document_id] = doc_order
+                    self._next_doc_order += 1
+
+                entry_id = self._next_id
+                self._next_id += 1
+                self._entries[entry_id] = _Entry(
+                    chunk=ch, tokens=tokens, order=(doc_order, entry_id)
+                )
+                self._by_doc.setdefault(ch.document_id, []).append(entry_id)
+                for tok in tokens:
+                    self._postings[tok].add(entry_id)
+            if tokenized:
+                self._bump_generation()
+        return len(tokenized)
 
     def similarity_search(self, query: str, top_k: int = 5) -> list[tuple[float, Chunk]]:
         q = _tokenize(query)
-        scored: list[tuple[float, Chunk]] = []
-        for lst in self._by_doc.values():
-            for ch in lst:
-                c = _tokenize(ch.content)
-                score = _jaccard(q, c)
-                if score > 0:
-                    scored.append((score, ch))
-        scored.sort(key=lambda t: t[0], reverse=True)
-        return scored[:top_k]
+        if not q or top_k <= 0:
+            return []
+
+        # |q ∩ c| para cada candidato, acumulado a partir das posting lists
+        inter: dict[int, int] = defaultdict(int)
+        with self._lock:
+            for tok in q:
+                for entry_id in self._postings.get(tok, ()):
+                    inter[entry_id] += 1
+            return self._rank(inter, len(q), top_k)
+
+    def similarity_search_batch(
+        self, queries: Sequence[str], top_k: int = 5
+    ) -> list[list[tuple[float, Chunk]]]:
+        token_sets = [_tokenize(q) for q in queries]
+        if top_k <= 0:
+            return [[] for _ in queries]
+
+        # cada posting list é percorrida uma única vez para todo o lote
+        queries_by_token: dict[str, list[int]] = defaultdict(list)
+        for qi, toks in enumerate(token_sets):
+            for tok in toks:
+                queries_by_token[tok].append(qi)
+
+        inter: list[dict[int, int]] = [defaultdict(int) for _ in queries]
+        with self._lock:
+            for tok, qis in queries_by_token.items():
+                postings = self._postings.get(tok)
+                if not postings:
+                    continue
+                for entry_id in postings:
+                    for qi in qis:
+                        inter[qi][entry_id] += 1
+
+            return [
+                self._rank(inter[qi], len(toks), top_k) if toks else []
+                for qi, toks in enumerate(token_sets)
+            ]
+
+    def _rank(self, inter: dict[int, int], q_len: int, top_k: int) -> list[tuple[float, Chunk]]:
+        scored: list[tuple[float, _Entry]] = []
+        for entry_id, n in inter.items():
+            entry = self._entries[entry_id]
+            scored.append((n / (q_len + len(entry.tokens) - n), entry))
+
+        # Mesma ordem de um sort estável sobre a varredura por documento
+        best = heapq.nsmallest(top_k, scored, key=lambda t: (-t[0], t[1].order))
+        return [(score, entry.chunk) for score, entry in best]
 
     def delete_by_document(self, document_id: str) -> int:
-        removed = len(self._by_doc.get(document_id, []))
-        if document_id in self._by_doc:
-            del self._by_doc[document_id]
-        return removed
+        with self._lock:
+            entry_ids = self._by_doc.pop(document_id, [])
+            self._doc_order.pop(document_id, None)
+            for entry_id in entry_ids:
+                self._remove_entry(entry_id)
+            if entry_ids:
+                self._bump_generation()
+            return len(entry_ids)
+
+    def content_hashes(self, document_id: str) -> dict[str, str]:
+        with self._lock:
+            chunks = [self._entries[e].chunk for e in self._by_doc.get(document_id, ())]
+        return {ch.chunk_id: ch.content_hash() for ch in chunks if ch.chunk_id is not None}
+
+    def delete_chunks(self, document_id: str, chunk_ids: Iterable[str]) -> int:
+        targets = set(chunk_ids)
+        with self._lock:
+            entry_ids = self._by_doc.get(document_id)
+            if not targets or not entry_ids:
+                return 0
+            keep: list[int] = []
+            removed = 0
+            for entry_id in entry_ids:
+                if self._entries[entry_id].chunk.chunk_id in targets:
+                    self._remove_entry(entry_id)
+                    removed += 1
+                else:
+                    keep.append(entry_id)
+            if keep:
+                self._by_doc[document_id] = keep
+            else:
+                # documento sem chunks: mesmo estado de delete_by_document
+                del self._by_doc[document_id]
+                self._doc_order.pop(document_id, None)
+            if removed:
+                self._bump_generation()
+            return removed
+
+    def count(self) -> int:
+        return len(self._entries)
+
+    def snapshot(self, path: Path) -> SnapshotInfo:
+        with self._lock:
+            meta = snapshot_meta(len(self._entries))
+            # ordem (documento, chegada): recarregar com add() preserva o desempate da busca
+            chunks = [e.chunk for e in sorted(self._entries.values(), key=lambda e: e.order)]
+            doc_ids = list(self._by_doc)
+        sections = encode_chunks(chunks)
+        write_snapshot(path, _SNAPSHOT_KIND, meta, sections)
+        return info_from(meta, doc_ids)
+
+    def load(self, path: Path) -> SnapshotInfo:
+        """Substitui o conteúdo do store pelo do snapshot."""
+        meta, sections = read_snapshot(path, _SNAPSHOT_KIND)
+        chunks, doc_ids = decode_chunks(sections)
+        with self._lock:
+            self._reset()
+            self.add(chunks)
+            self._bump_generation()
+        return info_from(meta, doc_ids)
+
+    def _remove_entry(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        for tok in entry.tokens:
+            postings = self._postings.get(tok)
+            if postings is None:
+                continue
+            postings.discard(entry_id)
+            if not postings:
+                del self._postings[tok]
 
 
 def _tokenize(text: str) -> set[str]:
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Sequence
+
+from domain.services.vector_store import Chunk, VectorStore
+from infrastructure.observability.app_metrics import AppMetrics
+
+
+class MeteredVectorStore(VectorStore):
+    """
+    Decorador que mede a latência das buscas do VectorStore interno em
+    `rag_vector_search_seconds{provider, kind}` (kind = "single" | "batch").
+    As demais operações são apenas delegadas; `generation` é a do store interno.
+    """
+
+    def __init__(self, inner: VectorStore, provider: str, metrics: AppMetrics) -> None:
+        self.inner = inner
+        self.provider = provider
+        # filhos resolvidos uma vez: no caminho da consulta só há o observe()
+        self._single = metrics.search_seconds.labels(provider=provider, kind="single")
+        self._batch = metrics.search_seconds.labels(provider=provider, kind="batch")
+
+    @property
+    def generation(self) -> int:
+        return self.inner.generation
+
+    def add(self, chunks: Iterable[Chunk]) -> int:
+        return self.inner.add(chunks)
+
+    def similarity_search(self, query: str, top_k: int = 5) -> list[tuple[float, Chunk]]:
+        t0 = time.perf_counter()
+        try:
+            return self.inner.similarity_search(query, top_k=top_k)
+        finally:
+            self._single.observe(time.perf_counter() - t0)
+
+    def similarity_search_batch(
+        self, queries: Sequence[str], top_k: int = 5
+    ) -> list[list[tuple[float, Chunk]]]:
+        t0 = time.perf_counter()
+        try:
+            return self.inner.similarity_search_batch(queries, top_k=top_k)
+        finally:
+            self._batch.observe(time.perf_counter() - t0)
+
+    def delete_by_document(self, document_id: str) -> int:
+        return self.inner.delete_by_document(document_id)
+
+    def content_hashes(self, document_id: str) -> dict[str, str]:
+        return self.inner.content_hashes(document_id)
+
+    def delete_chunks(self, document_id: str, chunk_ids: Iterable[str]) -> int:
+        return self.inner.delete_chunks(document_id, chunk_ids)
+
+    def count(self) -> int:
+        return self.inner.count()
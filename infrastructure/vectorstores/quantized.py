@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from domain.services.vector_store import Chunk, VectorStore
+from infrastructure.embeddings.base import Embedder
+from infrastructure.embeddings.hashing import HashingEmbedder
+from infrastructure.vectorstores.dense import _batched, _batched_top_k
+from infrastructure.vectorstores.snapshot import (
+    SnapshotError,
+    SnapshotInfo,
+    decode_chunks,
+    encode_chunks,
+    info_from,
+    read_snapshot,
+    snapshot_meta,
+    write_snapshot,
+)
+
+_SNAPSHOT_KIND = "quantized"
+
+CODECS = ("int8", "binary")
+
+
+class QuantizedVectorStore(VectorStore):
+    """
+    VectorStore em memória com embeddings quantizadas e reordenação exata.
+
+    Em vez da matriz float32 do `DenseVectorStore`, a memória residente guarda só os
+    códigos de cada chunk:
+
+    - `int8`: um byte por dimensão, com escala por dimensão (maior |valor| visto / 127);
+      quando um lote novo excede a escala de uma dimensão, só aquela coluna é requantizada.
+    - `binary`: um bit por dimensão (`valor > 0`), empacotado; a distância é Hamming,
+      contada com popcount sobre o XOR dos bytes. Funciona bem com embeddings centradas
+      em zero; com as de hashing (não-negativas) o bit só marca dimensões ocupadas e o
+      recall cai muito — para elas, prefira `int8` (ver `store.*.recall_at_k` no benchmark).
+
+    A busca seleciona `top_k * oversample` candidatos pelos códigos e os reordena pelo
+    cosseno exato. Os vetores float32 dos candidatos vêm de um arquivo temporário em
+    `rescore_dir`, mapeado via mmap (fica no page cache, não no heap, e é liberado pelo
+    kernel sob pressão), ou, sem `rescore_dir`, são recalculados pelo embedder a partir
+    do conteúdo dos chunks. Os scores devolvidos são sempre os exatos.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder | None = None,
+        codec: str = "int8",
+        oversample: int = 4,
+        rescore_dir: Path | None = None,
+        initial_capacity: int = 1024,
+        embed_batch_size: int = 1024,
+        search_block_rows: int = 8_192,
+    ) -> None:
+        if codec not in CODECS:
+            raise ValueError(f"codec desconhecido: {codec!r} (use {' ou '.join(CODECS)})")
+        self._embedder: Embedder = embedder or HashingEmbedder()
+        self._dim = int(self._embedder.dim)
+        self._codec = codec
+        self._oversample = max(1, int(oversample))
+        self._embed_batch_size = max(1, int(embed_batch_size))
+        # o bloco int8 é convertido para float32 no produto: limita esse temporário
+        self._search_block_rows = max(1, int(search_block_rows))
+        capacity = max(1, int(initial_capacity))
+        if codec == "int8":
+            self._codes = np.zeros((capacity, self._dim), dtype=np.int8)
+        else:
+            self._codes = np.zeros((capacity, (self._dim + 7) // 8), dtype=np.uint8)
+        self._scales = np.zeros(self._dim, dtype=np.float32)  # int8: valor ~ código * escala
+        self._vectors = (
+            _VectorFile(rescore_dir, self._dim, capacity) if rescore_dir is not None else None
+        )
+        self._chunks: list[Chunk] = []  # linha -> chunk
+        self._doc_rows: dict[str, set[int]] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def dim(self) -> int:
+        return self._dim
+
+    def resident_bytes(self) -> int:
+        """Bytes dos códigos e escalas em uso (o equivalente float32 seria `count() * dim * 4`)."""
+        row_bytes = int(self._codes.shape[1]) * int(self._codes.itemsize)
+        return len(self._chunks) * row_bytes + int(self._scales.nbytes)
+
+    def add(self, chunks: Iterable[Chunk]) -> int:
+        count = 0
+        for batch in _batched(chunks, self._embed_batch_size):
+            vectors = self._embedder.embed([ch.content for ch in batch])
+            with self._lock:
+                start = len(self._chunks)
+                self._ensure_capacity(start + len(batch))
+                self._codes[start : start + len(batch)] = self._encode(vectors)
+                if self._vectors is not None:
+                    self._vectors.array[start : start + len(batch)] = vectors
+                for row, ch in enumerate(batch, start=start):
+                    self._chunks.append(ch)
+                    self._doc_rows.setdefault(ch.document_id, set()).add(row)
+                self._bump_generation()
+            count += len(batch)
+        return count
+
+    def similarity_search(self, query: str, top_k: int = 5) -> list[tuple[float, Chunk]]:
+        return self.similarity_search_batch([query], top_k=top_k)[0]
+
+    def similarity_search_batch(
+        self, queries: Sequence[str], top_k: int = 5
+    ) -> list[list[tuple[float, Chunk]]]:
+        results: list[list[tuple[float, Chunk]]] = [[] for _ in queries]
+        live = [i for i, q in enumerate(queries) if q.strip()]
+        if not live or top_k <= 0:
+            return results
+        q = self._embedder.embed([queries[i] for i in live])
+        with self._lock:
+            n = len(self._chunks)
+            if n == 0:
+                return results
+            candidates = self._candidates(q, n, min(n, top_k * self._oversample))
+            rows, inverse = np.unique(candidates.ravel(), return_inverse=True)
+            inverse = inverse.reshape(candidates.shape)
+            chunks = [self._chunks[i] for i in rows]
+            exact = np.array(self._vectors.array[rows]) if self._vectors is not None else None
+        if exact is None:
+            # sem vetores guardados: recalcula as embeddings só dos candidatos
+            exact = self._embedder.embed([ch.content for ch in chunks])
+
+        for row, qi in enumerate(live):
+            cand = inverse[row]
+            scores = exact[cand] @ q[row]
+            order = np.argsort(-scores, kind="stable")[:top_k]
+            results[qi] = [(float(scores[j]), chunks[cand[j]]) for j in order if scores[j] > 0.0]
+        return results
+
+    def delete_by_document(self, document_id: str) -> int:
+        with self._lock:
+            rows = self._doc_rows.pop(document_id, set())
+            self._remove_rows(rows)
+            return len(rows)
+
+    def content_hashes(self, document_id: str) -> dict[str, str]:
+        with self._lock:
+            chunks = [self._chunks[row] for row in self._doc_rows.get(document_id, ())]
+        return {ch.chunk_id: ch.content_hash() for ch in chunks if ch.chunk_id is not None}
+
+    def delete_chunks(self, document_id: str, chunk_ids: Iterable[str]) -> int:
+        targets = set(chunk_ids)
+        with self._lock:
+            doc_rows = self._doc_rows.get(document_id)
+            if not targets or not doc_rows:
+                return 0
+            rows = {row for row in doc_rows if self._chunks[row].chunk_id in targets}
+            doc_rows -= rows
+            if not doc_rows:
+                del self._doc_rows[document_id]
+            self._remove_rows(rows)
+            return len(rows)
+
+    def count(self) -> int:
+        return len(self._chunks)
+
+    def snapshot(self, path: Path) -> SnapshotInfo:
+        """Grava códigos e escalas (e os vetores float32, se guardados para a reordenação)."""
+        with self._lock:
+            n = len(self._chunks)
+            meta = snapshot_meta(n)
+            codes = self._codes[:n].tobytes()
+            scales = self._scales.tobytes()
+            vectors = self._vectors.array[:n].tobytes() if self._vectors is not None else b""
+            chunks = list(self._chunks)
+            doc_ids = list(self._doc_rows)
+        meta.update(
+            dim=self._dim,
+            embedder=self._embedder.version,
+            codec=self._codec,
+            vectors=self._vectors is not None,
+        )
+        write_snapshot(path, _SNAPSHOT_KIND, meta, [codes, scales, vectors, *encode_chunks(chunks)])
+        return info_from(meta, doc_ids)
+
+    def load(self, path: Path) -> SnapshotInfo:
+        """Substitui o conteúdo do store pelo do snapshot (mesmo embedder, dimensão e codec)."""
+        meta, sections = read_snapshot(path, _SNAPSHOT_KIND)
+        if meta.get("embedder") != self._embedder.version or meta.get("dim") != self._dim:
+            raise SnapshotError(
+                f"{path}: gerado com o embedder '{meta.get('embedder')}' (dim {meta.get('dim')}), "
+                f"mas o atual é '{self._embedder.version}' (dim {self._dim})"
+            )
+        if meta.get("codec") != self._codec:
+            raise SnapshotError(f"{path}: codec '{meta.get('codec')}', não '{self._codec}'")
+        chunks, doc_ids = decode_chunks(sections[3:])
+        n = len(chunks)
+        codes = np.frombuffer(sections[0], dtype=self._codes.dtype).reshape(n, -1)
+        vectors: np.ndarray | None = None
+        if self._vectors is not None:
+            if meta.get("vectors"):
+                vectors = np.frombuffer(sections[2], dtype=np.float32).reshape(n, self._dim)
+            else:
+                vectors = self._embed_all(chunks)
+        with self._lock:
+            capacity = max(n, self._codes.shape[0])
+            self._codes = np.zeros((capacity, self._codes.shape[1]), dtype=self._codes.dtype)
+            self._codes[:n] = codes
+            self._scales = np.frombuffer(sections[1], dtype=np.float32).copy()
+            if self._vectors is not None and vectors is not None:
+                self._vectors.ensure_capacity(capacity)
+                self._vectors.array[:n] = vectors
+            self._chunks = chunks
+            self._doc_rows = {}
+            for row, ch in enumerate(chunks):
+                self._doc_rows.setdefault(ch.document_id, set()).add(row)
+            self._bump_generation()
+        return info_from(meta, doc_ids)
+
+    def _embed_all(self, chunks: Sequence[Chunk]) -> np.ndarray:
+        out = np.empty((len(chunks), self._dim), dtype=np.float32)
+        for start in range(0, len(chunks), self._embed_batch_size):
+            batch = chunks[start : start + self._embed_batch_size]
+            out[start : start + len(batch)] = self._embedder.embed([ch.content for ch in batch])
+        return out
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        if self._codec == "binary":
+            return np.packbits(vectors > 0.0, axis=1)
+        self._fit_scales(np.abs(vectors).max(axis=0))
+        return _quantize(vectors, self._scales)
+
+    def _fit_scales(self, peaks: np.ndarray) -> None:
+        """Amplia a escala das dimensões em que `peaks` excede o alcance atual."""
+        wanted = (peaks / 127.0).astype(np.float32)
+        grown = np.flatnonzero(wanted > self._scales)
+        if grown.size == 0:
+            return
+        n = len(self._chunks)
+        old = self._scales[grown]
+        if n:
+            # só as colunas ampliadas são requantizadas (erro extra de no máximo meio passo)
+            ratio = old / wanted[grown]
+            column = self._codes[:n, grown].astype(np.float32) * ratio
+            self._codes[:n, grown] = np.rint(column).astype(np.int8)
+        self._scales[grown] = wanted[grown]
+
+    def _candidates(self, q: np.ndarray, n: int, k: int) -> np.ndarray:
+        """Linhas (consulta x k) mais próximas pelos códigos, sem ordem garantida."""
+        if self._codec == "int8":
+            # q · (código * escala) = (q * escala) · código
+            _, idx = _batched_top_k(q * self._scales, self._codes, n, k, self._search_block_rows)
+            return idx
+        return _hamming_top_k(
+            np.packbits(q > 0.0, axis=1), self._codes, n, k, self._search_block_rows
+        )
+
+    def _remove_rows(self, rows: set[int]) -> None:
+        """Swap-remove de `rows` (já retiradas de `_doc_rows`)."""
+        for row in sorted(rows, reverse=True):
+            last = len(self._chunks) - 1
+            if row != last:
+                moved = self._chunks[last]
+                self._codes[row] = self._codes[last]
+                if self._vectors is not None:
+                    self._vectors.array[row] = self._vectors.array[last]
+                self._chunks[row] = moved
+                moved_rows = self._doc_rows[moved.document_id]
+                moved_rows.discard(last)
+                moved_rows.add(row)
+            self._chunks.pop()
+        if rows:
+            self._bump_generation()
+
+    def _ensure_capacity(self, needed: int) -> None:
+        capacity = self._codes.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        grown = np.zeros((capacity, self._codes.shape[1]), dtype=self._codes.dtype)
+        grown[: len(self._chunks)] = self._codes[: len(self._chunks)]
+        self._codes = grown
+        if self._vectors is not None:
+            self._vectors.ensure_capacity(capacity)
+
+
+class _VectorFile:
+    """Matriz float32 num arquivo temporário mapeado em memória, lida só na reordenação."""
+
+    def __init__(self, directory: Path, dim: int, capacity: int) -> None:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        # sem nome no diretório: cada processo tem o seu e o arquivo some quando ele termina
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._dim = dim
+        self.array = self._map(capacity)
+
+    def ensure_capacity(self, capacity: int) -> None:
+        if capacity > self.array.shape[0]:
+            # crescer o arquivo preserva o conteúdo; o mapeamento novo o cobre inteiro
+            self.array = self._map(capacity)
+
+    def _map(self, capacity: int) -> np.memmap:
+        self._file.truncate(capacity * self._dim * 4)
+        return np.memmap(self._file, dtype=np.float32, mode="r+", shape=(capacity, self._dim))
+
+
+def _quantize(vectors: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    safe = np.where(scales > 0.0, scales, 1.0)
+    codes: np.ndarray = np.clip(np.rint(vectors / safe), -127, 127).astype(np.int8)
+    return codes
+
+
+def _hamming_top_k(
+    q_codes: np.ndarray, codes: np.ndarray, n: int, k: int, block_rows: int
+) -> np.ndarray:
+    """Para cada consulta, as `k` linhas de `codes[:n]` com menor distância de Hamming."""
+    out = np.empty((len(q_codes), k), dtype=np.int64)
+    for row, qc in enumerate(q_codes):
+        cand_dist: list[np.ndarray] = []
+        cand_idx: list[np.ndarray] = []
+        for start in range(0, n, block_rows):
+            stop = min(start + block_rows, n)
+            dist = np.bitwise_count(codes[start:stop] ^ qc).sum(axis=1, dtype=np.int32)
+            kb = min(k, stop - start)
+            part = np.argpartition(dist, kb - 1)[:kb]
+            cand_dist.append(dist[part])
+            cand_idx.append(part + start)
+        dist = np.concatenate(cand_dist)
+        idx = np.concatenate(cand_idx)
+        if len(idx) > k:
+            idx = idx[np.argpartition(dist, k - 1)[:k]]
+        out[row] = idx
+    return out
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import logging
+import os
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import TypeVar
+
+from domain.services.chunk_source import ChunkSource
+from domain.services.vector_store import Chunk, VectorStore
+from infrastructure.vectorstores.snapshot import SnapshotInfo, Snapshottable
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_ADD_BATCH = 1024  # chunks lidos do iterável antes de distribuir entre os shards
+
+
+def shard_for(document_id: str, shards: int) -> int:
+    """
+    Shard de um documento: blake2b do id módulo `shards`.
+    Estável entre processos e reinícios (ao contrário de `hash()`, que é randomizado).
+    """
+    digest = hashlib.blake2b(document_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+def _by_score(hit: tuple[float, Chunk]) -> float:
+    return -hit[0]
+
+
+class ShardedVectorStore(VectorStore):
+    """
+    Particiona os chunks entre N stores (de qualquer provedor) pelo hash do `document_id`.
+
+    Operações de um documento (`delete_by_document`, `content_hashes`, `delete_chunks`)
+    vão a um único shard. As buscas consultam todos os shards em paralelo num pool de
+    threads (o shard 0 roda na própria thread chamadora) e juntam os top-k de cada um
+    com um merge por heap; cada lista parcial já vem ordenada por score desc.
+
+    O paralelismo real depende de o provedor liberar o GIL na busca (NumPy no `dense`,
+    hnswlib no `chroma`); o `inmemory`, em Python puro, ganha pouco com mais shards.
+    """
+
+    def __init__(self, shards: Sequence[VectorStore], max_workers: int | None = None) -> None:
+        if not shards:
+            raise ValueError("ShardedVectorStore exige ao menos um shard.")
+        self._shards = list(shards)
+        workers = max_workers or len(self._shards)
+        self._pool = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vector-shard")
+            if len(self._shards) > 1
+            else None
+        )
+
+    @property
+    def shards(self) -> list[VectorStore]:
+        return list(self._shards)
+
+    @property
+    def generation(self) -> int:
+        # cada shard é monotônico, então a soma também é
+        return sum(s.generation for s in self._shards)
+
+    def shard_for(self, document_id: str) -> VectorStore:
+        return self._shards[shard_for(document_id, len(self._shards))]
+
+    def add(self, chunks: Iterable[Chunk]) -> int:
+        n = len(self._shards)
+        total = 0
+        it = iter(chunks)
+        while batch := list(islice(it, _ADD_BATCH)):
+            groups: dict[int, list[Chunk]] = {}
+            for c in batch:
+                groups.setdefault(shard_for(c.document_id, n), []).append(c)
+            total += sum(
+                self._fan_out([partial(self._shards[i].add, g) for i, g in groups.items()])
+            )
+        return total
+
+    def similarity_search(self, query: str, top_k: int = 5) -> list[tuple[float, Chunk]]:
+        partials = self._fan_out(
+            [partial(s.similarity_search, query, top_k=top_k) for s in self._shards]
+        )
+        return _merge_top_k(partials, top_k)
+
+    def similarity_search_batch(
+        self, queries: Sequence[str], top_k: int = 5
+    ) -> list[list[tuple[float, Chunk]]]:
+        if not queries:
+            return []
+        per_shard = self._fan_out(
+            [partial(s.similarity_search_batch, queries, top_k=top_k) for s in self._shards]
+        )
+        return [_merge_top_k([r[i] for r in per_shard], top_k) for i in range(len(queries))]
+
+    def delete_by_document(self, document_id: str) -> int:
+        return self.shard_for(document_id).delete_by_document(document_id)
+
+    def content_hashes(self, document_id: str) -> dict[str, str]:
+        return self.shard_for(document_id).content_hashes(document_id)
+
+    def delete_chunks(self, document_id: str, chunk_ids: Iterable[str]) -> int:
+        return self.shard_for(document_id).delete_chunks(document_id, chunk_ids)
+
+    def count(self) -> int:
+        return sum(s.count() for s in self._shards)
+
+    def snapshot(self, path: Path) -> SnapshotInfo:
+        """Um arquivo por shard (`<nome>.<i>-of-<n><sufixo>`); exige shards `Snapshottable`."""
+        return _combine([s.snapshot(p) for s, p in self._snapshot_targets(path)])
+
+    def load(self, path: Path) -> SnapshotInfo:
+        # com outra quantidade de shards os arquivos não existem: FileNotFoundError
+        return _combine([s.load(p) for s, p in self._snapshot_targets(path)])
+
+    def _snapshot_targets(self, path: Path) -> list[tuple[Snapshottable, Path]]:
+        path = Path(path)
+        n = len(self._shards)
+        targets: list[tuple[Snapshottable, Path]] = []
+        for i, shard in enumerate(self._shards):
+            if not isinstance(shard, Snapshottable):
+                raise TypeError(f"{type(shard).__name__} não suporta snapshot")
+            targets.append((shard, path.with_name(f"{path.stem}.{i}-of-{n}{path.suffix}")))
+        return targets
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    def _fan_out(self, tasks: Sequence[Callable[[], T]]) -> list[T]:
+        """Executa as tarefas em paralelo (a primeira na thread atual), na ordem de entrada."""
+        if not tasks:
+            return []
+        if self._pool is None or len(tasks) == 1:
+            return [t() for t in tasks]
+        futures = [self._pool.submit(t) for t in tasks[1:]]
+        first = tasks[0]()
+        return [first, *(f.result() for f in futures)]
+
+
+def _merge_top_k(
+    partials: Sequence[Sequence[tuple[float, Chunk]]], top_k: int
+) -> list[tuple[float, Chunk]]:
+    return list(islice(heapq.merge(*partials, key=_by_score), top_k))
+
+
+def _combine(infos: Sequence[SnapshotInfo]) -> SnapshotInfo:
+    return SnapshotInfo(
+        created_at=min(i.created_at for i in infos),
+        chunks=sum(i.chunks for i in infos),
+        document_ids=frozenset().union(*(i.document_ids for i in infos)),
+    )
+
+
+# ----------------------------------------------------------------------------------------
+# Rebalanceamento
+# ----------------------------------------------------------------------------------------
+
+
+def read_shard_layout(path: Path) -> int | None:
+    """Quantidade de shards gravada em `path` (None se ausente ou ilegível)."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return int(data["shards"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_shard_layout(path: Path, shards: int) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"shards": shards}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def rebalance_shards(
+    shard_factory: Callable[[int], VectorStore],
+    old_count: int,
+    new_count: int,
+    document_ids: Iterable[str],
+    source: ChunkSource,
+) -> int:
+    """
+    Move entre shards os documentos cujo shard muda de `old_count` para `new_count`:
+    reindexa no novo a partir da `source` (os chunks em disco são a fonte de verdade) e
+    só então remove do antigo. Se a execução for interrompida entre os dois passos, o
+    documento fica duplicado (nunca perdido) e a próxima execução conclui a remoção.
+    Usado por provedores persistentes quando `VECTOR_STORE_SHARDS` muda entre execuções.
+    Retorna a quantidade de documentos movidos.
+
+    `shard_factory(i)` abre o shard `i`; shards acima de `new_count` ficam vazios ao fim.
+    """
+    opened: dict[int, VectorStore] = {}
+
+    def shard(i: int) -> VectorStore:
+        if i not in opened:
+            opened[i] = shard_factory(i)
+        return opened[i]
+
+    moved = 0
+    for doc_id in document_ids:
+        old, new = shard_for(doc_id, old_count), shard_for(doc_id, new_count)
+        if old == new:
+            continue
+        in_old = bool(shard(old).content_hashes(doc_id))
+        if not in_old:
+            continue  # documento não indexado, ou já movido numa execução anterior
+        if not shard(new).content_hashes(doc_id):
+            shard(new).add(source.iter_chunks(doc_id))
+        shard(old).delete_by_document(doc_id)
+        moved += 1
+
+    for i in range(new_count, old_count):
+        leftover = shard(i).count()
+        if leftover:
+            logger.warning(
+                "Shard %d ainda tem %d chunks sem documento no catálogo; não foram movidos.",
+                i,
+                leftover,
+            )
+    return moved
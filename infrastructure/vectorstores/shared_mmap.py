@@ -0,0 +1,407 @@
+"""
+Índice vetorial em disco, mapeado em memória e compartilhado entre processos.
+
+Layout de `index_dir`:
+
+    CURRENT                     nome do manifesto publicado (troca atômica via os.replace)
+    manifest-<geração>.json     segmentos vigentes e, por segmento, as linhas removidas
+    seg-<id>.vectors.npy        matriz float32 (linhas, dim), L2-normalizada
+    seg-<id>.offsets.npy        int64 (linhas + 1): início de cada registro no blob
+    seg-<id>.blob               registros JSON concatenados (document_id, chunk_id, ...)
+    seg-<id>.docs.json          {document_id: [linhas]}, usado por remoções/reindex
+    LOCK                        flock dos escritores
+
+Segmentos são imutáveis: escritas criam segmentos novos e remoções só gravam
+tombstones no próximo manifesto. Leitores abrem os arquivos com mmap somente leitura
+(as páginas ficam no page cache, uma cópia para todos os workers) e, a cada operação,
+comparam CURRENT com o último manifesto visto; numa geração nova, releem só o
+manifesto e mapeiam apenas os segmentos que ainda não conheciam.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import mmap
+import os
+import threading
+import uuid
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from domain.services.vector_store import Chunk, VectorStore
+from infrastructure.concurrency.file_lock import exclusive_file_lock
+from infrastructure.embeddings.base import Embedder, EmbedderVersionMismatchError
+from infrastructure.embeddings.hashing import HashingEmbedder
+from infrastructure.vectorstores.dense import _batched, _batched_top_k
+
+logger = logging.getLogger(__name__)
+
+_FORMAT = 1
+_CURRENT = "CURRENT"
+_KEEP_MANIFESTS = 2  # o anterior continua legível para quem ainda não trocou de geração
+_OPEN_RETRIES = 3
+
+Manifest = dict[str, Any]
+
+
+class _SegmentFiles:
+    """Arquivos de um segmento mapeados em memória (somente leitura)."""
+
+    def __init__(self, index_dir: Path, name: str) -> None:
+        self.name = name
+        self.vectors: np.ndarray = np.load(index_dir / f"{name}.vectors.npy", mmap_mode="r")
+        self.offsets: np.ndarray = np.load(index_dir / f"{name}.offsets.npy", mmap_mode="r")
+        with (index_dir / f"{name}.blob").open("rb") as f:
+            self._blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._docs_path = index_dir / f"{name}.docs.json"
+        self._docs: dict[str, list[int]] | None = None
+
+    @property
+    def rows(self) -> int:
+        return int(self.vectors.shape[0])
+
+    def record(self, row: int) -> bytes:
+        return self._blob[int(self.offsets[row]) : int(self.offsets[row + 1])]
+
+    def chunk(self, row: int) -> Chunk:
+        data = json.loads(self.record(row))
+        return Chunk(
+            document_id=data["document_id"],
+            content=data["content"],
+            chunk_id=data.get("chunk_id"),
+            metadata=data.get("metadata") or {},
+        )
+
+    def doc_rows(self, document_id: str) -> list[int]:
+        if self._docs is None:
+            self._docs = json.loads(self._docs_path.read_text(encoding="utf-8"))
+        return self._docs.get(document_id, [])
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    generation: int
+    segments: tuple[tuple[_SegmentFiles, frozenset[int]], ...] = ()
+
+    def live_rows(self) -> int:
+        return sum(seg.rows - len(deleted) for seg, deleted in self.segments)
+
+
+class SharedMmapVectorStore(VectorStore):
+    """
+    VectorStore denso persistido em segmentos imutáveis e lido via mmap.
+
+    Vários processos podem abrir o mesmo diretório: as buscas leem o snapshot da
+    geração publicada sem lock algum, e as escritas (de qualquer processo) são
+    serializadas por um `flock` em `LOCK`, partindo sempre do manifesto mais recente.
+    `generation` é a geração publicada, então caches de consulta de todos os workers
+    são invalidados por escritas feitas em qualquer um deles.
+
+    Segmentos com metade ou mais das linhas removidas são reescritos, e, acima de
+    `max_segments`, todos são fundidos num só.
+    """
+
+    def __init__(
+        self,
+        index_dir: str | Path,
+        embedder: Embedder | None = None,
+        max_segments: int = 16,
+        segment_rows: int = 65_536,
+        embed_batch_size: int = 1024,
+        search_block_rows: int = 65_536,
+    ) -> None:
+        self._dir = Path(index_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._embedder: Embedder = embedder or HashingEmbedder()
+        self._dim = int(self._embedder.dim)
+        self._max_segments = max(1, int(max_segments))
+        self._segment_rows = max(1, int(segment_rows))
+        self._embed_batch_size = max(1, int(embed_batch_size))
+        self._search_block_rows = max(1, int(search_block_rows))
+        self._lock = threading.Lock()
+        self._files: dict[str, _SegmentFiles] = {}
+        self._snap = _Snapshot(generation=0)
+        self._snap_name: str | None = None
+        self._check_embedder(self._read_manifest())
+
+    # ------------------------------------------------------------------ leitura
+
+    @property
+    def generation(self) -> int:
+        return self._snapshot().generation
+
+    def similarity_search(self, query: str, top_k: int = 5) -> list[tuple[float, Chunk]]:
+        return self.similarity_search_batch([query], top_k=top_k)[0]
+
+    def similarity_search_batch(
+        self, queries: Sequence[str], top_k: int = 5
+    ) -> list[list[tuple[float, Chunk]]]:
+        results: list[list[tuple[float, Chunk]]] = [[] for _ in queries]
+        live = [i for i, q in enumerate(queries) if q.strip()]
+        snap = self._snapshot()
+        if not live or top_k <= 0 or snap.live_rows() == 0:
+            return results
+        q = self._embedder.embed([queries[i] for i in live])
+
+        # candidatos por consulta: (score, segmento, linha)
+        candidates: list[list[tuple[float, int, int]]] = [[] for _ in live]
+        for si, (seg, deleted) in enumerate(snap.segments):
+            n = seg.rows
+            if n == len(deleted):
+                continue
+            # pede k + tombstones: mesmo se todos os removidos estiverem no topo, sobram k
+            k = min(n, top_k + len(deleted))
+            scores, idx = _batched_top_k(q, seg.vectors, n, k, self._search_block_rows)
+            for row in range(len(live)):
+                kept = 0
+                for s, i in zip(scores[row], idx[row], strict=True):
+                    if kept == top_k or s <= 0.0:
+                        break
+                    if int(i) in deleted:
+                        continue
+                    candidates[row].append((float(s), si, int(i)))
+                    kept += 1
+
+        for row, qi in enumerate(live):
+            best = heapq.nlargest(top_k, candidates[row], key=lambda c: c[0])
+            results[qi] = [(s, snap.segments[si][0].chunk(i)) for s, si, i in best]
+        return results
+
+    def content_hashes(self, document_id: str) -> dict[str, str]:
+        hashes: dict[str, str] = {}
+        for seg, deleted in self._snapshot().segments:
+            for row in seg.doc_rows(document_id):
+                if row in deleted:
+                    continue
+                ch = seg.chunk(row)
+                if ch.chunk_id is not None:
+                    hashes[ch.chunk_id] = ch.content_hash()
+        return hashes
+
+    def count(self) -> int:
+        return self._snapshot().live_rows()
+
+    # ------------------------------------------------------------------ escrita
+
+    def add(self, chunks: Iterable[Chunk]) -> int:
+        with exclusive_file_lock(self._dir / "LOCK"):
+            manifest = self._read_manifest()
+            self._check_embedder(manifest)
+            entries: list[dict[str, Any]] = list(manifest["segments"])
+            vectors: list[np.ndarray] = []
+            records: list[Chunk] = []
+            count = 0
+            for batch in _batched(chunks, self._embed_batch_size):
+                vectors.append(self._embedder.embed([ch.content for ch in batch]))
+                records.extend(batch)
+                count += len(batch)
+                if len(records) >= self._segment_rows:
+                    entries.append(self._write_segment(np.concatenate(vectors), records))
+                    vectors, records = [], []
+            if records:
+                entries.append(self._write_segment(np.concatenate(vectors), records))
+            if count:
+                self._publish(manifest, entries)
+        return count
+
+    def delete_by_document(self, document_id: str) -> int:
+        return self._tombstone(document_id, None)
+
+    def delete_chunks(self, document_id: str, chunk_ids: Iterable[str]) -> int:
+        targets = set(chunk_ids)
+        return self._tombstone(document_id, targets) if targets else 0
+
+    def _tombstone(self, document_id: str, chunk_ids: set[str] | None) -> int:
+        with exclusive_file_lock(self._dir / "LOCK"):
+            manifest = self._read_manifest()
+            entries: list[dict[str, Any]] = []
+            removed = 0
+            for entry in manifest["segments"]:
+                seg = self._segment(entry["name"])
+                deleted = set(entry["deleted"])
+                rows = [r for r in seg.doc_rows(document_id) if r not in deleted]
+                if chunk_ids is not None:
+                    rows = [r for r in rows if seg.chunk(r).chunk_id in chunk_ids]
+                if rows:
+                    removed += len(rows)
+                    entry = {**entry, "deleted": sorted(deleted.union(rows))}
+                entries.append(entry)
+            if removed:
+                self._publish(manifest, entries)
+            return removed
+
+    def _publish(self, manifest: Manifest, entries: list[dict[str, Any]]) -> None:
+        """Compacta se preciso, grava o manifesto da próxima geração e troca CURRENT."""
+        entries = self._compact(entries)
+        generation = int(manifest["generation"]) + 1
+        name = f"manifest-{generation:012d}.json"
+        new_manifest = {
+            "format": _FORMAT,
+            "generation": generation,
+            "dim": self._dim,
+            "embedder": self._embedder.version,
+            "segments": entries,
+        }
+        _write_atomic(self._dir / name, json.dumps(new_manifest).encode("utf-8"))
+        _write_atomic(self._dir / _CURRENT, name.encode("ascii"))
+        self._collect_garbage()
+
+    def _compact(self, entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        keep: list[dict[str, Any]] = []
+        rewrite: list[dict[str, Any]] = []
+        for entry in entries:
+            sparse = 2 * len(entry["deleted"]) >= entry["rows"]
+            (rewrite if sparse else keep).append(entry)
+        if len(keep) + min(len(rewrite), 1) > self._max_segments:
+            rewrite, keep = rewrite + keep, []
+        if not rewrite:
+            return entries
+
+        vectors: list[np.ndarray] = []
+        chunks: list[Chunk] = []
+        for entry in rewrite:
+            seg = self._segment(entry["name"])
+            live = np.setdiff1d(np.arange(seg.rows), np.asarray(entry["deleted"], dtype=np.int64))
+            vectors.append(np.asarray(seg.vectors[live]))
+            chunks.extend(seg.chunk(int(r)) for r in live)
+        if chunks:
+            keep.append(self._write_segment(np.concatenate(vectors), chunks))
+        logger.info("Índice compartilhado: %d segmentos compactados", len(rewrite))
+        return keep
+
+    def _write_segment(self, vectors: np.ndarray, chunks: Sequence[Chunk]) -> dict[str, Any]:
+        name = f"seg-{uuid.uuid4().hex[:16]}"
+        records = [
+            json.dumps(
+                {
+                    "document_id": ch.document_id,
+                    "chunk_id": ch.chunk_id,
+                    "content": ch.content,
+                    "metadata": ch.metadata,
+                },
+                ensure_ascii=False,
+                default=str,
+            ).encode("utf-8")
+            for ch in chunks
+        ]
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum([len(r) for r in records], out=offsets[1:])
+        docs: dict[str, list[int]] = {}
+        for row, ch in enumerate(chunks):
+            docs.setdefault(ch.document_id, []).append(row)
+
+        _save_npy(self._dir / f"{name}.vectors.npy", np.asarray(vectors, dtype=np.float32))
+        _save_npy(self._dir / f"{name}.offsets.npy", offsets)
+        _write_atomic(self._dir / f"{name}.blob", b"".join(records))
+        _write_atomic(self._dir / f"{name}.docs.json", json.dumps(docs).encode("utf-8"))
+        return {"name": name, "rows": len(records), "deleted": []}
+
+    def _collect_garbage(self) -> None:
+        """Remove manifestos antigos e segmentos que nenhum manifesto mantido referencia."""
+        manifests = sorted(self._dir.glob("manifest-*.json"))
+        for old in manifests[:-_KEEP_MANIFESTS]:
+            _unlink_if_unused(old)
+        referenced: set[str] = set()
+        for path in manifests[-_KEEP_MANIFESTS:]:
+            referenced.update(e["name"] for e in json.loads(path.read_text())["segments"])
+        # no POSIX, leitores que ainda mapeiam um segmento removido seguem lendo; no
+        # Windows o arquivo mapeado não pode ser removido e fica para a próxima coleta
+        for path in self._dir.glob("seg-*"):
+            if path.name.split(".", 1)[0] not in referenced:
+                _unlink_if_unused(path)
+
+    # ------------------------------------------------------------------ estado
+
+    def _current_name(self) -> str | None:
+        try:
+            return (self._dir / _CURRENT).read_text(encoding="ascii").strip()
+        except FileNotFoundError:
+            return None
+
+    def _read_manifest(self) -> Manifest:
+        return self._load_manifest()[1]
+
+    def _load_manifest(self) -> tuple[str | None, Manifest]:
+        for attempt in range(_OPEN_RETRIES):
+            name = self._current_name()
+            if name is None:
+                return None, {"generation": 0, "segments": []}
+            try:
+                return name, json.loads((self._dir / name).read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                # CURRENT trocou e o manifesto lido já foi coletado: relê
+                if attempt == _OPEN_RETRIES - 1:
+                    raise
+        raise AssertionError("unreachable")
+
+    def _check_embedder(self, manifest: Manifest) -> None:
+        stored = manifest.get("embedder")
+        if stored is None or stored == self._embedder.version:
+            return
+        if any(e["rows"] > len(e["deleted"]) for e in manifest["segments"]):
+            raise EmbedderVersionMismatchError(
+                f"Índice em {self._dir} foi gerado com o embedder '{stored}', mas o atual é "
+                f"'{self._embedder.version}'. Remova o diretório e reindexe os documentos."
+            )
+
+    def _segment(self, name: str) -> _SegmentFiles:
+        seg = self._files.get(name)
+        if seg is None:
+            seg = self._files[name] = _SegmentFiles(self._dir, name)
+        return seg
+
+    def _snapshot(self) -> _Snapshot:
+        """Snapshot da geração publicada; só relê o manifesto se CURRENT mudou."""
+        # ler CURRENT (alguns bytes) a cada operação é barato perto de uma busca e, ao
+        # contrário de comparar stat, não depende da resolução de mtime nem de inodes
+        if self._current_name() == self._snap_name:
+            return self._snap
+        with self._lock:
+            for attempt in range(_OPEN_RETRIES):
+                name, manifest = self._load_manifest()
+                if name == self._snap_name:
+                    return self._snap
+                try:
+                    segments = tuple(
+                        (self._segment(e["name"]), frozenset(e["deleted"]))
+                        for e in manifest["segments"]
+                    )
+                    break
+                except FileNotFoundError:
+                    # segmento coletado por uma geração mais nova: recomeça por ela
+                    if attempt == _OPEN_RETRIES - 1:
+                        raise
+            names = {seg.name for seg, _ in segments}
+            self._files = {n: s for n, s in self._files.items() if n in names}
+            self._snap = _Snapshot(generation=int(manifest["generation"]), segments=segments)
+            self._snap_name = name
+            return self._snap
+
+
+def _unlink_if_unused(path: Path) -> None:
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as e:  # ainda aberto/mapeado por algum processo (Windows)
+        logger.debug("Índice compartilhado: %s em uso, removido numa próxima coleta (%s)", path, e)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    with tmp.open("wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _save_npy(path: Path, array: np.ndarray) -> None:
+    with path.open("wb") as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
@@ -0,0 +1,190 @@
+"""
+Snapshot binário dos stores em memória (`inmemory`, `dense`).
+
+Formato (inteiros little-endian):
+
+    magic       8 bytes  b"RAGSNAP\\0"
+    versão      u16
+    meta_len    u32, seguido de `meta` (JSON: kind, created_at, chunks, ...)
+    payload_len u64
+    sha256      32 bytes de meta + payload
+    payload     seções, cada uma com u64 de tamanho + bytes
+
+Os chunks ocupam seis seções colunares (ids de documento, índice do documento por
+chunk, chunk_ids, offsets do conteúdo, conteúdo concatenado em UTF-8 e metadata),
+de modo que a carga é uma leitura única do arquivo, uma decodificação do texto e
+fatias por offset, sem um parse de JSON por chunk. A escrita vai para um arquivo
+temporário no mesmo diretório e é publicada com `os.replace`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import time
+import uuid
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+import numpy as np
+
+from domain.services.vector_store import Chunk
+
+MAGIC = b"RAGSNAP\0"
+FORMAT_VERSION = 1
+
+_PREFIX = struct.Struct("<8sHI")
+_U64 = struct.Struct("<Q")
+
+
+class SnapshotError(ValueError):
+    """Snapshot corrompido, de outra versão do formato ou incompatível com o store."""
+
+
+@dataclass(frozen=True)
+class SnapshotInfo:
+    created_at: float  # instante (epoch) em que o conteúdo foi capturado
+    chunks: int
+    document_ids: frozenset[str]
+
+
+@runtime_checkable
+class Snapshottable(Protocol):
+    """Stores que sabem gravar e recarregar seu conteúdo completo."""
+
+    def snapshot(self, path: Path) -> SnapshotInfo: ...
+
+    def load(self, path: Path) -> SnapshotInfo: ...
+
+
+def write_snapshot(path: Path, kind: str, meta: dict[str, Any], sections: Sequence[bytes]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta_bytes = json.dumps({**meta, "kind": kind}, ensure_ascii=False).encode("utf-8")
+    digest = hashlib.sha256(meta_bytes)
+    payload_len = 0
+    for section in sections:
+        digest.update(_U64.pack(len(section)))
+        digest.update(section)
+        payload_len += _U64.size + len(section)
+
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(meta_bytes)))
+            f.write(meta_bytes)
+            f.write(_U64.pack(payload_len))
+            f.write(digest.digest())
+            for section in sections:
+                f.write(_U64.pack(len(section)))
+                f.write(section)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def read_snapshot(path: Path, kind: str) -> tuple[dict[str, Any], list[memoryview]]:
+    """Lê o arquivo inteiro de uma vez, valida cabeçalho e checksum e separa as seções."""
+    data = memoryview(Path(path).read_bytes())
+    if len(data) < _PREFIX.size:
+        raise SnapshotError(f"{path}: arquivo truncado")
+    magic, version, meta_len = _PREFIX.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path}: não é um snapshot")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"{path}: versão de formato {version} (esperada {FORMAT_VERSION})")
+    pos = _PREFIX.size
+    meta_bytes = data[pos : pos + meta_len]
+    pos += meta_len
+    if len(data) < pos + _U64.size + 32:
+        raise SnapshotError(f"{path}: arquivo truncado")
+    (payload_len,) = _U64.unpack_from(data, pos)
+    pos += _U64.size
+    expected = bytes(data[pos : pos + 32])
+    pos += 32
+    payload = data[pos:]
+    if len(payload) != payload_len:
+        raise SnapshotError(f"{path}: arquivo truncado")
+    digest = hashlib.sha256(meta_bytes)
+    digest.update(payload)
+    if digest.digest() != expected:
+        raise SnapshotError(f"{path}: checksum não confere")
+
+    meta: dict[str, Any] = json.loads(bytes(meta_bytes))
+    if meta.get("kind") != kind:
+        raise SnapshotError(f"{path}: snapshot de '{meta.get('kind')}', não de '{kind}'")
+    return meta, list(_split_sections(payload))
+
+
+def _split_sections(payload: memoryview) -> Iterator[memoryview]:
+    pos = 0
+    while pos < len(payload):
+        (size,) = _U64.unpack_from(payload, pos)
+        pos += _U64.size
+        yield payload[pos : pos + size]
+        pos += size
+
+
+def snapshot_meta(chunks: int) -> dict[str, Any]:
+    return {"created_at": time.time(), "chunks": chunks}
+
+
+def info_from(meta: dict[str, Any], document_ids: Sequence[str]) -> SnapshotInfo:
+    return SnapshotInfo(
+        created_at=float(meta["created_at"]),
+        chunks=int(meta["chunks"]),
+        document_ids=frozenset(document_ids),
+    )
+
+
+CHUNK_SECTIONS = 6
+
+
+def encode_chunks(chunks: Sequence[Chunk]) -> list[bytes]:
+    n = len(chunks)
+    doc_index: dict[str, int] = {}
+    doc_idx = np.fromiter(
+        (doc_index.setdefault(c.document_id, len(doc_index)) for c in chunks),
+        dtype=np.int32,
+        count=n,
+    )
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(
+        np.fromiter((len(c.content) for c in chunks), dtype=np.int64, count=n), out=offsets[1:]
+    )
+    return [
+        json.dumps(list(doc_index), ensure_ascii=False).encode("utf-8"),
+        doc_idx.tobytes(),
+        json.dumps([c.chunk_id for c in chunks], ensure_ascii=False).encode("utf-8"),
+        offsets.tobytes(),  # em caracteres: o texto é decodificado uma vez e fatiado
+        "".join(c.content for c in chunks).encode("utf-8"),
+        json.dumps([c.metadata for c in chunks], ensure_ascii=False, default=str).encode("utf-8"),
+    ]
+
+
+def decode_chunks(sections: Sequence[memoryview]) -> tuple[list[Chunk], list[str]]:
+    """Inverso de `encode_chunks`; devolve os chunks e os ids de documento distintos."""
+    if len(sections) != CHUNK_SECTIONS:
+        raise SnapshotError(f"esperadas {CHUNK_SECTIONS} seções de chunks, lidas {len(sections)}")
+    doc_ids: list[str] = json.loads(bytes(sections[0]))
+    doc_idx = np.frombuffer(sections[1], dtype=np.int32).tolist()
+    chunk_ids: list[str | None] = json.loads(bytes(sections[2]))
+    offsets = np.frombuffer(sections[3], dtype=np.int64).tolist()
+    text = bytes(sections[4]).decode("utf-8")
+    metadata: list[dict[str, Any]] = json.loads(bytes(sections[5]))
+    chunks = [
+        Chunk(
+            document_id=doc_ids[doc_idx[i]],
+            content=text[offsets[i] : offsets[i + 1]],
+            chunk_id=chunk_ids[i],
+            metadata=metadata[i],
+        )
+        for i in range(len(chunk_ids))
+    ]
+    return chunks, doc_ids
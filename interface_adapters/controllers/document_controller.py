@@ -3,29 +3,50 @@ from __future__ import annotations
 from pathlib import Path
 
 from use_cases.get_document import GetDocument, GetDocumentOutput
+from use_cases.get_document_chunks import GetDocumentChunks, GetDocumentChunksOutput
 from use_cases.ingest_document import IngestDocument, IngestDocumentInput, IngestDocumentOutput
 from use_cases.list_documents import ListDocuments, ListDocumentsOutput
 
 
 class DocumentController:
     def __init__(
-        self, ingest_uc: IngestDocument, list_uc: ListDocuments, get_uc: GetDocument
+        self,
+        ingest_uc: IngestDocument,
+        list_uc: ListDocuments,
+        get_uc: GetDocument,
+        chunks_uc: GetDocumentChunks,
     ) -> None:
         self.ingest_uc = ingest_uc
         self.list_uc = list_uc
         self.get_uc = get_uc
+        self.chunks_uc = chunks_uc
 
     def ingest(
-        self, tmp_file: Path, original_filename: str, content_type: str
+        self,
+        tmp_file: Path,
+        original_filename: str,
+        content_type: str,
+        sha256: str | None = None,
     ) -> IngestDocumentOutput:
         return self.ingest_uc.execute(
             IngestDocumentInput(
-                tmp_file=tmp_file, original_filename=original_filename, content_type=content_type
+                tmp_file=tmp_file,
+                original_filename=original_filename,
+                content_type=content_type,
+                sha256=sha256,
             )
         )
 
-    def list(self) -> ListDocumentsOutput:
-        return self.list_uc.execute()
+    def list(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        original_filename: str | None = None,
+    ) -> ListDocumentsOutput:
+        return self.list_uc.execute(limit, cursor, original_filename)
 
     def get(self, doc_id: str) -> GetDocumentOutput | None:
         return self.get_uc.execute(doc_id)
+
+    def chunks(self, doc_id: str, offset: int, limit: int) -> GetDocumentChunksOutput | None:
+        return self.chunks_uc.execute(doc_id, offset=offset, limit=limit)
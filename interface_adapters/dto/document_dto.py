@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any
 
 from pydantic import BaseModel
 
@@ -13,6 +14,7 @@ class DocumentMetaDTO(BaseModel):
     pages: int
     created_at: datetime
     content_type: str = "application/pdf"
+    sha256: str | None = None
 
 
 class DocumentListItemDTO(BaseModel):
@@ -28,3 +30,17 @@ class DocumentDetailDTO(BaseModel):
     text_path: str
     chunks_path: str
     chunk_count: int
+    deduplicated: bool = False
+
+
+class DocumentChunkDTO(BaseModel):
+    index: int
+    content: str
+    metadata: dict[str, Any] = {}
+
+
+class DocumentChunksDTO(BaseModel):
+    document_id: str
+    offset: int
+    total: int
+    items: list[DocumentChunkDTO]
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class IndexLoadDTO(BaseModel):
+    state: str  # pending | loading | ready | failed | cancelled
+    ready: bool
+    phase: str | None = None
+    documents_total: int = 0
+    documents_done: int = 0
+    chunks_indexed: int = 0
+    snapshot_chunks: int = 0
+    elapsed_seconds: float = 0.0
+    error: str | None = None
+
+
+class HealthDTO(BaseModel):
+    status: str
+    name: str
+    version: str
+    index: IndexLoadDTO
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class IngestionJobDTO(BaseModel):
+    id: str
+    state: str
+    original_filename: str
+    submitted_at: datetime
+    finished_at: datetime | None = None
+    document_id: str | None = None
+    chunk_count: int | None = None
+    indexed: int | None = None
+    deduplicated: bool = False
+    error: str | None = None
+    timings: dict[str, float] = {}
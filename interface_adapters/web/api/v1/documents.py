@@ -1,77 +1,132 @@
 from __future__ import annotations
 
-import json
-from datetime import datetime, timezone
+import hashlib
+import time
+import uuid
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Annotated
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, File, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 
 from app.container import Container
-from domain.services.vector_store import Chunk as VSChunk
+from app.core.config import settings
+from domain.repositories.document_repository import InvalidCursorError
+from infrastructure.chunk_sources.filesystem_jsonl import FilesystemJsonlChunkSource
+from infrastructure.jobs.ingestion_queue import QueueFullError
 from interface_adapters.controllers.document_controller import DocumentController
 from interface_adapters.dto.document_dto import (
+    DocumentChunkDTO,
+    DocumentChunksDTO,
     DocumentDetailDTO,
     DocumentListItemDTO,
     DocumentMetaDTO,
 )
+from interface_adapters.dto.job_dto import IngestionJobDTO
+from interface_adapters.web.api.v1.jobs import to_job_dto
+from interface_adapters.web.profiling import run_sync
 from use_cases.get_document import GetDocument
-from use_cases.ingest_document import IngestDocument
+from use_cases.get_document_chunks import GetDocumentChunks
+from use_cases.index_document_chunks import IndexDocumentChunks
+from use_cases.ingest_document import IngestDocument, IngestDocumentInput
 from use_cases.list_documents import ListDocuments
 
 
 def get_router(container: Container) -> APIRouter:
     router = APIRouter(tags=["documents"])
 
+    index_uc = __build_index_uc(container)
     controller = DocumentController(
         ingest_uc=__build_ingest_uc(container),
         list_uc=__build_list_uc(container),
         get_uc=__build_get_uc(container),
+        chunks_uc=__build_chunks_uc(container),
     )
 
     @router.post(
-        "/documents", response_model=DocumentDetailDTO, status_code=status.HTTP_201_CREATED
+        "/documents",
+        response_model=DocumentDetailDTO,
+        status_code=status.HTTP_201_CREATED,
+        responses={
+            status.HTTP_200_OK: {
+                "model": DocumentDetailDTO,
+                "description": "Conteúdo já ingerido (DEDUPE_UPLOADS=1).",
+            },
+            status.HTTP_202_ACCEPTED: {"model": IngestionJobDTO},
+            status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Fila de ingestão cheia."},
+        },
     )
-    async def upload_document(file: Annotated[UploadFile, File(...)]) -> DocumentDetailDTO:
+    async def upload_document(
+        request: Request, file: Annotated[UploadFile, File(...)]
+    ) -> DocumentDetailDTO | JSONResponse:
         if not file.filename or not file.filename.lower().endswith(".pdf"):
             raise HTTPException(status_code=400, detail="Apenas arquivos PDF são aceitos.")
 
-        # salva upload temporário (no diretório RAW do repo)
-        tmp_name = f"tmp__{datetime.now(timezone.utc).timestamp()}"
-        tmp = container.document_repository.paths["RAW_DIR"] / tmp_name
-        with tmp.open("wb") as f:
-            f.write(await file.read())
+        max_bytes = settings.UPLOAD_MAX_BYTES
+        declared = request.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > max_bytes + _MULTIPART_SLACK:
+            raise _too_large(max_bytes)
 
-        # 1) Ingest (usa o caso de uso existente: salva raw/text/chunks/meta)
-        result = controller.ingest(
-            tmp_file=tmp,
-            original_filename=file.filename or "unknown.pdf",
-            content_type=file.content_type or "application/pdf",
+        # grava o upload em blocos no diretório RAW (memória limitada a um bloco)
+        upload = await _spool_upload(
+            file,
+            container.document_repository.paths["RAW_DIR"],
+            max_bytes=max_bytes,
+            chunk_bytes=settings.UPLOAD_CHUNK_BYTES,
         )
 
-        # 2) Indexar no Vector Store a partir do arquivo .chunks.jsonl
-        try:
-            chunks_path = Path(result.chunks_path)
-            vs_chunks: list[VSChunk] = []
-            with chunks_path.open("r", encoding="utf-8") as f:
-                for i, line in enumerate(f):
-                    data = json.loads(line)
-                    content = (data.get("content") or "").strip()
-                    if not content:
-                        continue
-                    chunk_meta = {k: v for k, v in data.items() if k != "content"}
-                    vs_chunks.append(
-                        VSChunk(
-                            document_id=result.document.id,
-                            content=content,
-                            chunk_id=f"{result.document.id}:{i}",
-                            metadata=chunk_meta,
-                        )
+        original_filename = file.filename or "unknown.pdf"
+        content_type = file.content_type or "application/pdf"
+
+        # Modo assíncrono: enfileira e responde 202 com o job
+        jobs = container.ingestion_jobs
+        if jobs is not None:
+            try:
+                job = jobs.submit(
+                    IngestDocumentInput(
+                        tmp_file=upload.path,
+                        original_filename=original_filename,
+                        content_type=content_type,
+                        sha256=upload.sha256,
                     )
-            if vs_chunks:
-                container.vector_store.add(vs_chunks)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Falha ao indexar chunks: {e}") from e
+                )
+            except QueueFullError as e:
+                upload.path.unlink(missing_ok=True)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e)
+                ) from e
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content=jsonable_encoder(to_job_dto(job)),
+                headers={"Location": f"{request.url_for('get_job', job_id=job.id).path}"},
+            )
+
+        # 1) Ingest (usa o caso de uso existente: salva raw/text/chunks/meta),
+        #    fora do event loop para não bloquear as demais requisições
+        result = await run_sync(
+            controller.ingest,
+            tmp_file=upload.path,
+            original_filename=original_filename,
+            content_type=content_type,
+            sha256=upload.sha256,
+        )
+
+        metrics = container.metrics
+        if metrics is not None:
+            metrics.observe_ingest(result.timings, deduplicated=result.deduplicated)
+
+        # 2) Indexar no Vector Store a partir do arquivo .chunks.jsonl
+        #    (documento deduplicado já está indexado)
+        if not result.deduplicated:
+            t0 = time.perf_counter()
+            try:
+                indexed = await index_uc.aexecute(result.document.id)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Falha ao indexar chunks: {e}") from e
+            if metrics is not None:
+                metrics.observe_index(time.perf_counter() - t0, added=indexed.added)
 
         # 3) Resposta compatível com os testes e com o contrato atual
         meta: DocumentMetaDTO = DocumentMetaDTO(
@@ -82,17 +137,33 @@ def get_router(container: Container) -> APIRouter:
             pages=result.document.pages,
             created_at=result.document.created_at,
             content_type=result.document.content_type,
+            sha256=result.document.sha256,
         )
-        return DocumentDetailDTO(
+        detail = DocumentDetailDTO(
             meta=meta,
             text_path=result.text_path,
             chunks_path=result.chunks_path,
             chunk_count=result.chunk_count,
+            deduplicated=result.deduplicated,
         )
+        if result.deduplicated:
+            return JSONResponse(status_code=status.HTTP_200_OK, content=jsonable_encoder(detail))
+        return detail
 
     @router.get("/documents", response_model=list[DocumentListItemDTO])
-    def list_documents() -> list[DocumentListItemDTO]:
-        result = controller.list()
+    def list_documents(
+        response: Response,
+        limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+        cursor: str | None = None,
+        filename: Annotated[str | None, Query(description="Nome original exato.")] = None,
+    ) -> list[DocumentListItemDTO]:
+        # mais recentes primeiro; a próxima página vem no cabeçalho X-Next-Cursor
+        try:
+            result = controller.list(limit=limit, cursor=cursor, original_filename=filename)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        if result.next_cursor is not None:
+            response.headers["X-Next-Cursor"] = result.next_cursor
         return [
             DocumentListItemDTO(
                 id=d.id,
@@ -117,6 +188,7 @@ def get_router(container: Container) -> APIRouter:
             pages=result.document.pages,
             created_at=result.document.created_at,
             content_type=result.document.content_type,
+            sha256=result.document.sha256,
         )
         return DocumentDetailDTO(
             meta=meta,
@@ -125,20 +197,93 @@ def get_router(container: Container) -> APIRouter:
             chunk_count=result.chunk_count,
         )
 
+    @router.get("/documents/{doc_id}/chunks", response_model=DocumentChunksDTO)
+    def list_document_chunks(
+        doc_id: str,
+        offset: Annotated[int, Query(ge=0)] = 0,
+        limit: Annotated[int, Query(ge=1, le=500)] = 50,
+    ) -> DocumentChunksDTO:
+        result = controller.chunks(doc_id, offset=offset, limit=limit)
+        if not result:
+            raise HTTPException(status_code=404, detail="Documento não encontrado.")
+        return DocumentChunksDTO(
+            document_id=result.document_id,
+            offset=result.offset,
+            total=result.total,
+            items=[
+                DocumentChunkDTO(index=c.index, content=c.content, metadata=c.metadata)
+                for c in result.chunks
+            ],
+        )
+
     return router
 
 
+# margem para os cabeçalhos/limites do multipart ao comparar com Content-Length
+_MULTIPART_SLACK = 64 * 1024
+
+
+@dataclass(frozen=True)
+class _SpooledUpload:
+    path: Path
+    size_bytes: int
+    sha256: str
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Arquivo excede o limite de {max_bytes} bytes.",
+    )
+
+
+async def _spool_upload(
+    file: UploadFile, dest_dir: Path, max_bytes: int, chunk_bytes: int
+) -> _SpooledUpload:
+    """
+    Copia o upload para um arquivo temporário único em `dest_dir`, bloco a bloco,
+    calculando SHA-256 e tamanho incrementalmente. Aborta com 413 ao exceder
+    `max_bytes` e remove o parcial em qualquer falha.
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    tmp = dest_dir / f"tmp__{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with tmp.open("wb") as f:
+            while chunk := await file.read(chunk_bytes):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                digest.update(chunk)
+                await run_sync(f.write, chunk)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return _SpooledUpload(path=tmp, size_bytes=size, sha256=digest.hexdigest())
+
+
 def __build_ingest_uc(container: Container) -> IngestDocument:
     return IngestDocument(
         repo=container.document_repository,
         extractor=container.text_extractor,
         chunker=container.chunker,
+        dedupe=settings.DEDUPE_UPLOADS,
     )
 
 
+def __build_index_uc(container: Container) -> IndexDocumentChunks:
+    source = FilesystemJsonlChunkSource(container.document_repository.paths["PROCESSED_DIR"])
+    return IndexDocumentChunks(source=source, store=container.vector_store)
+
+
 def __build_list_uc(container: Container) -> ListDocuments:
     return ListDocuments(repo=container.document_repository)
 
 
 def __build_get_uc(container: Container) -> GetDocument:
     return GetDocument(repo=container.document_repository)
+
+
+def __build_chunks_uc(container: Container) -> GetDocumentChunks:
+    return GetDocumentChunks(repo=container.document_repository)
@@ -1,12 +1,45 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
+from dataclasses import asdict
 
+from fastapi import APIRouter, Response, status
+
+from app.container import Container
 from app.version import APP_NAME, APP_VERSION
+from interface_adapters.dto.health_dto import HealthDTO, IndexLoadDTO
+
+
+def get_router(container: Container) -> APIRouter:
+    router = APIRouter(tags=["health"])
+
+    def index_state() -> IndexLoadDTO:
+        warmer = container.index_warmer
+        if warmer is None:
+            # store persistente (ou sem aquecimento): pronto desde o início
+            return IndexLoadDTO(state="ready", ready=True)
+        progress = warmer.progress()
+        return IndexLoadDTO(**asdict(progress), ready=progress.ready)
 
-router = APIRouter(tags=["health"])
+    @router.get("/health", response_model=HealthDTO)
+    def healthcheck() -> HealthDTO:
+        """Liveness: responde 200 enquanto o processo atende, mesmo durante a carga do índice."""
+        return HealthDTO(status="ok", name=APP_NAME, version=APP_VERSION, index=index_state())
 
+    @router.get(
+        "/health/ready",
+        response_model=HealthDTO,
+        responses={503: {"model": HealthDTO, "description": "Índice ainda carregando."}},
+    )
+    def readiness(response: Response) -> HealthDTO:
+        """Readiness: 503 até o índice em memória estar completo (para o balanceador)."""
+        index = index_state()
+        if not index.ready:
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return HealthDTO(
+            status="ready" if index.ready else index.state,
+            name=APP_NAME,
+            version=APP_VERSION,
+            index=index,
+        )
 
-@router.get("/health")
-def healthcheck() -> dict[str, str]:
-    return {"status": "ok", "name": APP_NAME, "version": APP_VERSION}
+    return router
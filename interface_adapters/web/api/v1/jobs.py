@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException
+
+from app.container import Container
+from infrastructure.jobs.ingestion_queue import IngestionJob
+from interface_adapters.dto.job_dto import IngestionJobDTO
+
+
+def get_router(container: Container) -> APIRouter:
+    router = APIRouter(tags=["jobs"])
+
+    @router.get("/jobs/{job_id}", response_model=IngestionJobDTO)
+    def get_job(job_id: str) -> IngestionJobDTO:
+        job = container.ingestion_jobs.get(job_id) if container.ingestion_jobs else None
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job não encontrado.")
+        return to_job_dto(job)
+
+    return router
+
+
+def to_job_dto(job: IngestionJob) -> IngestionJobDTO:
+    return IngestionJobDTO(
+        id=job.id,
+        state=job.state,
+        original_filename=job.original_filename,
+        submitted_at=job.submitted_at,
+        finished_at=job.finished_at,
+        document_id=job.document_id,
+        chunk_count=job.chunk_count,
+        indexed=job.indexed,
+        deduplicated=job.deduplicated,
+        error=job.error,
+        timings=job.timings,
+    )
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
 
 from app.container import Container
-from use_cases.query_rag import QueryRAG, QueryRAGInput
+from domain.services.vector_store import StoreQueueTimeoutError, StoreSaturatedError
+from use_cases.query_rag import QueryRAG, QueryRAGInput, QueryRAGOutput
+
+_BUSY_RESPONSES: dict[int | str, dict] = {
+    status.HTTP_429_TOO_MANY_REQUESTS: {"description": "Store saturado (limite em andamento)."},
+    status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Tempo de espera na fila esgotado."},
+}
 
 
 class RAGQueryRequest(BaseModel):
@@ -24,27 +30,79 @@ class RAGQueryResponse(BaseModel):
     hits: list[RAGQueryHit]
 
 
+class RAGBatchQueryRequest(BaseModel):
+    queries: list[RAGQueryRequest] = Field(
+        ..., min_length=1, max_length=100, description="Consultas do lote (1..100)."
+    )
+
+
+class RAGBatchQueryResponse(BaseModel):
+    results: list[RAGQueryResponse] = Field(..., description="Um resultado por consulta, na ordem.")
+
+
 def get_router(container: Container) -> APIRouter:
     router = APIRouter(prefix="/rag", tags=["rag"])
+    usecase = QueryRAG(store=container.vector_store, cache=container.query_cache)
 
-    @router.post("/query", response_model=RAGQueryResponse, status_code=status.HTTP_200_OK)
-    def rag_query(payload: RAGQueryRequest) -> RAGQueryResponse:
+    @router.post(
+        "/query",
+        response_model=RAGQueryResponse,
+        status_code=status.HTTP_200_OK,
+        responses=_BUSY_RESPONSES,
+    )
+    async def rag_query(payload: RAGQueryRequest) -> RAGQueryResponse:
         """
         Consulta RAG (apenas retrieval). Retorna os *chunks* mais similares.
+        A busca roda no executor limitado do store: 429 se saturado, 503 se expirar na fila.
+        """
+        try:
+            result = await usecase.aexecute(
+                QueryRAGInput(question=payload.question, top_k=payload.top_k)
+            )
+        except (StoreSaturatedError, StoreQueueTimeoutError) as e:
+            raise _busy(e) from e
+        return _to_response(result)
+
+    @router.post(
+        "/query:batch",
+        response_model=RAGBatchQueryResponse,
+        status_code=status.HTTP_200_OK,
+        responses=_BUSY_RESPONSES,
+    )
+    async def rag_query_batch(payload: RAGBatchQueryRequest) -> RAGBatchQueryResponse:
+        """
+        Várias consultas RAG numa única requisição. Os resultados seguem a ordem de `queries`.
         """
-        usecase = QueryRAG(store=container.vector_store)
-        result = usecase.execute(QueryRAGInput(question=payload.question, top_k=payload.top_k))
-        return RAGQueryResponse(
-            hits=[
-                RAGQueryHit(
-                    score=h.score,
-                    document_id=h.document_id,
-                    content=h.content,
-                    chunk_id=h.chunk_id,
-                    metadata=h.metadata,
-                )
-                for h in result.hits
-            ]
-        )
+        try:
+            results = await usecase.aexecute_many(
+                [QueryRAGInput(question=q.question, top_k=q.top_k) for q in payload.queries]
+            )
+        except (StoreSaturatedError, StoreQueueTimeoutError) as e:
+            raise _busy(e) from e
+        return RAGBatchQueryResponse(results=[_to_response(r) for r in results])
 
     return router
+
+
+def _busy(e: StoreSaturatedError | StoreQueueTimeoutError) -> HTTPException:
+    code = (
+        status.HTTP_429_TOO_MANY_REQUESTS
+        if isinstance(e, StoreSaturatedError)
+        else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+    return HTTPException(status_code=code, detail=str(e), headers={"Retry-After": "1"})
+
+
+def _to_response(result: QueryRAGOutput) -> RAGQueryResponse:
+    return RAGQueryResponse(
+        hits=[
+            RAGQueryHit(
+                score=h.score,
+                document_id=h.document_id,
+                content=h.content,
+                chunk_id=h.chunk_id,
+                metadata=h.metadata,
+            )
+            for h in result.hits
+        ]
+    )
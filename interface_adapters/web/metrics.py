@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.observability.app_metrics import AppMetrics
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI: contagem e latência por (método, rota, status) e requisições em
+    andamento. A rota é o template (`/v1/documents/{doc_id}`), não o caminho, para
+    manter a cardinalidade limitada; caminhos sem rota viram "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp, metrics: AppMetrics) -> None:
+        self.app = app
+        self.metrics = metrics
+        self._templates: dict[Any, str] | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        in_flight = self.metrics.http_in_flight
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = int(message["status"])
+            await send(message)
+
+        in_flight.inc()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - t0
+            in_flight.dec()
+            method = scope.get("method", "")
+            route = self._route_template(scope)
+            self.metrics.http_seconds.labels(method=method, route=route).observe(elapsed)
+            self.metrics.http_requests.labels(
+                method=method, route=route, status=str(status_code)
+            ).inc()
+
+    def _route_template(self, scope: Scope) -> str:
+        endpoint = scope.get("endpoint")  # preenchido pelo roteador do Starlette
+        if endpoint is None:
+            return "unmatched"
+        if self._templates is None:
+            app = scope.get("app")
+            routes: list[BaseRoute] = list(getattr(app, "routes", []))
+            self._templates = {getattr(r, "endpoint", None): getattr(r, "path", "") for r in routes}
+        return self._templates.get(endpoint, "unmatched")
+
+
+def get_router(metrics: AppMetrics) -> APIRouter:
+    router = APIRouter(tags=["observability"])
+
+    @router.get("/metrics", response_class=PlainTextResponse)
+    def prometheus_metrics() -> PlainTextResponse:
+        """Métricas no formato de exposição texto do Prometheus."""
+        return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
+
+    return router
@@ -0,0 +1,126 @@
+"""
+Profiling sob demanda de uma requisição (`X-Profile: 1`).
+
+Com `PROFILING_ENABLED=1` e o IP do cliente em `PROFILING_ALLOWLIST`, o middleware abre
+uma sessão de profiling ligada à requisição por uma contextvar. O trabalho pesado das
+rotas roda em threads (`run_sync` ou o executor do VectorStore), e cada chamada feita
+dentro da sessão é executada sob um `cProfile.Profile` (`profiled_call`; um por vez no
+processo, as sobrepostas rodam sem profiler); ao fim da resposta os perfis são somados e
+gravados em `PROFILES_DIR/<id>.pstats` (leitura com `python -m pstats` ou snakeviz).
+O que roda no próprio event loop (corpo de handlers async) não entra no perfil.
+
+A resposta traz o id no cabeçalho `X-Profile-Id` só quando há arquivo: se nada rodou sob
+o profiler (acerto no cache de consultas, todas as chamadas puladas), não há perfil nem
+cabeçalho. Para isso o início da resposta é retido até o fim do corpo, quando o perfil é
+gravado (respostas em partes chegam de uma vez nas requisições perfiladas).
+
+Sem o cabeçalho (ou com o recurso desligado), o custo é uma leitura de contextvar.
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import logging
+import time
+import uuid
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.observability.profiling import (
+    ProfileSession,
+    activate,
+    deactivate,
+    profiled_call,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+async def run_sync(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """`run_in_threadpool` que, numa requisição perfilada, executa `fn` sob o profiler."""
+    return await run_in_threadpool(profiled_call, fn, *args, **kwargs)
+
+
+class ProfilingMiddleware:
+    """Abre uma `ProfileSession` para requisições com `X-Profile: 1` de clientes permitidos."""
+
+    def __init__(self, app: ASGIApp, profiles_dir: Path, allowlist: Sequence[str]) -> None:
+        self.app = app
+        self.profiles_dir = Path(profiles_dir)
+        self._networks = [ipaddress.ip_network(a.strip(), strict=False) for a in allowlist]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        session = ProfileSession(uuid.uuid4().hex)
+        t0 = time.perf_counter()
+        written: bool | None = None  # None: perfil ainda não gravado
+        held: list[Message] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal written
+            if message["type"] not in ("http.response.start", "http.response.body"):
+                await send(message)
+                return
+            held.append(message)
+            if message["type"] == "http.response.start" or message.get("more_body", False):
+                return
+            written = await self._dump(session, scope, t0)
+            start, *body = held
+            held.clear()
+            if written:
+                headers = [*start.get("headers", []), (PROFILE_ID_HEADER, session.id.encode())]
+                start = {**start, "headers": headers}
+            await send(start)
+            for part in body:
+                await send(part)
+
+        token = activate(session)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            deactivate(token)
+            if written is None:  # resposta não concluída (erro na rota)
+                await self._dump(session, scope, t0)
+
+    async def _dump(self, session: ProfileSession, scope: Scope, t0: float) -> bool:
+        path = self.profiles_dir / f"{session.id}.pstats"
+        if not await run_in_threadpool(session.dump, path):
+            logger.debug(
+                "Profile %s sem coleta (%d chamadas sem profiling)", session.id, session.skipped
+            )
+            return False
+        logger.info(
+            "Profile %s %s %s (%.3fs) gravado em %s (%d chamadas sem profiling)",
+            session.id,
+            scope.get("method", ""),
+            scope.get("path", ""),
+            time.perf_counter() - t0,
+            path,
+            session.skipped,
+        )
+        return True
+
+    def _requested(self, scope: Scope) -> bool:
+        flag = next((v for k, v in scope.get("headers", []) if k == PROFILE_HEADER), None)
+        if flag is None or flag.strip() not in (b"1", b"true"):
+            return False
+        client = scope.get("client")
+        if not client:
+            return False
+        try:
+            addr = ipaddress.ip_address(client[0])
+        except ValueError:
+            return False
+        return any(addr in net for net in self._networks)
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import shutil
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
 import pytest
 
 from app.core.config import settings
+from domain.services.vector_store import Chunk
+
+# corpus comum dos testes de VectorStore: cada documento tem um chunk por texto
+_VECTOR_STORE_TEXTS = (
+    "FastAPI e RAG com chunks em disco",
+    "Vector Store denso com matriz NumPy contígua",
+    "Testes devem validar crescimento e deleção",
+    "Snapshot binário com checksum e versão",
+)
 
 
 @pytest.fixture(autouse=True, scope="session")
@@ -38,3 +47,25 @@ def _clear_dir(folder: Path) -> None:
             item.unlink(missing_ok=True)
         elif item.is_dir():
             shutil.rmtree(item, ignore_errors=True)
+
+
+@pytest.fixture
+def make_chunks() -> Callable[[str], list[Chunk]]:
+    """
+    Fábrica dos chunks de um documento para os testes de VectorStore: um por texto do
+    corpus comum, com o id do documento no conteúdo (buscas podem mirar um documento),
+    `chunk_id` `<doc>:<i>` e metadata `{"idx": i}`.
+    """
+
+    def _make(doc_id: str) -> list[Chunk]:
+        return [
+            Chunk(
+                document_id=doc_id,
+                content=f"{text} {doc_id}",
+                chunk_id=f"{doc_id}:{i}",
+                metadata={"idx": i},
+            )
+            for i, text in enumerate(_VECTOR_STORE_TEXTS)
+        ]
+
+    return _make
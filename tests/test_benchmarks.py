@@ -0,0 +1,53 @@
+from benchmarks.compare import compare_reports
+from benchmarks.suite import SuiteConfig, _percentile, run_suite
+
+
+def _report(**values: tuple[float, str]) -> dict:
+    return {
+        "metrics": {
+            name.replace("__", "."): {"value": v, "unit": "", "better": better}
+            for name, (v, better) in values.items()
+        }
+    }
+
+
+def test_compare_sinaliza_regressao_conforme_sentido_da_metrica() -> None:
+    baseline = _report(a__p95_ms=(10.0, "lower"), b__qps=(100.0, "higher"), c__old=(1.0, "lower"))
+    current = _report(a__p95_ms=(11.0, "lower"), b__qps=(80.0, "higher"), d__new=(1.0, "lower"))
+
+    result = compare_reports(baseline, current, threshold=0.15)
+    assert [d.name for d in result.regressions] == ["b.qps"]  # -20% de vazão; +10% de latência não
+    assert result.missing == ["c.old"] and result.added == ["d.new"]
+
+    assert compare_reports(baseline, current, threshold=0.05).regressions[0].name == "a.p95_ms"
+    assert not compare_reports(baseline, baseline).regressions
+
+
+def test_percentil_por_rank_mais_proximo() -> None:
+    samples = [float(i) for i in range(1, 101)]
+    assert _percentile(samples, 50) == 50.0
+    assert _percentile(samples, 99) == 99.0
+    assert _percentile([3.0], 95) == 3.0
+
+
+def test_suite_gera_metricas_por_provedor() -> None:
+    config = SuiteConfig(
+        documents=3,
+        chunks_per_document=4,
+        queries=5,
+        text_mb=0.05,
+        repo_documents=3,
+        providers=("inmemory", "dense", "quantized_int8"),
+        e2e_queries=3,
+    )
+    report = run_suite(config)
+    metrics = report["metrics"]
+    for name in ("inmemory", "dense", "quantized_int8"):
+        assert metrics[f"store.{name}.search_p99_ms"]["better"] == "lower"
+        assert metrics[f"store.{name}.add_chunks_per_s"]["value"] > 0
+    assert metrics["store.quantized_int8.memory_saved_pct"]["value"] > 50
+    assert 0.0 <= metrics["store.quantized_int8.recall_at_k"]["value"] <= 1.0
+    assert {"chunker.offsets.mb_per_s", "repo.count_chunks_p50_ms", "e2e.rag_query_p95_ms"} <= set(
+        metrics
+    )
+    assert report["meta"]["config"]["providers"] == ["inmemory", "dense", "quantized_int8"]
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.container import Container, build_container
+from app.main import create_app
+from domain.services.vector_store import Chunk, StoreQueueTimeoutError, StoreSaturatedError
+from infrastructure.concurrency.bounded_executor import BoundedExecutor
+from infrastructure.vectorstores.in_memory import InMemoryVectorStore
+
+
+@pytest.mark.asyncio
+async def test_fila_expira_e_saturacao_recusa_na_hora() -> None:
+    executor = BoundedExecutor(max_workers=1, max_in_flight=2, queue_timeout=0.05)
+    release = threading.Event()
+    busy = asyncio.ensure_future(executor.run(lambda: release.wait(5)))
+    await asyncio.sleep(0.01)
+
+    # a única thread está ocupada: a segunda chamada não começa a tempo
+    with pytest.raises(StoreQueueTimeoutError):
+        await executor.run(lambda: "nunca roda")
+
+    queued = asyncio.ensure_future(executor.run(lambda: "escrita", bounded=False))
+    await asyncio.sleep(0.01)
+    assert executor.in_flight == 2
+    with pytest.raises(StoreSaturatedError):
+        await executor.run(lambda: "recusada")
+
+    release.set()
+    assert await busy is True
+    assert await queued == "escrita"  # bounded=False espera sem expirar
+    assert executor.in_flight == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rag_query_responde_429_com_store_saturado() -> None:
+    store = InMemoryVectorStore()
+    store.add([Chunk(document_id="doc-1", content="busca vetorial")])
+    executor = BoundedExecutor(max_workers=1, max_in_flight=1, queue_timeout=1.0)
+    store.use_runner(executor)
+    container: Container = build_container()
+    container.vector_store = store
+    container.query_cache = None
+
+    release = threading.Event()
+    busy = asyncio.ensure_future(executor.run(lambda: release.wait(5)))
+    await asyncio.sleep(0.01)
+    transport = ASGITransport(app=create_app(container=container))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post("/v1/rag/query", json={"question": "busca"})
+        assert resp.status_code == 429
+        assert resp.headers["retry-after"] == "1"
+
+        release.set()
+        await busy
+        ok = await client.post("/v1/rag/query", json={"question": "busca"})
+    assert ok.status_code == 200
+    assert ok.json()["hits"][0]["document_id"] == "doc-1"
+    executor.shutdown()
@@ -0,0 +1,70 @@
+import functools
+import random
+
+import pytest
+
+from infrastructure.chunking import offsets, simple_chunker
+from infrastructure.chunking.simple_chunker import SimpleChunker
+
+
+def _pages(rng: random.Random, n: int) -> list[str]:
+    vocab = [f"w{i}" for i in range(50)]
+    pages = []
+    for _ in range(n):
+        paras = [" ".join(rng.choices(vocab, k=rng.randrange(0, 40))) for _ in range(3)]
+        pages.append("  " + "\n\n".join(paras) + "\n")
+    return pages
+
+
+def test_chunk_pages_equivale_a_chunk_do_texto_completo() -> None:
+    rng = random.Random(3)
+    pages = _pages(rng, 30) + ["", "   "]
+    text = "\n\n".join(p.strip() for p in pages if p)
+    chunker = SimpleChunker(max_tokens=50, overlap_tokens=10)
+
+    expected = list(chunker.chunk(text))
+    got = list(chunker.chunk_pages(iter(pages)))
+    assert len(got) > 5
+    assert [{k: c[k] for k in ("content", "offset_start", "offset_end")} for c in got] == expected
+
+
+def test_chunk_pages_registra_paginas_de_origem() -> None:
+    chunker = SimpleChunker(max_tokens=5, overlap_tokens=1)
+    chunks = list(chunker.chunk_pages(["a b c", "", "d e\n\nf g", "h"]))
+    assert [(c["content"], c["page_start"], c["page_end"]) for c in chunks] == [
+        ("a b c\n\nd", 1, 3),
+        ("d e\n\nf g", 3, 3),
+        ("g\n\nh", 3, 4),
+    ]
+
+
+def test_modo_offsets_equivale_ao_modo_words(monkeypatch: pytest.MonkeyPatch) -> None:
+    # blocos pequenos para exercitar os cortes entre blocos do texto único
+    monkeypatch.setattr(
+        simple_chunker, "text_segments", functools.partial(offsets.text_segments, block_chars=9)
+    )
+    rng = random.Random(5)
+    pieces = ["alfa", "beta", "ção", " ", "  ", "\n", "\n\n", "\n\n\n", "\t", "\xa0", "\n \n"]
+    for _ in range(200):
+        text = "".join(rng.choices(pieces, k=rng.randrange(0, 120)))
+        pages = ["".join(rng.choices(pieces, k=rng.randrange(0, 25))) for _ in range(5)]
+        max_tokens, overlap = rng.randrange(1, 10), rng.randrange(0, 12)
+        words = SimpleChunker(max_tokens, overlap)
+        offs = SimpleChunker(max_tokens, overlap, mode="offsets")
+
+        a, b = list(words.chunk(text)), list(offs.chunk(text))
+        assert [_shape(c) for c in a] == [_shape(c) for c in b]
+        assert all(text[c["char_start"] : c["char_end"]] == c["content"] for c in b)
+
+        full = "\n\n".join(p.strip() for p in pages if p)
+        a, b = list(words.chunk_pages(pages)), list(offs.chunk_pages(pages))
+        assert [(_shape(c), c["page_start"], c["page_end"]) for c in a] == [
+            (_shape(c), c["page_start"], c["page_end"]) for c in b
+        ]
+        assert all(full[c["char_start"] : c["char_end"]] == c["content"] for c in b)
+
+
+def _shape(chunk: dict) -> tuple:
+    """Janela e palavras por parágrafo (o modo offsets preserva o espaçamento original)."""
+    paragraphs = [p.split() for p in chunk["content"].split("\n\n") if p.split()]
+    return chunk["offset_start"], chunk["offset_end"], paragraphs
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from domain.entities.document import Document
+from domain.repositories.document_repository import InvalidCursorError
+from infrastructure.storage.sqlite_catalog import SqliteDocumentCatalog
+
+
+def _doc(i: int, created_at: datetime, name: str = "a.pdf") -> Document:
+    return Document(
+        id=f"doc-{i:03d}",
+        original_filename=name,
+        stored_filename=f"doc-{i:03d}__{name}",
+        size_bytes=100 + i,
+        pages=1,
+        created_at=created_at,
+    )
+
+
+def test_paginacao_por_cursor_percorre_tudo_em_ordem(tmp_path: Path) -> None:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    # empates de created_at são desempatados por id
+    docs = [_doc(i, base + timedelta(seconds=i // 3)) for i in range(25)]
+    catalog = SqliteDocumentCatalog(tmp_path / "catalog.sqlite3")
+    catalog.upsert_many(docs)
+
+    seen: list[Document] = []
+    cursor = None
+    while True:
+        page, cursor = catalog.list_page(limit=7, cursor=cursor)
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    expected = sorted(docs, key=lambda d: (d.created_at, d.id), reverse=True)
+    assert seen == expected
+
+    with pytest.raises(InvalidCursorError):
+        catalog.list_page(limit=5, cursor="nao-e-um-cursor")
+
+
+def test_catalogo_novo_e_populado_pelo_bootstrap(tmp_path: Path) -> None:
+    now = datetime.now(timezone.utc)
+    existing = [_doc(1, now, "x.pdf"), _doc(2, now, "y.pdf")]
+    catalog = SqliteDocumentCatalog(tmp_path / "catalog.sqlite3", bootstrap=lambda: existing)
+
+    assert catalog.count() == 2
+    docs, cursor = catalog.list_page(limit=10, original_filename="y.pdf")
+    assert [d.id for d in docs] == ["doc-002"] and cursor is None
+
+    # rebuild substitui todo o conteúdo
+    assert catalog.rebuild(existing[:1]) == 1
+    catalog.close()
+    # banco já existente: bootstrap não roda de novo
+    reopened = SqliteDocumentCatalog(tmp_path / "catalog.sqlite3", bootstrap=lambda: existing)
+    assert reopened.count() == 1
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import hashlib
 import io
+import json
 from pathlib import Path
 from typing import Any, cast
 
@@ -9,6 +11,7 @@ from fastapi import status
 from httpx import ASGITransport, AsyncClient
 from pypdf import PdfWriter
 
+from app.core.config import settings
 from app.main import app
 
 
@@ -70,3 +73,139 @@ async def test_get_document_by_id_ok() -> None:
     assert Path(body["text_path"]).exists()
     assert Path(body["chunks_path"]).exists()
     assert body["chunk_count"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_upload_registra_sha256_dos_bytes() -> None:
+    pdf_bytes = _make_minimal_pdf_bytes()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        files = {"file": ("hash.pdf", pdf_bytes, "application/pdf")}
+        resp = await ac.post("/v1/documents", files=files)
+
+    assert resp.status_code == status.HTTP_201_CREATED
+    meta = resp.json()["meta"]
+    assert meta["sha256"] == hashlib.sha256(pdf_bytes).hexdigest()
+    assert meta["size_bytes"] == len(pdf_bytes)
+
+
+@pytest.mark.asyncio
+async def test_upload_acima_do_limite_retorna_413(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 64)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_BYTES", 16)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        files = {"file": ("grande.pdf", _make_minimal_pdf_bytes(), "application/pdf")}
+        resp = await ac.post("/v1/documents", files=files)
+
+    assert resp.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert not list(settings.RAW_DIR.glob("tmp__*"))
+
+
+@pytest.mark.asyncio
+async def test_upload_duplicado_reutiliza_documento(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.main import create_app
+
+    monkeypatch.setattr(settings, "DEDUPE_UPLOADS", True)
+    dedupe_app = create_app()
+    writer = PdfWriter()
+    writer.add_blank_page(width=200, height=300)  # conteúdo distinto dos demais testes
+    buf = io.BytesIO()
+    writer.write(buf)
+    pdf_bytes = buf.getvalue()
+
+    transport = ASGITransport(app=dedupe_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        first = await ac.post("/v1/documents", files={"file": ("a.pdf", pdf_bytes)})
+        second = await ac.post("/v1/documents", files={"file": ("b.pdf", pdf_bytes)})
+
+    assert first.status_code == status.HTTP_201_CREATED
+    assert first.json()["deduplicated"] is False
+    assert second.status_code == status.HTTP_200_OK
+    body = second.json()
+    assert body["deduplicated"] is True
+    assert body["meta"]["id"] == first.json()["meta"]["id"]
+    # o arquivo temporário do upload duplicado não fica para trás
+    assert not list(settings.RAW_DIR.glob("tmp__*.part"))
+
+
+@pytest.mark.asyncio
+async def test_list_documents_paginado_com_cursor() -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        for i in range(3):
+            files = {"file": (f"pag-{i}.pdf", _make_minimal_pdf_bytes(), "application/pdf")}
+            assert (await ac.post("/v1/documents", files=files)).status_code == 201
+
+        full = (await ac.get("/v1/documents", params={"limit": 1000})).json()
+        ids: list[str] = []
+        cursor = None
+        while True:
+            params: dict[str, Any] = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            resp = await ac.get("/v1/documents", params=params)
+            assert resp.status_code == status.HTTP_200_OK
+            ids.extend(it["id"] for it in resp.json())
+            cursor = resp.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        bad = await ac.get("/v1/documents", params={"cursor": "%%%"})
+
+    assert len(full) >= 3
+    assert ids == [it["id"] for it in full]
+    created = [it["created_at"] for it in full]
+    assert created == sorted(created, reverse=True)
+    assert bad.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_chunks_do_documento_paginados() -> None:
+    from infrastructure.storage.local_document_repository import LocalDocumentRepository
+
+    repo = LocalDocumentRepository()
+    paths = repo.allocate_paths("chunks.pdf")
+    chunks = [
+        {"content": f"trecho {i} ção", "page_start": i + 1, "page_end": i + 1} for i in range(7)
+    ]
+    assert repo.save_chunks(iter(chunks), paths["chunks_path"]) == 7
+    doc_id = paths["id"]
+    assert repo.count_chunks(doc_id) == 7
+    assert repo.get_chunk(doc_id, 5) == chunks[5]
+    assert repo.get_chunk(doc_id, 7) is None
+    assert repo.get_chunks(doc_id, offset=5, limit=10) == chunks[5:]
+
+    # sidecar inconsistente com o JSONL: cai na varredura, sem seeks em offsets errados
+    idx_path = paths["chunks_path"].with_name(f"{doc_id}.chunks.idx")
+    sidecar = idx_path.read_bytes()
+    idx_path.write_bytes(sidecar[:-3])  # truncado
+    assert repo.count_chunks(doc_id) == 7
+    assert repo.get_chunks(doc_id, offset=5, limit=10) == chunks[5:]
+    shorter = chunks[:3]
+    jsonl = "".join(json.dumps(c, ensure_ascii=False) + "\n" for c in shorter)
+    paths["chunks_path"].write_text(jsonl, encoding="utf-8")
+    idx_path.write_bytes(sidecar)  # JSONL reescrito, sidecar antigo mais novo que ele
+    assert repo.count_chunks(doc_id) == 3
+    assert repo.get_chunks(doc_id, offset=1, limit=5) == shorter[1:]
+    paths["chunks_path"].write_text(
+        "".join(json.dumps(c, ensure_ascii=False) + "\n" for c in chunks), encoding="utf-8"
+    )
+
+    # sem o sidecar, cai na varredura do JSONL com o mesmo resultado
+    idx_path.unlink()
+    assert repo.count_chunks(doc_id) == 7
+    assert repo.get_chunks(doc_id, offset=2, limit=3) == chunks[2:5]
+
+    doc_id = getattr(cast(Any, test_upload_document_ok), "doc_id", None)
+    assert doc_id is not None, "O teste de upload deve rodar antes deste."
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        resp = await ac.get(f"/v1/documents/{doc_id}/chunks", params={"offset": 0, "limit": 5})
+        missing = await ac.get("/v1/documents/nao-existe/chunks")
+
+    assert resp.status_code == status.HTTP_200_OK
+    body = resp.json()
+    assert body["document_id"] == doc_id and body["offset"] == 0
+    assert len(body["items"]) == min(5, body["total"])
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
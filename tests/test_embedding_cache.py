@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import numpy as np
+
+from infrastructure.embeddings.cache import CachedEmbedder, SqliteEmbeddingCache
+from infrastructure.embeddings.hashing import HashingEmbedder
+
+
+def test_cached_embedder_reaproveita_conteudo_repetido(tmp_path: Path) -> None:
+    base = HashingEmbedder(dim=32)
+    cache = SqliteEmbeddingCache(tmp_path / "emb.sqlite3")
+    emb = CachedEmbedder(base, cache)
+
+    texts = ["cabeçalho padrão", "conteúdo único", "cabeçalho padrão"]
+    first = emb.embed(texts)
+    np.testing.assert_allclose(first, base.embed(texts))
+    assert cache.stats()["misses"] == 2 and cache.stats()["hits"] == 0
+
+    again = emb.embed(["cabeçalho padrão"])
+    np.testing.assert_allclose(again[0], first[0])
+    assert cache.stats()["hits"] == 1
+
+    # persistente entre instâncias
+    cache.close()
+    reopened = SqliteEmbeddingCache(tmp_path / "emb.sqlite3")
+    CachedEmbedder(base, reopened).embed(["conteúdo único"])
+    assert reopened.stats()["hits"] == 1 and reopened.stats()["misses"] == 0
+    assert reopened.stats()["entries"] == 2
+
+
+def test_cache_lru_limita_tamanho_e_separa_versoes(tmp_path: Path) -> None:
+    cache = SqliteEmbeddingCache(tmp_path / "emb.sqlite3", max_entries=2)
+    emb = CachedEmbedder(HashingEmbedder(dim=16), cache)
+
+    emb.embed(["a"])
+    emb.embed(["b"])
+    emb.embed(["a"])  # "a" passa a ser o mais recente
+    emb.embed(["c"])  # excede: remove "b"
+    assert cache.stats()["entries"] == 2 and cache.stats()["evictions"] == 1
+
+    hits_before = cache.stats()["hits"]
+    emb.embed(["a", "c"])
+    assert cache.stats()["hits"] == hits_before + 2
+    emb.embed(["b"])
+    assert cache.stats()["hits"] == hits_before + 2
+
+    other_version = CachedEmbedder(HashingEmbedder(dim=8), cache)
+    other_version.embed(["a"])
+    assert cache.stats()["hits"] == hits_before + 2
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from infrastructure.embeddings.hashing import HashingEmbedder
+
+_SNIPPET = (
+    "from infrastructure.embeddings.hashing import HashingEmbedder;"
+    "print(HashingEmbedder(dim=64).embed(['RAG com FastAPI e Chroma'])[0].tolist())"
+)
+
+
+def _embed_in_subprocess(hash_seed: str) -> list[float]:
+    env = {**os.environ, "PYTHONHASHSEED": hash_seed}
+    out = subprocess.run(
+        [sys.executable, "-c", _SNIPPET], env=env, capture_output=True, text=True, check=True
+    )
+    return [float(x) for x in out.stdout.strip().strip("[]").split(",")]
+
+
+def test_hashing_embedder_estavel_entre_processos() -> None:
+    assert _embed_in_subprocess("1") == _embed_in_subprocess("2")
+
+
+def test_hashing_embedder_lote_equivale_a_individual() -> None:
+    emb = HashingEmbedder(dim=32)
+    texts = ["Alfa beta beta", "", "GAMA delta alfa", "beta"]
+    batch = emb.embed(texts)
+    assert batch.shape == (4, 32) and batch.dtype == np.float32
+    for row, text in zip(batch, texts, strict=True):
+        np.testing.assert_allclose(row, emb.embed([text])[0], rtol=1e-6)
+    np.testing.assert_allclose(np.linalg.norm(batch[[0, 2, 3]], axis=1), 1.0, rtol=1e-6)
+    assert not batch[1].any()
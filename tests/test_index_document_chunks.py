@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 
+from domain.services.vector_store import Chunk
 from infrastructure.chunk_sources.filesystem_jsonl import FilesystemJsonlChunkSource
 from infrastructure.vectorstores.in_memory import InMemoryVectorStore
 from use_cases.index_document_chunks import IndexDocumentChunks
@@ -61,3 +62,30 @@ def test_index_document_chunks_empty_source(tmp_path: Path) -> None:
 
     hits = store.similarity_search("qualquer coisa", top_k=3)
     assert hits == []
+
+
+def test_index_document_chunks_incremental(tmp_path: Path) -> None:
+    doc_id = "doc-inc"
+    processed_dir = tmp_path / "data" / "processed"
+    rows = [{"content": f"parágrafo {i} sobre arquitetura"} for i in range(5)]
+    _write_jsonl(processed_dir, doc_id, rows)
+
+    source = FilesystemJsonlChunkSource(processed_dir=processed_dir)
+    store = InMemoryVectorStore()
+    store.add([Chunk(document_id="outro", content="parágrafo de outro documento", chunk_id="x:0")])
+    usecase = IndexDocumentChunks(source, store)
+
+    first = usecase.execute(document_id=doc_id, incremental=True)
+    assert (first.added, first.updated, first.removed, first.unchanged) == (5, 0, 0, 0)
+
+    # re-chunking: altera o chunk 1, remove o último
+    rows[1] = {"content": "parágrafo 1 reescrito"}
+    _write_jsonl(processed_dir, doc_id, rows[:4])
+    second = usecase.execute(document_id=doc_id, incremental=True)
+    assert (second.added, second.updated, second.removed, second.unchanged) == (0, 1, 1, 3)
+
+    contents = sorted(c.content for _, c in store.similarity_search("parágrafo", top_k=20))
+    assert contents == sorted([r["content"] for r in rows[:4]] + ["parágrafo de outro documento"])
+
+    third = usecase.execute(document_id=doc_id, incremental=True)
+    assert (third.added, third.updated, third.removed, third.unchanged) == (0, 0, 0, 4)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from pypdf import PdfWriter
+
+from app.container import build_container, build_ingestion_jobs
+from app.main import create_app
+from infrastructure.chunk_sources.filesystem_jsonl import FilesystemJsonlChunkSource
+from infrastructure.jobs.ingestion_queue import IngestionJobQueue, QueueFullError
+from infrastructure.vectorstores.in_memory import InMemoryVectorStore
+from use_cases.index_document_chunks import IndexDocumentChunks
+from use_cases.ingest_document import IngestDocument, IngestDocumentInput, IngestDocumentOutput
+
+
+def _pdf_bytes() -> bytes:
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_upload_assincrono_retorna_202_e_job_conclui() -> None:
+    container = build_container()
+    container.ingestion_jobs = build_ingestion_jobs(container.vector_store)
+    app = create_app(container=container)
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            files = {"file": ("job.pdf", _pdf_bytes(), "application/pdf")}
+            resp = await ac.post("/v1/documents", files=files)
+            assert resp.status_code == status.HTTP_202_ACCEPTED
+            job = resp.json()
+            assert job["state"] in ("queued", "running")
+            assert resp.headers["location"] == f"/v1/jobs/{job['id']}"
+
+            for _ in range(300):
+                job = (await ac.get(f"/v1/jobs/{job['id']}")).json()
+                if job["state"] in ("succeeded", "failed"):
+                    break
+                await asyncio.sleep(0.1)
+
+            assert job["state"] == "succeeded", job
+            assert job["document_id"]
+            assert {"queue_wait", "extract", "chunk", "index"} <= set(job["timings"])
+
+            doc = await ac.get(f"/v1/documents/{job['document_id']}")
+            assert doc.status_code == status.HTTP_200_OK
+
+            missing = await ac.get("/v1/jobs/nao-existe")
+            assert missing.status_code == status.HTTP_404_NOT_FOUND
+    finally:
+        container.ingestion_jobs.shutdown()
+
+
+class _BlockingIngest(IngestDocument):
+    gate = threading.Event()
+
+    def __init__(self) -> None:
+        pass
+
+    def execute(self, inp: IngestDocumentInput) -> IngestDocumentOutput:
+        self.gate.wait(timeout=10)
+        raise RuntimeError("interrompido")
+
+
+def _blocking_factory() -> IngestDocument:
+    return _BlockingIngest()
+
+
+def test_fila_cheia_rejeita_e_falha_fica_registrada(tmp_path: Path) -> None:
+    index_uc = IndexDocumentChunks(FilesystemJsonlChunkSource(tmp_path), InMemoryVectorStore())
+    queue = IngestionJobQueue(
+        ingest_factory=_blocking_factory, index_uc=index_uc, max_depth=1, use_processes=False
+    )
+    tmp = tmp_path / "upload.part"
+    tmp.write_bytes(b"%PDF")
+    try:
+        job = queue.submit(IngestDocumentInput(tmp_file=tmp, original_filename="a.pdf"))
+        with pytest.raises(QueueFullError):
+            queue.submit(IngestDocumentInput(tmp_file=tmp, original_filename="b.pdf"))
+
+        _BlockingIngest.gate.set()
+        for _ in range(100):
+            current = queue.get(job.id)
+            if current is not None and current.state == "failed":
+                break
+            threading.Event().wait(0.05)
+        current = queue.get(job.id)
+        assert current is not None and current.state == "failed"
+        assert current.error is not None and "interrompido" in current.error
+        assert not tmp.exists()
+        assert queue.pending() == 0
+    finally:
+        queue.shutdown()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+from pypdf import PdfWriter
+
+from app.container import build_container
+from app.main import create_app
+from infrastructure.embeddings.cache import CachedEmbedder, SqliteEmbeddingCache
+from infrastructure.embeddings.hashing import HashingEmbedder
+from infrastructure.observability.metrics import MetricsRegistry
+from use_cases.query_cache import QueryResultCache
+
+
+def _pdf_bytes() -> bytes:
+    writer = PdfWriter()
+    writer.add_blank_page(width=72 * 8.5, height=72 * 11)
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+def test_histograma_acumula_buckets_no_formato_de_exposicao() -> None:
+    registry = MetricsRegistry()
+    hist = registry.histogram("x_seconds", "Teste.", ["kind"], buckets=[0.1, 1.0])
+    child = hist.labels(kind='a"b')
+    for v in (0.05, 0.1, 0.5, 3.0):
+        child.observe(v)
+    registry.gauge("y", "Gauge.").set_function(lambda: 7)
+
+    text = registry.render()
+    assert "# TYPE x_seconds histogram" in text
+    assert 'x_seconds_bucket{kind="a\\"b",le="0.1"} 2' in text
+    assert 'x_seconds_bucket{kind="a\\"b",le="1"} 3' in text
+    assert 'x_seconds_bucket{kind="a\\"b",le="+Inf"} 4' in text
+    assert 'x_seconds_count{kind="a\\"b"} 4' in text
+    assert "\ny 7\n" in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_expoe_etapas_buscas_e_rotas() -> None:
+    app = create_app()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        files = {"file": ("metricas.pdf", _pdf_bytes(), "application/pdf")}
+        assert (await ac.post("/v1/documents", files=files)).status_code == 201
+        doc_id = (await ac.get("/v1/documents")).json()[0]["id"]
+        await ac.get(f"/v1/documents/{doc_id}")
+        await ac.post("/v1/rag/query", json={"question": "qualquer coisa", "top_k": 3})
+        resp = await ac.get("/metrics")
+
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    for stage in ("extract", "chunk", "save_chunks", "save_meta"):
+        assert f'rag_ingest_stage_seconds_count{{stage="{stage}"}} 1' in text
+    assert "rag_index_seconds_count 1" in text
+    assert 'rag_vector_search_seconds_count{provider="' in text
+    # rota pelo template, não pelo caminho com o id
+    assert (
+        'rag_http_requests_total{method="GET",route="/v1/documents/{doc_id}",status="200"} 1'
+        in text
+    )
+    assert 'rag_http_requests_total{method="POST",route="/v1/documents",status="201"} 1' in text
+    assert "rag_http_requests_in_flight 1" in text  # a própria coleta
+    assert "\nrag_documents " in text
+    assert "\nrag_indexed_chunks " in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_expoe_estatisticas_do_cache_de_embeddings(tmp_path: Path) -> None:
+    container = build_container()
+    container.embedding_cache = SqliteEmbeddingCache(tmp_path / "emb.sqlite3")
+    embedder = CachedEmbedder(HashingEmbedder(dim=16), container.embedding_cache)
+    embedder.embed(["a", "b"])
+    embedder.embed(["a"])
+
+    transport = ASGITransport(app=create_app(container=container))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        text = (await ac.get("/metrics")).text
+
+    assert "\nrag_embedding_cache_hits_total 1\n" in text
+    assert "\nrag_embedding_cache_misses_total 2\n" in text
+    assert "\nrag_embedding_cache_entries 2\n" in text
+
+
+@pytest.mark.asyncio
+async def test_metrics_expoe_estatisticas_do_cache_de_consultas() -> None:
+    container = build_container()
+    container.query_cache = QueryResultCache(max_entries=8)
+
+    transport = ASGITransport(app=create_app(container=container))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        for _ in range(2):
+            await ac.post("/v1/rag/query", json={"question": "cache de consultas", "top_k": 3})
+        text = (await ac.get("/metrics")).text
+
+    assert "\nrag_query_cache_hits_total 1\n" in text
+    assert "\nrag_query_cache_misses_total 1\n" in text
+    assert "\nrag_query_cache_entries 1\n" in text
+    assert "\nrag_query_cache_hit_ratio 0.5\n" in text
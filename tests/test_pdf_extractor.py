@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from infrastructure.pdf.pypdf_text_extractor import PyPDFTextExtractor
+
+
+def _multi_page_pdf_bytes(texts: list[str]) -> bytes:
+    """Gera um PDF com uma página de texto por item (xref com offsets reais)."""
+    n = len(texts)
+    objects: list[str] = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids ["
+        + " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+        + f"] /Count {n} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n{body}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets)
+    out += f"trailer\n<< /Root 1 0 R /Size {len(objects) + 1} >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def test_extracao_paralela_preserva_ordem_das_paginas(tmp_path: Path) -> None:
+    texts = [f"pagina {i} conteudo" for i in range(7)]
+    pdf = tmp_path / "multi.pdf"
+    pdf.write_bytes(_multi_page_pdf_bytes(texts))
+
+    serial = PyPDFTextExtractor(parallel_min_pages=1000).extract_pages(pdf)
+    parallel = PyPDFTextExtractor(parallel_min_pages=2, max_workers=2).extract_pages(pdf)
+
+    assert [p.index for p in parallel] == list(range(7))
+    assert [p.text for p in parallel] == [p.text for p in serial]
+    assert all(p.seconds >= 0.0 for p in parallel)
+    assert "pagina 3" in parallel[3].text
+
+    text, pages = PyPDFTextExtractor(parallel_min_pages=2, max_workers=2).extract(pdf)
+    assert pages == 7
+    assert text.split("\n\n") == [p.text.strip() for p in serial]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import io
+import pstats
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from pypdf import PdfWriter
+
+from app.core.config import settings
+from app.main import create_app
+from infrastructure.observability.profiling import ProfileSession
+
+
+def _pdf_bytes() -> bytes:
+    writer = PdfWriter()
+    writer.add_blank_page(width=72 * 8.5, height=72 * 11)
+    buf = io.BytesIO()
+    writer.write(buf)
+    return buf.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_x_profile_grava_pstats_para_upload_e_consulta(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILES_DIR", tmp_path)
+    app = create_app()
+    transport = ASGITransport(app=app)  # cliente 127.0.0.1, na allow-list padrão
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        plain = await ac.post("/v1/rag/query", json={"question": "texto"})
+        # outra pergunta: um acerto no cache não passa pelo store e não gera perfil
+        query = await ac.post(
+            "/v1/rag/query", json={"question": "outro texto"}, headers={"X-Profile": "1"}
+        )
+        cached = await ac.post(
+            "/v1/rag/query", json={"question": "texto"}, headers={"X-Profile": "1"}
+        )
+        files = {"file": ("perfil.pdf", _pdf_bytes(), "application/pdf")}
+        upload = await ac.post("/v1/documents", files=files, headers={"X-Profile": "1"})
+
+    assert "x-profile-id" not in plain.headers
+    # acerto no cache: nada rodou sob o profiler, então não há perfil nem cabeçalho
+    assert cached.status_code == 200
+    assert "x-profile-id" not in cached.headers
+    assert upload.status_code == 201
+    for resp in (query, upload):
+        profile = tmp_path / f"{resp.headers['x-profile-id']}.pstats"
+        assert profile.exists()
+        stats = pstats.Stats(str(profile))
+        assert stats.total_calls > 0  # type: ignore[attr-defined]
+    assert len(list(tmp_path.glob("*.pstats"))) == 2
+
+    upload_stats = pstats.Stats(str(tmp_path / f"{upload.headers['x-profile-id']}.pstats"))
+    functions = {name for _, _, name in upload_stats.stats}  # type: ignore[attr-defined]
+    assert "execute" in functions  # IngestDocument/IndexDocumentChunks.execute
+
+
+@pytest.mark.asyncio
+async def test_x_profile_ignorado_fora_da_allowlist(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(settings, "PROFILES_DIR", tmp_path)
+    monkeypatch.setattr(settings, "PROFILING_ALLOWLIST", ["10.0.0.0/8"])
+    transport = ASGITransport(app=create_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        resp = await ac.post(
+            "/v1/rag/query", json={"question": "texto"}, headers={"X-Profile": "1"}
+        )
+
+    assert resp.status_code == 200
+    assert "x-profile-id" not in resp.headers
+    assert not list(tmp_path.iterdir())
+
+
+def test_chamadas_sobrepostas_rodam_sem_segundo_profiler() -> None:
+    session = ProfileSession("sobreposta")
+    started, release = threading.Event(), threading.Event()
+
+    def slow() -> str:
+        started.set()
+        release.wait(10)
+        return "lenta"
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(session.call, slow)
+        assert started.wait(10)
+        # com um profiler ativo, um segundo cProfile falharia no Python 3.12+
+        assert session.call(sum, [1, 2, 3]) == 6
+        release.set()
+        assert first.result(10) == "lenta"
+
+    assert session.skipped == 1
+    assert session.call(sum, [4]) == 4  # profiler livre de novo
+    assert session.skipped == 1
@@ -0,0 +1,57 @@
+from domain.services.vector_store import Chunk
+from infrastructure.vectorstores.in_memory import InMemoryVectorStore
+from use_cases.query_cache import QueryResultCache
+from use_cases.query_rag import QueryRAG, QueryRAGInput, QueryRAGOutput
+
+
+class _CountingStore(InMemoryVectorStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.searches = 0
+
+    def similarity_search(self, query: str, top_k: int = 5) -> list[tuple[float, Chunk]]:
+        self.searches += 1
+        return super().similarity_search(query, top_k)
+
+
+def test_query_rag_cache_hit_e_invalidacao_por_geracao() -> None:
+    store = _CountingStore()
+    store.add([Chunk(document_id="doc-1", content="busca de similaridade com RAG")])
+    cache: QueryResultCache[QueryRAGOutput] = QueryResultCache(max_entries=8)
+    usecase = QueryRAG(store=store, cache=cache)
+
+    first = usecase.execute(QueryRAGInput(question="Busca  de RAG", top_k=3))
+    second = usecase.execute(QueryRAGInput(question="busca de rag", top_k=3))
+    assert second is first
+    assert store.searches == 1
+    assert cache.stats()["hits"] == 1
+
+    # top_k diferente é outra chave
+    usecase.execute(QueryRAGInput(question="busca de rag", top_k=4))
+    assert store.searches == 2
+
+    # escrita no store incrementa a geração: entrada antiga vira miss
+    store.add([Chunk(document_id="doc-2", content="RAG com cache de consultas")])
+    third = usecase.execute(QueryRAGInput(question="busca de rag", top_k=3))
+    assert store.searches == 3
+    assert len(third.hits) == 2
+    assert cache.stats()["stale"] == 1
+
+
+def test_query_result_cache_ttl_e_lru() -> None:
+    now = [0.0]
+    cache: QueryResultCache[str] = QueryResultCache(
+        max_entries=2, ttl_seconds=10, clock=lambda: now[0]
+    )
+    cache.put("a", 5, 0, "A")
+    cache.put("b", 5, 0, "B")
+    assert cache.get("a", 5, 0) == "A"  # "a" vira o mais recente
+    cache.put("c", 5, 0, "C")  # remove "b"
+    assert cache.get("b", 5, 0) is None
+    assert cache.get("c", 5, 0) == "C"
+
+    now[0] = 11.0
+    assert cache.get("a", 5, 0) is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["expired"] == 1
+    assert 0.0 < stats["hit_rate"] < 1.0
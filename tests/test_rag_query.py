@@ -63,3 +63,40 @@ async def test_rag_query_empty_question_returns_empty_list() -> None:
     assert resp.status_code == 200
     data = resp.json()
     assert data["hits"] == []
+
+
+@pytest.mark.asyncio
+async def test_rag_query_batch_preserva_ordem_de_entrada() -> None:
+    base_container: Container = build_container()
+    store = InMemoryVectorStore()
+    store.add(
+        [
+            Chunk(document_id="doc-1", content="Indexação de chunks e busca de similaridade."),
+            Chunk(document_id="doc-2", content="Odontologia hospitalar e protocolos clínicos."),
+        ]
+    )
+    base_container.vector_store = store
+    app = create_app(container=base_container)
+
+    payload = {
+        "queries": [
+            {"question": "protocolos de odontologia", "top_k": 1},
+            {"question": "   "},
+            {"question": "busca de similaridade", "top_k": 2},
+            {"question": "protocolos de odontologia", "top_k": 1},
+        ]
+    }
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        resp = await client.post("/v1/rag/query:batch", json=payload)
+        single = await client.post(
+            "/v1/rag/query", json={"question": "busca de similaridade", "top_k": 2}
+        )
+
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert len(results) == 4
+    assert results[0]["hits"][0]["document_id"] == "doc-2"
+    assert results[1]["hits"] == []
+    assert results[2] == single.json()
+    assert results[3] == results[0]
@@ -62,3 +62,66 @@ def test_chroma_delete_by_document_remove_todos(tmp_path: Path) -> None:
     hits = store.similarity_search("Vector Store persistente", top_k=10)
     # Nenhum chunk do doc-A deve permanecer
     assert all(chunk.document_id != "doc-A" for _, chunk in hits)
+
+
+def test_chroma_detecta_versao_de_embedder_divergente(tmp_path: Path) -> None:
+    from infrastructure.embeddings.hashing import HashingEmbedder
+    from infrastructure.vectorstores.chroma import EmbedderVersionMismatchError
+
+    chroma_dir = tmp_path / ".chroma"
+    store = ChromaVectorStore(
+        persist_directory=chroma_dir, collection_name="test_chunks", embedder=HashingEmbedder(64)
+    )
+    store.add(_make_chunks("doc-1"))
+
+    with pytest.raises(EmbedderVersionMismatchError):
+        ChromaVectorStore(
+            persist_directory=chroma_dir,
+            collection_name="test_chunks",
+            embedder=HashingEmbedder(128),
+        )
+
+
+def test_chroma_similarity_search_batch(tmp_path: Path) -> None:
+    store = ChromaVectorStore(persist_directory=tmp_path / ".chroma", collection_name="test_chunks")
+    store.add(_make_chunks("doc-1"))
+
+    queries = ["Vector Store persistente", " ", "Testes de deleção"]
+    batch = store.similarity_search_batch(queries, top_k=1)
+    assert len(batch) == 3
+    assert batch[1] == []
+    assert batch[0][0][1].chunk_id == "doc-1:1"
+    assert batch[2][0][1].chunk_id == "doc-1:2"
+
+
+def test_chroma_add_bulk_em_lotes_com_progresso(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = ChromaVectorStore(persist_directory=tmp_path / ".chroma", collection_name="bulk")
+    chunks = (
+        Chunk(document_id=f"doc-{i % 2}", content=f"bloco {i} sobre Chroma", chunk_id=f"c{i}")
+        for i in range(7)
+    )
+    progress: list[int] = []
+    assert store.add_bulk(chunks, batch_size=3, progress=progress.append) == 7
+    assert progress == [3, 6, 7]
+    assert len(store.similarity_search("bloco sobre Chroma", top_k=10)) == 7
+
+    # o lote nunca excede o máximo aceito pelo cliente
+    monkeypatch.setattr(store._client, "get_max_batch_size", lambda: 2)
+    progress.clear()
+    store.add_bulk(_make_chunks("doc-9"), batch_size=100, progress=progress.append)
+    assert progress == [2, 3]
+
+
+def test_chroma_content_hashes_e_delete_chunks(tmp_path: Path) -> None:
+    store = ChromaVectorStore(persist_directory=tmp_path / ".chroma", collection_name="hashes")
+    chunks = _make_chunks("doc-1")
+    store.add(chunks)
+    assert store.content_hashes("doc-1") == {c.chunk_id: c.content_hash() for c in chunks}
+
+    assert store.delete_chunks("doc-1", ["doc-1:1", "doc-2:0"]) == 1
+    assert set(store.content_hashes("doc-1")) == {"doc-1:0", "doc-1:2"}
+    # o hash interno não vaza na metadata dos resultados
+    _, hit = store.similarity_search("FastAPI e RAG", top_k=1)[0]
+    assert "content_sha256" not in hit.metadata
@@ -0,0 +1,77 @@
+from collections.abc import Callable
+
+from domain.services.vector_store import Chunk
+from infrastructure.vectorstores.dense import DenseVectorStore
+
+ChunkFactory = Callable[[str], list[Chunk]]
+
+
+def test_dense_busca_ordenada_e_cresce_alem_da_capacidade(make_chunks: ChunkFactory) -> None:
+    store = DenseVectorStore(initial_capacity=2)
+    assert store.add(make_chunks("doc-1")) == 4
+    assert store.add(make_chunks("doc-2")) == 4
+
+    hits = store.similarity_search("matriz NumPy do vector store", top_k=2)
+    assert len(hits) == 2
+    assert all(c.chunk_id is not None and c.chunk_id.endswith(":1") for _, c in hits)
+    scores = [s for s, _ in hits]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0.0 < s <= 1.0 + 1e-6 for s in scores)
+
+
+def test_dense_delete_by_document_swap_remove(make_chunks: ChunkFactory) -> None:
+    store = DenseVectorStore()
+    store.add(make_chunks("doc-A"))
+    store.add(make_chunks("doc-B"))
+    store.add(make_chunks("doc-C"))
+
+    assert store.delete_by_document("doc-A") == 4
+    assert store.delete_by_document("doc-A") == 0
+
+    hits = store.similarity_search("vector store testes disco", top_k=10)
+    assert {c.document_id for _, c in hits} == {"doc-B", "doc-C"}
+    assert len(hits) == store.count() == 8
+
+    # após o swap-remove os chunks movidos continuam removíveis
+    assert store.delete_by_document("doc-C") == 4
+    hits = store.similarity_search("vector store testes disco", top_k=10)
+    assert {c.document_id for _, c in hits} == {"doc-B"}
+
+
+def test_dense_query_sem_tokens_em_comum_retorna_vazio(make_chunks: ChunkFactory) -> None:
+    store = DenseVectorStore()
+    store.add(make_chunks("doc-1"))
+    assert store.similarity_search("   ", top_k=3) == []
+
+
+def test_dense_batch_em_blocos_equivale_a_buscas_individuais(make_chunks: ChunkFactory) -> None:
+    store = DenseVectorStore(search_block_rows=4)
+    for i in range(5):
+        store.add(make_chunks(f"doc-{i}"))
+    queries = ["vector store", "", "testes de deleção em disco", "inexistente"]
+    batch = store.similarity_search_batch(queries, top_k=5)
+    full = DenseVectorStore()
+    for i in range(5):
+        full.add(make_chunks(f"doc-{i}"))
+    expected = [full.similarity_search(q, top_k=5) for q in queries]
+    assert [[round(s, 5) for s, _ in r] for r in batch] == [
+        [round(s, 5) for s, _ in r] for r in expected
+    ]
+    assert batch[1] == [] and batch[3] == []
+
+
+def test_dense_delete_chunks_e_content_hashes() -> None:
+    store = DenseVectorStore(initial_capacity=2)
+    chunks = [
+        Chunk(document_id=f"d{i % 2}", content=f"texto {i} comum", chunk_id=f"d{i % 2}:{i}")
+        for i in range(8)
+    ]
+    store.add(chunks)
+    hashes = store.content_hashes("d0")
+    assert hashes == {c.chunk_id: c.content_hash() for c in chunks if c.document_id == "d0"}
+
+    # ids de outro documento são ignorados
+    assert store.delete_chunks("d0", ["d0:0", "d0:4", "d1:1"]) == 2
+    assert set(store.content_hashes("d0")) == {"d0:2", "d0:6"}
+    remaining = {c.chunk_id for _, c in store.similarity_search("texto comum", top_k=20)}
+    assert remaining == {"d0:2", "d0:6", "d1:1", "d1:3", "d1:5", "d1:7"}
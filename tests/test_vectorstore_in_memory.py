@@ -0,0 +1,120 @@
+import random
+import sys
+import threading
+
+from domain.services.vector_store import Chunk
+from infrastructure.vectorstores.in_memory import InMemoryVectorStore, _jaccard, _tokenize
+
+
+def _full_scan(chunks: list[Chunk], query: str, top_k: int) -> list[tuple[float, Chunk]]:
+    """Referência: varredura completa agrupada por documento (comportamento original)."""
+    by_doc: dict[str, list[Chunk]] = {}
+    for ch in chunks:
+        by_doc.setdefault(ch.document_id, []).append(ch)
+    q = _tokenize(query)
+    scored = []
+    for lst in by_doc.values():
+        for ch in lst:
+            score = _jaccard(q, _tokenize(ch.content))
+            if score > 0:
+                scored.append((score, ch))
+    scored.sort(key=lambda t: t[0], reverse=True)
+    return scored[:top_k]
+
+
+def test_inverted_index_matches_full_scan() -> None:
+    rng = random.Random(7)
+    vocab = [f"w{i}" for i in range(40)]
+    chunks = [
+        Chunk(
+            document_id=f"doc-{rng.randrange(6)}",
+            content=" ".join(rng.choices(vocab, k=rng.randrange(1, 12))),
+            chunk_id=f"c{i}",
+        )
+        for i in range(300)
+    ]
+    store = InMemoryVectorStore()
+    # adiciona em lotes intercalados para exercitar a ordem por documento
+    store.add(chunks[:150])
+    store.add(chunks[150:])
+
+    for _ in range(25):
+        query = " ".join(rng.choices(vocab, k=rng.randrange(1, 6)))
+        expected = _full_scan(chunks, query, top_k=10)
+        got = store.similarity_search(query, top_k=10)
+        assert [(s, c.chunk_id) for s, c in got] == [(s, c.chunk_id) for s, c in expected]
+
+
+def test_delete_by_document_removes_postings() -> None:
+    store = InMemoryVectorStore()
+    store.add(
+        [
+            Chunk(document_id="a", content="alfa beta"),
+            Chunk(document_id="a", content="beta gama"),
+            Chunk(document_id="b", content="gama delta"),
+        ]
+    )
+    assert store.delete_by_document("a") == 2
+    assert store.delete_by_document("a") == 0
+
+    hits = store.similarity_search("alfa beta gama", top_k=5)
+    assert [c.document_id for _, c in hits] == ["b"]
+    assert store.similarity_search("alfa", top_k=5) == []
+
+
+def test_similarity_search_batch_equivale_a_buscas_individuais() -> None:
+    rng = random.Random(11)
+    vocab = [f"w{i}" for i in range(30)]
+    store = InMemoryVectorStore()
+    store.add(
+        Chunk(document_id=f"doc-{i % 4}", content=" ".join(rng.choices(vocab, k=8)))
+        for i in range(120)
+    )
+    queries = [" ".join(rng.choices(vocab, k=3)) for _ in range(10)] + ["", "w1 w1"]
+    batch = store.similarity_search_batch(queries, top_k=7)
+    assert batch == [store.similarity_search(q, top_k=7) for q in queries]
+
+
+def test_add_e_busca_concorrentes_nao_corrompem_o_indice() -> None:
+    store = InMemoryVectorStore()
+    errors: list[BaseException] = []
+    done = threading.Event()
+
+    def writer() -> None:
+        try:
+            for d in range(600):
+                store.add(
+                    [Chunk(f"doc-{d}", f"termo comum t{i} d{d}", f"doc-{d}:{i}") for i in range(5)]
+                )
+                if d % 3 == 0:
+                    store.delete_by_document(f"doc-{d}")
+        except BaseException as e:  # pragma: no cover - só em caso de corrida
+            errors.append(e)
+        finally:
+            done.set()
+
+    def reader() -> None:
+        try:
+            while not done.is_set():
+                store.similarity_search("termo comum t1", top_k=5)
+                store.similarity_search_batch(["t2 comum", "d7"], top_k=3)
+        except BaseException as e:  # pragma: no cover - só em caso de corrida
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=writer),
+        *(threading.Thread(target=reader) for _ in range(3)),
+    ]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # trocas de thread frequentes expõem a corrida
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(30)
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert store.count() == 5 * (600 - 200)
+    assert len(store.similarity_search("termo comum", top_k=5000)) == store.count()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from domain.services.vector_store import Chunk
+from infrastructure.embeddings.hashing import HashingEmbedder
+from infrastructure.vectorstores.dense import DenseVectorStore
+from infrastructure.vectorstores.quantized import QuantizedVectorStore
+from infrastructure.vectorstores.snapshot import SnapshotError
+
+ChunkFactory = Callable[[str], list[Chunk]]
+
+
+@pytest.mark.parametrize("rescore", ["mmap", "embed"])
+@pytest.mark.parametrize("codec", ["int8", "binary"])
+def test_quantized_reordena_com_scores_exatos(
+    codec: str, rescore: str, tmp_path: Path, make_chunks: ChunkFactory
+) -> None:
+    # oversample cobre o corpus inteiro: o resultado tem que ser o da busca exata
+    store = QuantizedVectorStore(
+        codec=codec,
+        oversample=50,
+        rescore_dir=tmp_path if rescore == "mmap" else None,
+        initial_capacity=2,
+    )
+    dense = DenseVectorStore(embedder=HashingEmbedder())
+    for d in range(8):
+        store.add(make_chunks(f"doc-{d}"))
+        dense.add(make_chunks(f"doc-{d}"))
+
+    queries = ["matriz NumPy doc-3", "", "checksum e versão", "inexistente"]
+    got = store.similarity_search_batch(queries, top_k=4)
+    expected = dense.similarity_search_batch(queries, top_k=4)
+    assert [[round(s, 5) for s, _ in r] for r in got] == [
+        [round(s, 5) for s, _ in r] for r in expected
+    ]
+    assert got[0][0][1].chunk_id == "doc-3:1"
+    assert got[1] == [] and got[3] == []
+
+    # swap-remove mantém códigos e vetores alinhados aos chunks
+    for s in (store, dense):
+        assert s.delete_by_document("doc-3") == 4
+        assert s.delete_chunks("doc-5", ["doc-5:1"]) == 1
+    hits = {c.chunk_id for _, c in store.similarity_search("matriz NumPy contígua", top_k=40)}
+    assert hits == {c.chunk_id for _, c in dense.similarity_search("matriz NumPy contígua", 40)}
+    assert hits & {"doc-3:1", "doc-5:1"} == set()
+    # empates entre chunks podem sair em qualquer ordem: compara scores e o score de cada chunk
+    for q in ("matriz NumPy doc-7", "chunks em disco doc-6", "deleção doc-5"):
+        exact = {c.chunk_id: round(s, 5) for s, c in dense.similarity_search(q, top_k=40)}
+        got_q = [(round(s, 5), c.chunk_id) for s, c in store.similarity_search(q, top_k=3)]
+        assert [s for s, _ in got_q] == sorted(exact.values(), reverse=True)[:3]
+        assert all(exact[cid] == s for s, cid in got_q)
+    assert store.count() == 27
+
+    assert store.resident_bytes() < store.count() * store.dim * 4 // 3
+
+
+def test_quantized_int8_requantiza_colunas_quando_a_escala_cresce() -> None:
+    store = QuantizedVectorStore(codec="int8", oversample=1)
+    # muitos tokens distintos: valores pequenos por dimensão, escala inicial estreita
+    store.add([Chunk("longo", " ".join(f"t{i}" for i in range(200)), "longo:0")])
+    store.add([Chunk("curto", "t7", "curto:0")])  # um token só: valor 1.0 numa dimensão
+
+    assert store.similarity_search("t7", top_k=1)[0][1].chunk_id == "curto:0"
+    hits = store.similarity_search("t3 t150 t199", top_k=2)
+    assert [c.chunk_id for _, c in hits] == ["longo:0"]
+
+
+def test_quantized_snapshot_entre_modos_de_reordenacao(
+    tmp_path: Path, make_chunks: ChunkFactory
+) -> None:
+    with_vectors = QuantizedVectorStore(codec="binary", rescore_dir=tmp_path / "a")
+    for d in ("doc-1", "doc-2"):
+        with_vectors.add(make_chunks(d))
+    with_vectors.snapshot(tmp_path / "a.snap")
+
+    # snapshot sem vetores float: o store com mmap os recalcula na carga
+    embed = QuantizedVectorStore(codec="binary")
+    embed.load(tmp_path / "a.snap")
+    embed.snapshot(tmp_path / "b.snap")
+    restored = QuantizedVectorStore(codec="binary", rescore_dir=tmp_path / "b")
+    assert restored.load(tmp_path / "b.snap").chunks == 8
+    for q in ("matriz NumPy doc-2", "crescimento e deleção"):
+        assert restored.similarity_search(q, top_k=3) == with_vectors.similarity_search(q, top_k=3)
+
+    with pytest.raises(SnapshotError, match="codec"):
+        QuantizedVectorStore(codec="int8").load(tmp_path / "a.snap")
+
+
+def test_quantized_codec_invalido() -> None:
+    with pytest.raises(ValueError, match="codec"):
+        QuantizedVectorStore(codec="pq")
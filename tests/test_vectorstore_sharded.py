@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+
+import pytest
+
+from app.container import _build_vector_store
+from app.core.config import settings
+from domain.services.chunk_source import ChunkSource
+from domain.services.vector_store import Chunk, VectorStore
+from infrastructure.embeddings.hashing import HashingEmbedder
+from infrastructure.vectorstores.dense import DenseVectorStore
+from infrastructure.vectorstores.in_memory import InMemoryVectorStore
+from infrastructure.vectorstores.sharded import ShardedVectorStore, rebalance_shards, shard_for
+
+ChunkFactory = Callable[[str], list[Chunk]]
+
+
+def _corpus(make_chunks: ChunkFactory, docs: int = 30) -> list[Chunk]:
+    return [c for d in range(docs) for c in make_chunks(f"doc-{d}")]
+
+
+def test_sharded_busca_igual_a_um_store_unico(make_chunks: ChunkFactory) -> None:
+    single = DenseVectorStore(embedder=HashingEmbedder())
+    sharded = ShardedVectorStore([DenseVectorStore(embedder=HashingEmbedder()) for _ in range(3)])
+    corpus = _corpus(make_chunks)
+    assert single.add(corpus) == sharded.add(corpus) == len(corpus)
+    assert sharded.count() == len(corpus)
+    assert all(s.count() > 0 for s in sharded.shards)
+
+    queries = ["matriz NumPy doc-3", "checksum e versão", "testes de deleção doc-7"]
+    for q in queries:
+        expected = single.similarity_search(q, top_k=5)
+        got = sharded.similarity_search(q, top_k=5)
+        # empates podem trazer outros chunks com o mesmo score; os scores devem coincidir
+        assert [s for s, _ in got] == pytest.approx([s for s, _ in expected])
+
+    batch = sharded.similarity_search_batch(queries, top_k=5)
+    assert [[c.chunk_id for _, c in r] for r in batch] == [
+        [c.chunk_id for _, c in sharded.similarity_search(q, top_k=5)] for q in queries
+    ]
+    sharded.close()
+
+
+def test_sharded_delete_vai_a_um_unico_shard(make_chunks: ChunkFactory) -> None:
+    shards = [InMemoryVectorStore() for _ in range(4)]
+    store = ShardedVectorStore(shards)
+    store.add(_corpus(make_chunks))
+    target = shards[shard_for("doc-5", 4)]
+    before = [s.count() for s in shards]
+    generation = store.generation
+
+    per_doc = len(make_chunks("doc-5"))
+    assert store.delete_by_document("doc-5") == per_doc
+    after = [s.count() for s in shards]
+    assert [b - a for b, a in zip(before, after, strict=True)] == [
+        per_doc if s is target else 0 for s in shards
+    ]
+    assert store.generation > generation
+    assert store.content_hashes("doc-5") == {}
+    assert len(store.content_hashes("doc-6")) == per_doc
+    store.close()
+
+
+class _ListSource(ChunkSource):
+    def __init__(self, make_chunks: ChunkFactory) -> None:
+        self._make_chunks = make_chunks
+
+    def iter_chunks(self, document_id: str) -> Iterable[Chunk]:
+        return iter(self._make_chunks(document_id))
+
+
+def test_rebalance_move_documentos_ao_mudar_quantidade_de_shards(
+    make_chunks: ChunkFactory,
+) -> None:
+    docs = [f"doc-{d}" for d in range(20)]
+    opened: dict[int, VectorStore] = {0: InMemoryVectorStore()}
+    opened[0].add(c for d in docs for c in make_chunks(d))  # layout antigo: 1 shard
+
+    def factory(i: int) -> VectorStore:
+        return opened.setdefault(i, InMemoryVectorStore())
+
+    moved = rebalance_shards(factory, 1, 3, docs, _ListSource(make_chunks))
+    assert moved == sum(1 for d in docs if shard_for(d, 3) != 0)
+    for d in docs:
+        owner = shard_for(d, 3)
+        for i in range(3):
+            assert bool(opened[i].content_hashes(d)) == (i == owner)
+
+    # de volta a 2 shards: o shard 2 fica vazio
+    rebalance_shards(factory, 3, 2, docs, _ListSource(make_chunks))
+    assert opened[2].count() == 0
+    assert opened[0].count() + opened[1].count() == len(_corpus(make_chunks, len(docs)))
+
+
+def test_rebalance_interrompido_nao_perde_documentos(make_chunks: ChunkFactory) -> None:
+    docs = [f"doc-{d}" for d in range(20)]
+    opened: dict[int, VectorStore] = {0: InMemoryVectorStore()}
+    opened[0].add(c for d in docs for c in make_chunks(d))
+
+    class _FailingSource(_ListSource):
+        calls = 0
+
+        def iter_chunks(self, document_id: str) -> Iterable[Chunk]:
+            self.calls += 1
+            if self.calls == 3:
+                raise OSError("falha simulada no meio do rebalanceamento")
+            return super().iter_chunks(document_id)
+
+    def factory(i: int) -> VectorStore:
+        return opened.setdefault(i, InMemoryVectorStore())
+
+    with pytest.raises(OSError):
+        rebalance_shards(factory, 1, 3, docs, _FailingSource(make_chunks))
+    for d in docs:  # cada documento continua em algum shard
+        assert any(store.content_hashes(d) for store in opened.values())
+
+    # a execução seguinte termina a migração
+    rebalance_shards(factory, 1, 3, docs, _ListSource(make_chunks))
+    for d in docs:
+        owner = shard_for(d, 3)
+        for i in range(3):
+            assert bool(opened[i].content_hashes(d)) == (i == owner)
+    assert sum(store.count() for store in opened.values()) == len(_corpus(make_chunks, len(docs)))
+
+
+def test_container_monta_shards_pela_configuracao(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "VECTOR_STORE_PROVIDER", "dense")
+    monkeypatch.setattr(settings, "VECTOR_STORE_SHARDS", 3)
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+    store = _build_vector_store()
+    assert isinstance(store, ShardedVectorStore)
+    assert len(store.shards) == 3
+    store.close()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import multiprocessing as mp
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from domain.services.vector_store import Chunk
+from infrastructure.embeddings.hashing import HashingEmbedder
+from infrastructure.vectorstores.dense import DenseVectorStore
+from infrastructure.vectorstores.shared_mmap import SharedMmapVectorStore
+
+ChunkFactory = Callable[[str], list[Chunk]]
+
+
+def _add_in_other_process(index_dir: str, chunks: list[Chunk]) -> None:
+    SharedMmapVectorStore(index_dir).add(chunks)
+
+
+def test_shared_dois_leitores_veem_escritas_um_do_outro(
+    tmp_path: Path, make_chunks: ChunkFactory
+) -> None:
+    writer = SharedMmapVectorStore(tmp_path)
+    reader = SharedMmapVectorStore(tmp_path)  # outro worker sobre o mesmo diretório
+    dense = DenseVectorStore(embedder=HashingEmbedder())
+    for d in ("doc-1", "doc-2", "doc-3"):
+        writer.add(make_chunks(d))
+        dense.add(make_chunks(d))
+
+    assert reader.generation == writer.generation == 3
+    assert reader.count() == 12
+    for q in ("matriz NumPy doc-2", "chunks em disco"):
+        expected = dense.similarity_search(q, top_k=4)
+        got = reader.similarity_search(q, top_k=4)
+        assert [s for s, _ in got] == pytest.approx([s for s, _ in expected])
+    hit = reader.similarity_search("matriz NumPy doc-2", top_k=1)[0][1]
+    assert hit == Chunk(
+        "doc-2", "Vector Store denso com matriz NumPy contígua doc-2", "doc-2:1", {"idx": 1}
+    )
+
+    assert reader.delete_by_document("doc-2") == 4
+    assert writer.content_hashes("doc-2") == {}
+    assert set(writer.content_hashes("doc-1")) == {"doc-1:0", "doc-1:1", "doc-1:2", "doc-1:3"}
+    assert all(c.document_id != "doc-2" for _, c in writer.similarity_search("doc-2", top_k=12))
+    assert writer.delete_chunks("doc-1", ["doc-1:0"]) == 1
+    assert reader.count() == 7
+    assert writer.generation == 5
+
+
+def test_shared_compacta_segmentos_e_coleta_arquivos(
+    tmp_path: Path, make_chunks: ChunkFactory
+) -> None:
+    store = SharedMmapVectorStore(tmp_path, max_segments=3)
+    for d in range(5):
+        store.add(make_chunks(f"doc-{d}"))
+    manifest = json.loads((tmp_path / (tmp_path / "CURRENT").read_text()).read_text())
+    assert len(manifest["segments"]) <= 3
+    assert store.count() == 20
+
+    # removendo a maior parte de um segmento, ele é reescrito sem tombstones
+    for d in range(4):
+        store.delete_by_document(f"doc-{d}")
+    manifest = json.loads((tmp_path / (tmp_path / "CURRENT").read_text()).read_text())
+    assert all(2 * len(e["deleted"]) < e["rows"] for e in manifest["segments"])
+    live = {e["name"] for e in manifest["segments"]}
+    assert len(list(tmp_path.glob("manifest-*.json"))) == 2
+    on_disk = {p.name.split(".", 1)[0] for p in tmp_path.glob("seg-*")}
+    assert live <= on_disk
+    assert store.count() == 4
+    assert store.similarity_search("FastAPI doc-4", top_k=1)[0][1].chunk_id == "doc-4:0"
+
+
+def test_shared_segmento_em_uso_fica_para_a_proxima_coleta(
+    tmp_path: Path, make_chunks: ChunkFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    store = SharedMmapVectorStore(tmp_path)
+    store.add(make_chunks("doc-1"))
+    store.add(make_chunks("doc-2"))
+    unlink = Path.unlink
+
+    def mapped_elsewhere(path: Path, missing_ok: bool = False) -> None:
+        # como no Windows: arquivo mapeado por outro processo não pode ser removido
+        if path.name.startswith("seg-"):
+            raise PermissionError(13, "arquivo em uso", str(path))
+        unlink(path, missing_ok=missing_ok)
+
+    monkeypatch.setattr(Path, "unlink", mapped_elsewhere)
+    assert store.delete_by_document("doc-1") == 4
+    store.add(make_chunks("doc-3"))  # o segmento de doc-1 sai dos manifestos mantidos
+    assert store.count() == 8
+    assert len(list(tmp_path.glob("seg-*"))) == 12  # 3 segmentos: o de doc-1 ficou
+    monkeypatch.setattr(Path, "unlink", unlink)
+
+    store.add(make_chunks("doc-4"))
+    live = {
+        e["name"]
+        for m in tmp_path.glob("manifest-*.json")
+        for e in json.loads(m.read_text())["segments"]
+    }
+    assert {p.name.split(".", 1)[0] for p in tmp_path.glob("seg-*")} == live
+    assert store.count() == 12
+
+
+def test_shared_escrita_de_outro_processo_e_vista_sem_reabrir(
+    tmp_path: Path, make_chunks: ChunkFactory
+) -> None:
+    store = SharedMmapVectorStore(tmp_path)
+    store.add(make_chunks("doc-local"))
+    generation = store.generation
+
+    proc = mp.get_context("spawn").Process(
+        target=_add_in_other_process, args=(str(tmp_path), make_chunks("doc-remoto"))
+    )
+    proc.start()
+    proc.join(30)
+    assert proc.exitcode == 0
+
+    assert store.generation == generation + 1
+    assert store.count() == 8
+    hits = store.similarity_search("matriz NumPy doc-remoto", top_k=1)
+    assert hits[0][1].document_id == "doc-remoto"
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+import pytest
+
+from domain.services.vector_store import Chunk, VectorStore
+from infrastructure.chunk_sources.filesystem_jsonl import FilesystemJsonlChunkSource
+from infrastructure.embeddings.hashing import HashingEmbedder
+from infrastructure.jobs.warm_start import IndexWarmer
+from infrastructure.vectorstores.dense import DenseVectorStore
+from infrastructure.vectorstores.in_memory import InMemoryVectorStore
+from infrastructure.vectorstores.quantized import QuantizedVectorStore
+from infrastructure.vectorstores.sharded import ShardedVectorStore
+from infrastructure.vectorstores.snapshot import SnapshotError
+
+ChunkFactory = Callable[[str], list[Chunk]]
+
+_FACTORIES: dict[str, Callable[[], VectorStore]] = {
+    "inmemory": InMemoryVectorStore,
+    "dense": lambda: DenseVectorStore(embedder=HashingEmbedder()),
+    "sharded": lambda: ShardedVectorStore([InMemoryVectorStore() for _ in range(3)]),
+    "quantized": lambda: QuantizedVectorStore(codec="int8"),
+}
+
+
+@pytest.mark.parametrize("kind", list(_FACTORIES))
+def test_snapshot_e_load_restauram_o_store(
+    kind: str, tmp_path: Path, make_chunks: ChunkFactory
+) -> None:
+    store = _FACTORIES[kind]()
+    for d in ("doc-1", "doc-2", "doc-3"):
+        store.add(make_chunks(d))
+    store.delete_chunks("doc-2", ["doc-2:0"])
+    path = tmp_path / f"{kind}.snap"
+    saved = store.snapshot(path)  # type: ignore[attr-defined]
+    assert saved.chunks == 11
+
+    restored = _FACTORIES[kind]()
+    info = restored.load(path)  # type: ignore[attr-defined]
+    assert info.chunks == 11
+    assert info.document_ids == {"doc-1", "doc-2", "doc-3"}
+    assert restored.count() == 11
+    assert restored.generation > 0
+    assert restored.content_hashes("doc-2") == store.content_hashes("doc-2")
+    for q in ("matriz NumPy", "snapshot com checksum", "chunks em disco"):
+        assert restored.similarity_search(q, top_k=4) == store.similarity_search(q, top_k=4)
+
+
+def test_snapshot_corrompido_ou_incompativel_e_recusado(
+    tmp_path: Path, make_chunks: ChunkFactory
+) -> None:
+    store = DenseVectorStore(embedder=HashingEmbedder(dim=64))
+    store.add(make_chunks("doc-1"))
+    path = tmp_path / "dense.snap"
+    store.snapshot(path)
+
+    with pytest.raises(SnapshotError, match="embedder"):
+        DenseVectorStore(embedder=HashingEmbedder(dim=128)).load(path)
+    with pytest.raises(SnapshotError, match="não de 'inmemory'"):
+        InMemoryVectorStore().load(path)
+
+    data = bytearray(path.read_bytes())
+    data[-5] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(SnapshotError, match="checksum"):
+        DenseVectorStore(embedder=HashingEmbedder(dim=64)).load(path)
+
+
+def _write_chunks(processed: Path, doc_id: str, texts: list[str]) -> None:
+    lines = [json.dumps({"content": t}, ensure_ascii=False) for t in texts]
+    (processed / f"{doc_id}.chunks.jsonl").write_text("\n".join(lines), encoding="utf-8")
+
+
+def test_warm_start_carrega_snapshot_e_reprocessa_so_arquivos_novos(
+    tmp_path: Path, make_chunks: ChunkFactory
+) -> None:
+    processed = tmp_path / "processed"
+    processed.mkdir()
+    for d in ("doc-a", "doc-b"):
+        _write_chunks(processed, d, [c.content for c in make_chunks(d)])
+    source = FilesystemJsonlChunkSource(processed)
+    catalog = ["doc-a", "doc-b"]
+
+    def warmer(store: VectorStore) -> IndexWarmer:
+        return IndexWarmer(store, tmp_path / "inmemory.snap", lambda: list(catalog), source)
+
+    first = warmer(InMemoryVectorStore())
+    cold = first.warm_start()
+    assert (cold.loaded, cold.replayed, cold.removed) == (0, 2, 0)
+    snap = first.snapshot()
+    assert snap is not None
+
+    # depois do snapshot: doc-b muda, doc-c chega e doc-a sai do catálogo
+    _write_chunks(processed, "doc-b", ["conteúdo novo do documento b"])
+    _write_chunks(processed, "doc-c", ["documento c recém-chegado"])
+    later = snap.created_at + 10
+    for d in ("doc-b", "doc-c"):
+        os.utime(processed / f"{d}.chunks.jsonl", (later, later))
+    catalog[:] = ["doc-b", "doc-c"]
+
+    store = InMemoryVectorStore()
+    warm = warmer(store).warm_start()
+    assert (warm.loaded, warm.replayed, warm.removed) == (8, 2, 1)
+    assert store.count() == 2
+    assert store.content_hashes("doc-a") == {}
+    assert store.similarity_search("conteúdo novo", top_k=1)[0][1].chunk_id == "doc-b:0"
+    assert store.similarity_search("recém-chegado", top_k=1)[0][1].document_id == "doc-c"
+
+
+class _StopOnRead(FilesystemJsonlChunkSource):
+    """Fonte que dispara `stop` ao reindexar o primeiro documento alterado."""
+
+    warmer: IndexWarmer | None = None
+
+    def iter_chunks(self, document_id: str) -> Iterable[Chunk]:
+        if self.warmer is not None:
+            self.warmer.stop()
+        return super().iter_chunks(document_id)
+
+
+def test_carga_cancelada_nao_grava_snapshot_e_reindexa_no_proximo_start(
+    tmp_path: Path,
+) -> None:
+    processed = tmp_path / "processed"
+    processed.mkdir()
+    catalog = ["doc-a", "doc-b", "doc-c"]
+    for d in catalog:
+        _write_chunks(processed, d, [f"versão antiga de {d}"])
+    path = tmp_path / "inmemory.snap"
+    source = FilesystemJsonlChunkSource(processed)
+    first = IndexWarmer(InMemoryVectorStore(), path, lambda: catalog, source)
+    first.warm_start()
+    snap = first.snapshot()
+    assert snap is not None
+    saved = path.read_bytes()
+
+    for d in ("doc-b", "doc-c"):
+        _write_chunks(processed, d, [f"versão nova de {d}"])
+        later = snap.created_at + 10
+        os.utime(processed / f"{d}.chunks.jsonl", (later, later))
+
+    # desligamento no meio da fase incremental: doc-c não chega a ser reprocessado
+    stopping = _StopOnRead(processed)
+    cancelled = IndexWarmer(InMemoryVectorStore(), path, lambda: catalog, stopping)
+    stopping.warmer = cancelled
+    assert cancelled.warm_start().replayed == 1
+    assert cancelled.progress().state == "cancelled"
+    assert cancelled.snapshot() is None
+    assert path.read_bytes() == saved
+
+    store = InMemoryVectorStore()
+    assert IndexWarmer(store, path, lambda: catalog, source).warm_start().replayed == 2
+    hits = store.similarity_search("versão nova de doc-c", top_k=1)
+    assert hits[0][1].content == "versão nova de doc-c"
+    assert store.count() == 3
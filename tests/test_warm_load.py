@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.container import Container, build_container
+from app.main import create_app
+from infrastructure.chunk_sources.filesystem_jsonl import FilesystemJsonlChunkSource
+from infrastructure.embeddings.hashing import HashingEmbedder
+from infrastructure.jobs.warm_start import IndexWarmer, WarmLoadProgress
+from infrastructure.vectorstores.dense import DenseVectorStore
+from infrastructure.vectorstores.in_memory import InMemoryVectorStore
+
+
+def _write_corpus(processed: Path, docs: int, chunks_per_doc: int = 3) -> list[str]:
+    processed.mkdir(parents=True, exist_ok=True)
+    ids = [f"doc-{d:03d}" for d in range(docs)]
+    for doc_id in ids:
+        lines = [
+            json.dumps({"content": f"trecho {i} do documento {doc_id}", "idx": i})
+            for i in range(chunks_per_doc)
+        ]
+        (processed / f"{doc_id}.chunks.jsonl").write_text("\n".join(lines), encoding="utf-8")
+    return ids
+
+
+def _wait_done(warmer: IndexWarmer, timeout: float = 60.0) -> WarmLoadProgress:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        progress = warmer.progress()
+        if progress.state not in ("pending", "loading"):
+            return progress
+        time.sleep(0.02)
+    raise AssertionError(f"aquecimento não terminou: {warmer.progress()}")
+
+
+def test_carga_inicial_paralela_em_lotes_sem_snapshot(tmp_path: Path) -> None:
+    ids = _write_corpus(tmp_path / "processed", docs=20)
+    store = DenseVectorStore(embedder=HashingEmbedder())
+    warmer = IndexWarmer(
+        store,
+        snapshot_path=tmp_path / "dense.snap",
+        document_ids=lambda: ids,
+        source=FilesystemJsonlChunkSource(tmp_path / "processed"),
+        workers=2,
+        batch_documents=4,  # 5 lotes: lidos no pool de processos
+    )
+    warmer.start()
+    progress = _wait_done(warmer)
+
+    assert progress.ready
+    assert (progress.documents_total, progress.documents_done) == (20, 20)
+    assert progress.chunks_indexed == store.count() == 60
+    hit = store.similarity_search("trecho 2 do documento doc-007", top_k=1)[0][1]
+    assert (hit.document_id, hit.chunk_id, hit.metadata) == ("doc-007", "doc-007:2", {"idx": 2})
+
+
+def test_carga_inicial_nao_duplica_documento_indexado_durante_a_carga(tmp_path: Path) -> None:
+    ids = _write_corpus(tmp_path / "processed", docs=6)
+    source = FilesystemJsonlChunkSource(tmp_path / "processed")
+    store = InMemoryVectorStore()
+
+    def catalog() -> Iterator[str]:
+        # upload concorrente: o documento entra no store enquanto a carga ainda lista o catálogo
+        store.add(source.iter_chunks("doc-004"))
+        yield from ids
+
+    warmer = IndexWarmer(
+        store, tmp_path / "inmemory.snap", document_ids=catalog, source=source, workers=1
+    )
+    result = warmer.warm_start()
+
+    assert result.replayed == 6
+    assert store.count() == 18
+    assert len(store.content_hashes("doc-004")) == 3
+
+
+@pytest.mark.asyncio
+async def test_readiness_503_ate_o_indice_carregar(tmp_path: Path) -> None:
+    ids = _write_corpus(tmp_path / "processed", docs=3)
+    release = threading.Event()
+
+    def slow_catalog() -> Iterator[str]:
+        release.wait(10)
+        yield from ids
+
+    store = InMemoryVectorStore()
+    container: Container = build_container()
+    container.vector_store = store
+    container.query_cache = None
+    container.index_warmer = IndexWarmer(
+        store,
+        snapshot_path=tmp_path / "inmemory.snap",
+        document_ids=slow_catalog,
+        source=FilesystemJsonlChunkSource(tmp_path / "processed"),
+        workers=1,
+    )
+    transport = ASGITransport(app=create_app(container=container))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        container.index_warmer.start()  # o ASGITransport não dispara o lifespan
+        loading = await client.get("/v1/health/ready")
+        live = await client.get("/v1/health")
+        release.set()
+        _wait_done(container.index_warmer)
+        ready = await client.get("/v1/health/ready")
+        query = await client.post("/v1/rag/query", json={"question": "trecho 1 doc-002"})
+
+    assert loading.status_code == 503
+    assert loading.json()["index"]["state"] == "loading"
+    assert live.status_code == 200  # liveness não depende da carga
+    assert live.json()["index"]["ready"] is False
+    assert ready.status_code == 200
+    assert ready.json()["index"]["documents_done"] == 3
+    assert query.json()["hits"][0]["document_id"] == "doc-002"
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from domain.repositories.document_repository import DocumentRepository
+
+
+@dataclass(frozen=True)
+class DocumentChunk:
+    index: int
+    content: str
+    metadata: dict
+
+
+@dataclass(frozen=True)
+class GetDocumentChunksOutput:
+    document_id: str
+    offset: int
+    total: int
+    chunks: list[DocumentChunk]
+
+
+class GetDocumentChunks:
+    def __init__(self, repo: DocumentRepository) -> None:
+        self.repo = repo
+
+    def execute(
+        self, doc_id: str, offset: int = 0, limit: int = 50
+    ) -> GetDocumentChunksOutput | None:
+        if self.repo.get_document(doc_id) is None:
+            return None
+        raw = self.repo.get_chunks(doc_id, offset=offset, limit=limit)
+        chunks = [
+            DocumentChunk(
+                index=offset + i,
+                content=str(data.get("content", "")),
+                metadata={k: v for k, v in data.items() if k != "content"},
+            )
+            for i, data in enumerate(raw)
+        ]
+        return GetDocumentChunksOutput(
+            document_id=doc_id,
+            offset=offset,
+            total=self.repo.count_chunks(doc_id),
+            chunks=chunks,
+        )
@@ -1,29 +1,89 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
+from itertools import chain
 
 from domain.services.chunk_source import ChunkSource
-from domain.services.vector_store import VectorStore
+from domain.services.vector_store import Chunk, VectorStore
 
 
 @dataclass(frozen=True)
 class IndexResult:
     document_id: str
     added: int
+    # preenchidos apenas no modo incremental
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
 
 
 class IndexDocumentChunks:
     """
     Caso de uso: ler os chunks de um documento a partir de um ChunkSource
     e adicioná-los ao VectorStore.
+
+    Modos:
+    - padrão: adiciona todos os chunks (com `reindex=True`, remove antes os existentes);
+    - `incremental=True`: compara o `content_hash` de cada chunk da fonte com o que o
+      store já guarda para o documento (por `chunk_id`) e grava só os novos/alterados,
+      removendo os que deixaram de existir.
     """
 
     def __init__(self, source: ChunkSource, store: VectorStore) -> None:
         self._source = source
         self._store = store
 
-    def execute(self, document_id: str, reindex: bool = False) -> IndexResult:
+    def execute(
+        self, document_id: str, reindex: bool = False, incremental: bool = False
+    ) -> IndexResult:
+        if incremental:
+            return self._execute_incremental(document_id)
         if reindex:
             self._store.delete_by_document(document_id)
         added = self._store.add(self._source.iter_chunks(document_id))
         return IndexResult(document_id=document_id, added=added)
+
+    def execute_many(self, document_ids: Sequence[str]) -> int:
+        """Modo padrão para vários documentos numa única chamada a `add` (carga em lote)."""
+        return self._store.add(
+            chain.from_iterable(self._source.iter_chunks(d) for d in document_ids)
+        )
+
+    async def aexecute(self, document_id: str) -> IndexResult:
+        """Modo padrão via `VectorStore.aadd` (leitura da fonte e escrita no executor do store)."""
+        added = await self._store.aadd(self._source.iter_chunks(document_id))
+        return IndexResult(document_id=document_id, added=added)
+
+    def _execute_incremental(self, document_id: str) -> IndexResult:
+        indexed = self._store.content_hashes(document_id)
+        to_write: list[Chunk] = []
+        replaced: list[str] = []
+        seen: set[str] = set()
+        added = unchanged = 0
+        for ch in self._source.iter_chunks(document_id):
+            cid = ch.chunk_id
+            previous = indexed.get(cid) if cid is not None else None
+            if cid is None or previous is None:
+                added += 1
+                to_write.append(ch)
+            elif previous != ch.content_hash():
+                replaced.append(cid)
+                to_write.append(ch)
+            else:
+                unchanged += 1
+            if cid is not None:
+                seen.add(cid)
+
+        vanished = [cid for cid in indexed if cid not in seen]
+        if vanished or replaced:
+            self._store.delete_chunks(document_id, vanished + replaced)
+        if to_write:
+            self._store.add(to_write)
+        return IndexResult(
+            document_id=document_id,
+            added=added,
+            updated=len(replaced),
+            removed=len(vanished),
+            unchanged=unchanged,
+        )
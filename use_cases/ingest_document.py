@@ -1,20 +1,27 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TypeVar
 
 from domain.entities.document import Document
 from domain.repositories.document_repository import DocumentRepository
 from domain.services.chunker import Chunker
 from domain.services.text_extractor import TextExtractor
 
+T = TypeVar("T")
+
 
 @dataclass(frozen=True)
 class IngestDocumentInput:
     tmp_file: Path
     original_filename: str
     content_type: str = "application/pdf"
+    sha256: str | None = None
 
 
 @dataclass(frozen=True)
@@ -23,29 +30,71 @@ class IngestDocumentOutput:
     text_path: str
     chunks_path: str
     chunk_count: int
+    timings: dict[str, float] = field(default_factory=dict)  # segundos por etapa
+    deduplicated: bool = False  # True se o documento já existia (nada foi reprocessado)
 
 
 class IngestDocument:
+    """
+    Caso de uso: persistir o PDF bruto, extrair texto, gerar e gravar chunks e metadados.
+
+    Com `dedupe=True` e `sha256` informado, um upload cujo conteúdo já foi ingerido
+    devolve o documento existente (`deduplicated=True`) sem extração nem chunking.
+    """
+
     def __init__(
-        self, repo: DocumentRepository, extractor: TextExtractor, chunker: Chunker
+        self,
+        repo: DocumentRepository,
+        extractor: TextExtractor,
+        chunker: Chunker,
+        dedupe: bool = False,
     ) -> None:
         self.repo = repo
         self.extractor = extractor
         self.chunker = chunker
+        self.dedupe = dedupe
 
     def execute(self, inp: IngestDocumentInput) -> IngestDocumentOutput:
+        if self.dedupe and inp.sha256:
+            existing = self.repo.find_by_sha256(inp.sha256)
+            if existing is not None:
+                inp.tmp_file.unlink(missing_ok=True)
+                return self._existing_output(existing)
+
+        timings: dict[str, float] = {}
         paths = self.repo.allocate_paths(inp.original_filename)
 
         # move arquivo bruto
+        t0 = time.perf_counter()
         self.repo.save_raw(inp.tmp_file, paths["raw_path"])
+        timings["save_raw"] = time.perf_counter() - t0
 
-        # extrai texto
-        text, pages = self.extractor.extract(paths["raw_path"])
-        self.repo.save_text(text, paths["text_path"])
+        # extração -> texto -> chunks -> JSONL em streaming: só a página e a janela
+        # de chunk correntes ficam em memória. As etapas são intercaladas, então o
+        # tempo de cada uma é medido nas chamadas next() de cada estágio.
+        pages = 0
+
+        def count_pages(it: Iterable[str]) -> Iterator[str]:
+            nonlocal pages
+            for page in it:
+                pages += 1
+                yield page
+
+        stage: dict[str, float] = dict.fromkeys(("extract", "text", "chunk"), 0.0)
+        raw_pages = _timed(
+            count_pages(self.extractor.iter_pages(paths["raw_path"])), stage, "extract"
+        )
+        text_pages = _timed(self.repo.save_text_pages(raw_pages, paths["text_path"]), stage, "text")
+        chunk_iter = _timed(self.chunker.chunk_pages(text_pages), stage, "chunk")
 
-        # chunking
-        chunk_iter = self.chunker.chunk(text)
+        t0 = time.perf_counter()
         chunk_count = self.repo.save_chunks(chunk_iter, paths["chunks_path"])
+        deque(text_pages, maxlen=0)  # garante que o texto completo foi gravado
+        total = time.perf_counter() - t0
+        timings["extract"] = stage["extract"]
+        timings["save_text"] = max(0.0, stage["text"] - stage["extract"])
+        timings["chunk"] = max(0.0, stage["chunk"] - stage["text"])
+        timings["save_chunks"] = max(0.0, total - stage["chunk"])
 
         # cria entidade (timezone-aware, UTC)
         size_bytes = paths["raw_path"].stat().st_size
@@ -57,12 +106,45 @@ class IngestDocument:
             pages=pages,
             created_at=datetime.now(timezone.utc),
             content_type=inp.content_type,
+            sha256=inp.sha256,
         )
+        t0 = time.perf_counter()
         self.repo.save_meta(doc, paths["meta_path"])
+        timings["save_meta"] = time.perf_counter() - t0
+
+        if self.dedupe and inp.sha256:
+            # uploads simultâneos do mesmo arquivo: o primeiro a registrar vence; os
+            # demais permanecem como documentos próprios (já foram processados)
+            self.repo.register_sha256(inp.sha256, doc.id)
 
         return IngestDocumentOutput(
             document=doc,
             text_path=str(paths["text_path"]),
             chunks_path=str(paths["chunks_path"]),
             chunk_count=chunk_count,
+            timings=timings,
         )
+
+    def _existing_output(self, doc: Document) -> IngestDocumentOutput:
+        processed = self.repo.paths["PROCESSED_DIR"]
+        return IngestDocumentOutput(
+            document=doc,
+            text_path=str(processed / f"{doc.id}.txt"),
+            chunks_path=str(processed / f"{doc.id}.chunks.jsonl"),
+            chunk_count=self.repo.count_chunks(doc.id),
+            deduplicated=True,
+        )
+
+
+def _timed(it: Iterable[T], acc: dict[str, float], key: str) -> Iterator[T]:
+    """Repassa os itens de `it`, acumulando em `acc[key]` o tempo gasto para produzi-los."""
+    iterator = iter(it)
+    while True:
+        t0 = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            acc[key] += time.perf_counter() - t0
+            return
+        acc[key] += time.perf_counter() - t0
+        yield item
@@ -9,13 +9,19 @@ from domain.repositories.document_repository import DocumentRepository
 @dataclass(frozen=True)
 class ListDocumentsOutput:
     documents: list[Document]
+    next_cursor: str | None = None  # None quando não há mais páginas
 
 
 class ListDocuments:
     def __init__(self, repo: DocumentRepository) -> None:
         self.repo = repo
 
-    def execute(self) -> ListDocumentsOutput:
-        docs = list(self.repo.list_documents())
-        docs.sort(key=lambda d: d.created_at, reverse=True)
-        return ListDocumentsOutput(documents=docs)
+    def execute(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        original_filename: str | None = None,
+    ) -> ListDocumentsOutput:
+        # ordenação (created_at DESC, id DESC) e paginação ficam no repositório
+        docs, next_cursor = self.repo.list_page(limit, cursor, original_filename)
+        return ListDocumentsOutput(documents=docs, next_cursor=next_cursor)
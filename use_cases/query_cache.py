@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+def normalize_question(question: str) -> str:
+    """Casefold + espaços colapsados: mesma normalização aplicada pelos tokenizadores."""
+    return " ".join(question.casefold().split())
+
+
+@dataclass(frozen=True)
+class _Entry(Generic[T]):
+    generation: int
+    expires_at: float
+    value: T
+
+
+class QueryResultCache(Generic[T]):
+    """
+    Cache LRU + TTL de resultados de consulta, chaveado por (pergunta normalizada, top_k).
+
+    Cada entrada guarda a `generation` do VectorStore no momento da busca; uma entrada
+    de geração anterior é tratada como miss (o índice mudou desde então).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._ttl = float(ttl_seconds)
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, int], _Entry[T]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, question: str, top_k: int, generation: int) -> T | None:
+        key = (normalize_question(question), top_k)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.generation != generation:
+                del self._entries[key]
+                self.stale += 1
+                self.misses += 1
+                return None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, question: str, top_k: int, generation: int, value: T) -> None:
+        key = (normalize_question(question), top_k)
+        with self._lock:
+            self._entries[key] = _Entry(generation, self._clock() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
 from domain.services.vector_store import Chunk, VectorStore
+from use_cases.query_cache import QueryResultCache, normalize_question
 
 
 @dataclass(frozen=True)
@@ -42,12 +44,35 @@ class QueryRAG:
     """
     Caso de uso: dada uma pergunta (string), realizar busca de similaridade
     no VectorStore e retornar os top_k chunks com score.
+
+    Com `cache`, resultados repetidos são servidos sem tocar o VectorStore enquanto
+    a `generation` do store não mudar. `aexecute`/`aexecute_many` usam as variantes
+    assíncronas do store (executor limitado; podem levantar `StoreSaturatedError`).
     """
 
-    def __init__(self, store: VectorStore) -> None:
+    def __init__(
+        self, store: VectorStore, cache: QueryResultCache[QueryRAGOutput] | None = None
+    ) -> None:
         self._store = store
+        self._cache = cache
 
     def execute(self, inp: QueryRAGInput) -> QueryRAGOutput:
+        plan = self._plan(inp)
+        if isinstance(plan, QueryRAGOutput):
+            return plan
+        q, top_k, generation = plan
+        return self._store_output(q, top_k, generation, self._store.similarity_search(q, top_k))
+
+    async def aexecute(self, inp: QueryRAGInput) -> QueryRAGOutput:
+        plan = self._plan(inp)
+        if isinstance(plan, QueryRAGOutput):
+            return plan
+        q, top_k, generation = plan
+        results = await self._store.asimilarity_search(q, top_k=top_k)
+        return self._store_output(q, top_k, generation, results)
+
+    def _plan(self, inp: QueryRAGInput) -> QueryRAGOutput | tuple[str, int, int]:
+        """Resultado imediato (pergunta vazia ou cache) ou (pergunta, top_k, geração) a buscar."""
         # Validações simples e defensivas (sem "gambiarras")
         q = (inp.question or "").strip()
         if not q:
@@ -55,15 +80,90 @@ class QueryRAG:
 
         top_k = max(1, min(50, int(inp.top_k)))
 
-        results: list[tuple[float, Chunk]] = self._store.similarity_search(q, top_k=top_k)
-        hits: list[RetrievedChunk] = [
-            RetrievedChunk(
-                score=float(score),
-                document_id=chunk.document_id,
-                content=chunk.content,
-                chunk_id=chunk.chunk_id,
-                metadata=chunk.metadata,
-            )
-            for score, chunk in results
-        ]
-        return QueryRAGOutput(hits=hits)
+        # lida antes da busca: uma escrita concorrente invalida o que for gravado agora
+        generation = self._store.generation
+        if self._cache is not None:
+            cached = self._cache.get(q, top_k, generation)
+            if cached is not None:
+                return cached
+        return q, top_k, generation
+
+    def _store_output(
+        self, q: str, top_k: int, generation: int, results: list[tuple[float, Chunk]]
+    ) -> QueryRAGOutput:
+        output = _to_output(results)
+        if self._cache is not None:
+            self._cache.put(q, top_k, generation, output)
+        return output
+
+    def execute_many(self, inputs: Sequence[QueryRAGInput]) -> list[QueryRAGOutput]:
+        """
+        Executa várias consultas, devolvendo os resultados na ordem de entrada.
+        Consultas não resolvidas pelo cache são agrupadas por `top_k` e enviadas ao
+        store num único `similarity_search_batch` por grupo; perguntas repetidas
+        no lote são buscadas uma única vez.
+        """
+        outputs, pending, generation = self._plan_many(inputs)
+        for top_k, group in pending.items():
+            questions = [q for q, _ in group.values()]
+            batch = self._store.similarity_search_batch(questions, top_k=top_k)
+            self._fill(outputs, group, top_k, generation, batch)
+        return [o if o is not None else QueryRAGOutput(hits=[]) for o in outputs]
+
+    async def aexecute_many(self, inputs: Sequence[QueryRAGInput]) -> list[QueryRAGOutput]:
+        outputs, pending, generation = self._plan_many(inputs)
+        for top_k, group in pending.items():
+            questions = [q for q, _ in group.values()]
+            batch = await self._store.asimilarity_search_batch(questions, top_k=top_k)
+            self._fill(outputs, group, top_k, generation, batch)
+        return [o if o is not None else QueryRAGOutput(hits=[]) for o in outputs]
+
+    def _plan_many(
+        self, inputs: Sequence[QueryRAGInput]
+    ) -> tuple[list[QueryRAGOutput | None], dict[int, dict[str, tuple[str, list[int]]]], int]:
+        outputs: list[QueryRAGOutput | None] = [None] * len(inputs)
+        generation = self._store.generation
+        # top_k -> pergunta normalizada -> (pergunta, posições no lote)
+        pending: dict[int, dict[str, tuple[str, list[int]]]] = {}
+
+        for pos, inp in enumerate(inputs):
+            q = (inp.question or "").strip()
+            if not q:
+                outputs[pos] = QueryRAGOutput(hits=[])
+                continue
+            top_k = max(1, min(50, int(inp.top_k)))
+            if self._cache is not None:
+                cached = self._cache.get(q, top_k, generation)
+                if cached is not None:
+                    outputs[pos] = cached
+                    continue
+            group = pending.setdefault(top_k, {})
+            group.setdefault(normalize_question(q), (q, []))[1].append(pos)
+        return outputs, pending, generation
+
+    def _fill(
+        self,
+        outputs: list[QueryRAGOutput | None],
+        group: dict[str, tuple[str, list[int]]],
+        top_k: int,
+        generation: int,
+        batch: list[list[tuple[float, Chunk]]],
+    ) -> None:
+        for (q, positions), results in zip(group.values(), batch, strict=True):
+            output = self._store_output(q, top_k, generation, results)
+            for pos in positions:
+                outputs[pos] = output
+
+
+def _to_output(results: list[tuple[float, Chunk]]) -> QueryRAGOutput:
+    hits: list[RetrievedChunk] = [
+        RetrievedChunk(
+            score=float(score),
+            document_id=chunk.document_id,
+            content=chunk.content,
+            chunk_id=chunk.chunk_id,
+            metadata=chunk.metadata,
+        )
+        for score, chunk in results
+    ]
+    return QueryRAGOutput(hits=hits)